@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -29,7 +30,8 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
-ALLOWED_HOSTS = []
+# Хосты, с которых принимаются запросы к JSON API, через запятую
+ALLOWED_HOSTS = [host for host in os.getenv('ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -79,12 +81,49 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Профиль соединения SQLite. SQLITE_PROFILE=performance применяет PRAGMA из SQLITE_PRAGMAS при открытии
+# соединения, берет блокировку на запись в начале транзакции (BEGIN IMMEDIATE) вместо повышения блокировки
+# чтения и не закрывает соединение между командами. SQLITE_PROFILE=default - параметры sqlite3 по умолчанию.
+# SQLITE_BUSY_TIMEOUT - время ожидания освобождения блокировки в секундах (PRAGMA busy_timeout).
+
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'performance')
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024))),
+    # Отрицательное значение задает размер кэша страниц в КиБ.
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-16000')),
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', '5'))
+
+SQLITE_PROFILES = {
+    'default': {
+        'OPTIONS': {},
+        'CONN_MAX_AGE': 0,
+    },
+    'performance': {
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_BUSY_TIMEOUT,
+        },
+        'CONN_MAX_AGE': None,
+    },
+}
+
+if SQLITE_PROFILE not in SQLITE_PROFILES:
+    raise ImproperlyConfigured(
+        f'Неизвестный SQLITE_PROFILE {SQLITE_PROFILE!r}. Допустимые значения: {", ".join(SQLITE_PROFILES)}.'
+    )
+
 dev = os.getenv('DEV') == 'true'
 if dev:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'test_db.sqlite3',
+            **SQLITE_PROFILES[SQLITE_PROFILE],
         }
     }
 else:
@@ -92,9 +131,76 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            **SQLITE_PROFILES[SQLITE_PROFILE],
         }
     }
 
+# Кэш ответов OpenWeatherMap.
+# PRECISION - количество знаков после запятой при квантовании координат (2 знака ~ 1 км).
+# UPDATE_INTERVAL - период обновления данных OWM в секундах, отсчитывается от поля dt ответа.
+# STALE_WHILE_REVALIDATE - отдавать устаревшие данные, обновляя их в фоне, в течение STALE_TTL секунд.
+
+WEATHER_CACHE = {
+    'PRECISION': int(os.getenv('WEATHER_CACHE_PRECISION', '2')),
+    'MAX_ENTRIES': int(os.getenv('WEATHER_CACHE_MAX_ENTRIES', '1000')),
+    'UPDATE_INTERVAL': int(os.getenv('WEATHER_CACHE_UPDATE_INTERVAL', '600')),
+    'MIN_TTL': int(os.getenv('WEATHER_CACHE_MIN_TTL', '60')),
+    'STALE_WHILE_REVALIDATE': os.getenv('WEATHER_CACHE_STALE_WHILE_REVALIDATE') == 'true',
+    'STALE_TTL': int(os.getenv('WEATHER_CACHE_STALE_TTL', '3600')),
+}
+
+# Кэш результатов прямого геокодирования (название города -> список кандидатов).
+# TTL - время жизни записи в секундах.
+
+GEOCODING_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('GEOCODING_CACHE_MAX_ENTRIES', '5000')),
+    'TTL': int(os.getenv('GEOCODING_CACHE_TTL', str(60 * 60 * 24 * 30))),
+}
+
+# Кэш обратного геокодирования (координаты -> место).
+# RADIUS_KM - радиус, в пределах которого ближайшее сохраненное место считается совпадением.
+
+REVERSE_GEOCODING_CACHE = {
+    'RADIUS_KM': float(os.getenv('REVERSE_GEOCODING_CACHE_RADIUS_KM', '5')),
+    'MAX_ENTRIES': int(os.getenv('REVERSE_GEOCODING_CACHE_MAX_ENTRIES', '5000')),
+    'TTL': int(os.getenv('REVERSE_GEOCODING_CACHE_TTL', str(60 * 60 * 24 * 90))),
+}
+
+# Кэш переводов. MEMORY_MAX_ENTRIES - размер LRU-кэша в памяти процесса перед SQLite.
+# MAX_WORKERS - количество одновременных запросов к переводчику при пакетном переводе.
+
+TRANSLATION_CACHE = {
+    'MEMORY_MAX_ENTRIES': int(os.getenv('TRANSLATION_CACHE_MEMORY_MAX_ENTRIES', '1024')),
+    'MAX_WORKERS': int(os.getenv('TRANSLATION_CACHE_MAX_WORKERS', '5')),
+}
+
+# Хранение истории наблюдений. Последнее наблюдение каждого запроса хранится всегда, остальные
+# через RAW_TTL секунд сворачиваются в почасовые агрегаты, а почасовые через HOURLY_TTL - в суточные.
+# CHUNK_SIZE - количество записей, обрабатываемых в одной транзакции.
+
+RETENTION = {
+    'RAW_TTL': int(os.getenv('RETENTION_RAW_TTL', str(60 * 60 * 24))),
+    'HOURLY_TTL': int(os.getenv('RETENTION_HOURLY_TTL', str(60 * 60 * 24 * 30))),
+    'CHUNK_SIZE': int(os.getenv('RETENTION_CHUNK_SIZE', '500')),
+}
+
+# Фоновая запись истории запросов. MAX_QUEUE_SIZE - размер очереди операций записи,
+# BATCH_SIZE - максимальное количество операций в одной транзакции,
+# FLUSH_TIMEOUT - максимальное время ожидания записи очереди в секундах.
+
+HISTORY_WRITER = {
+    'MAX_QUEUE_SIZE': int(os.getenv('HISTORY_WRITER_MAX_QUEUE_SIZE', '1000')),
+    'BATCH_SIZE': int(os.getenv('HISTORY_WRITER_BATCH_SIZE', '50')),
+    'FLUSH_TIMEOUT': float(os.getenv('HISTORY_WRITER_FLUSH_TIMEOUT', '10')),
+}
+
+# Команда \вгородах. MAX_CONCURRENCY - количество одновременно обрабатываемых городов.
+# Частота запросов к OpenWeatherMap ограничивается в http_client (OWM_RATE_LIMIT_CALLS, OWM_RATE_LIMIT_PERIOD).
+
+MULTI_CITY = {
+    'MAX_CONCURRENCY': int(os.getenv('MULTI_CITY_MAX_CONCURRENCY', '8')),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,17 @@
+"""
+Облегченный профиль настроек для консольного приложения.
+
+Консоли не нужны admin, auth, sessions, messages, staticfiles и стек middleware, поэтому они не загружаются
+при запуске. Все остальные настройки берутся из core.settings.
+"""
+from core.settings import *  # noqa: F401,F403  # pylint: disable=wildcard-import,unused-wildcard-import
+
+INSTALLED_APPS = [
+    'weather_console',
+]
+
+MIDDLEWARE = []
+
+TEMPLATES = []
+
+AUTH_PASSWORD_VALIDATORS = []
@@ -1,7 +1,88 @@
+import argparse
+import os
+import sys
+from typing import List
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings_cli')
+django.setup()
+
+from django.conf import settings
+
 from setup import setup_django
+from weather_console.handlers.batch_handler import RECORD_WRITERS, BatchOptions, async_run_batch, iter_queries
 from weather_console.handlers.command_handler import CommandHandler
-def main():
+from weather_console.services.history_writer import history_writer
+from weather_console.services.model_services import get_language_code, get_units_code
+from weather_console.weather_api.http_client import run_with_async_client
+from weather_console.weather_by_name.translator import CachedTranslator
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    '''
+    Разбирает аргументы командной строки.
+
+    Args:
+        argv (List[str] | None): Аргументы командной строки, по умолчанию sys.argv.
+
+    Returns:
+        Разобранные аргументы.
+    '''
+
+    parser = argparse.ArgumentParser(description='Консольное приложение для получения погоды.')
+    subparsers = parser.add_subparsers(dest='mode')
+
+    batch_parser = subparsers.add_parser(
+        'batch',
+        help='Неинтерактивный режим: погода для списка городов с выводом по одной записи на строку.',
+        description='Получает погоду для городов из аргументов, файла или стандартного ввода. '
+                    'Для каждого города выбирается наиболее подходящий результат.')
+    batch_parser.add_argument('cities', nargs='*', help='Названия городов в формате "город" или "город, страна".')
+    batch_parser.add_argument('-i', '--input', type=argparse.FileType('r', encoding='utf-8'),
+                              help='Файл с названиями городов, по одному на строку; - для стандартного ввода.')
+    batch_parser.add_argument('-f', '--format', choices=sorted(RECORD_WRITERS), default='ndjson',
+                              help='Формат вывода.')
+    batch_parser.add_argument('-w', '--window', type=int, default=settings.MULTI_CITY['MAX_CONCURRENCY'],
+                              help='Максимальное количество одновременно обрабатываемых городов.')
+
+    args = parser.parse_args(argv)
+    if args.mode == 'batch':
+        if args.window < 1:
+            batch_parser.error('Значение --window должно быть положительным.')
+        if not args.cities and args.input is None:
+            if sys.stdin.isatty():
+                batch_parser.error('Укажите названия городов или файл --input.')
+            args.input = sys.stdin
+    return args
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    '''
+    Запуск неинтерактивного режима.
+
+    Args:
+        args (argparse.Namespace): Аргументы командной строки.
+
+    Returns:
+        Код завершения: 0, если погода получена для всех городов, иначе 1.
+    '''
+
+    stats = run_with_async_client(async_run_batch(
+        iter_queries(args.cities, args.input),
+        RECORD_WRITERS[args.format](sys.stdout),
+        BatchOptions(get_units_code(), get_language_code(), CachedTranslator()),
+        window=args.window))
+    history_writer.flush()
+    return 1 if stats['failed'] else 0
+
+
+def main(argv: List[str] | None = None):
     '''Запуск.'''
+    args = parse_args(argv)
+    if args.mode == 'batch':
+        sys.exit(run_batch(args))
+
     command_handler = CommandHandler()
     command_handler.run()
 
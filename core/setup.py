@@ -1,12 +1,47 @@
 import os
+from pathlib import Path
+from typing import Set, Tuple
 
 import django
-from django.core.management import call_command
+from django.apps import apps
+from django.db import DatabaseError, connection
+
+
+def get_unapplied_migrations() -> Set[Tuple[str, str]]:
+    '''
+    Сравнивает файлы миграций установленных приложений с таблицей django_migrations.
+    Проверка не загружает граф миграций и выполняет один запрос к базе данных.
+
+    Returns:
+        Множество неприменённых миграций вида (приложение, имя миграции).
+    '''
+
+    on_disk = set()
+    for app_config in apps.get_app_configs():
+        migrations_dir = Path(app_config.path) / 'migrations'
+        if migrations_dir.is_dir():
+            on_disk.update((app_config.label, path.stem) for path in migrations_dir.glob('[!_]*.py'))
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT app, name FROM django_migrations')
+            applied = set(cursor.fetchall())
+    except DatabaseError:
+        return on_disk
+
+    return on_disk - applied
 
 
 def setup_django():
     '''
     Настраивает Django, выполняет миграции и инициализацию базы данных.
+    Миграции выполняются, только если в проекте есть неприменённые миграции.
     '''
-    call_command('makemigrations', verbosity=0)
-    call_command('migrate', verbosity=0)
+
+    if get_unapplied_migrations():
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+
+    from weather_console.services.model_services import ensure_user_preferences
+    ensure_user_preferences()
@@ -0,0 +1,179 @@
+import asyncio
+import csv
+import json
+import logging
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, NamedTuple, TextIO
+
+from weather_console.services.history_writer import history_writer
+from weather_console.weather_api.pipeline import async_get_weather_in_city
+from weather_console.weather_by_name.translator import CachedTranslator
+
+RECORD_FIELDS = [
+    'index', 'query', 'status', 'city', 'state', 'country', 'lat', 'lon',
+    'weather', 'temperature', 'feels_like', 'wind_speed', 'units', 'error',
+]
+
+logger = logging.getLogger(__name__)
+
+
+class BatchOptions(NamedTuple):
+    '''
+    Параметры получения погоды, общие для всех городов пакета.
+    '''
+
+    units: str
+    lang_preference: str
+    translator: CachedTranslator
+
+
+class NdjsonRecordWriter:
+    '''
+    Выводит записи в формате NDJSON: один JSON-объект на строку.
+    '''
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+
+    def write(self, record: Dict[str, str | float | int | None]):
+        '''
+        Выводит запись и сразу сбрасывает буфер потока.
+
+        Args:
+            record (Dict[str, str | float | int | None]): Запись с полями RECORD_FIELDS.
+        '''
+
+        self._stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._stream.flush()
+
+
+class CsvRecordWriter:
+    '''
+    Выводит записи в формате CSV. Заголовок с названиями полей выводится первой строкой.
+    '''
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._writer = csv.DictWriter(stream, fieldnames=RECORD_FIELDS, lineterminator='\n')
+        self._writer.writeheader()
+
+    def write(self, record: Dict[str, str | float | int | None]):
+        '''
+        Выводит запись и сразу сбрасывает буфер потока.
+
+        Args:
+            record (Dict[str, str | float | int | None]): Запись с полями RECORD_FIELDS.
+        '''
+
+        self._writer.writerow(record)
+        self._stream.flush()
+
+
+RECORD_WRITERS = {
+    'ndjson': NdjsonRecordWriter,
+    'csv': CsvRecordWriter,
+}
+
+
+def iter_queries(cities: List[str], input_stream: TextIO | None = None) -> Iterator[str]:
+    '''
+    Предоставляет названия городов из аргументов командной строки, а затем из потока ввода.
+    Поток читается построчно, пустые строки пропускаются.
+
+    Args:
+        cities (List[str]): Названия городов из аргументов командной строки.
+        input_stream (TextIO | None): Файл или стандартный ввод с названиями городов, по одному на строку.
+
+    Returns:
+        Итератор названий городов.
+    '''
+
+    lines = chain(cities, input_stream if input_stream is not None else ())
+    return (query for query in (line.strip() for line in lines) if query)
+
+
+def _make_record(index: int, query: str, units: str) -> Dict[str, str | float | int | None]:
+    record = dict.fromkeys(RECORD_FIELDS)
+    record.update(index=index, query=query, units=units)
+    return record
+
+
+async def _process_query(index: int, query: str, options: BatchOptions) -> Dict[str, str | float | int | None]:
+    '''
+    Получает погоду для одного города и ставит запись истории в очередь фоновой записи.
+    Постановка в очередь выполняется в отдельном потоке, так как при заполненной очереди она ждет
+    освобождения места и иначе остановила бы цикл событий вместе со всеми запущенными запросами.
+
+    Args:
+        index (int): Порядковый номер названия во входных данных.
+        query (str): Название города в формате {город} или {город, страна}.
+        options (BatchOptions): Параметры получения погоды.
+
+    Returns:
+        Запись с полями RECORD_FIELDS. В случае ошибки заполняются поля status и error.
+    '''
+
+    record = _make_record(index, query, options.units)
+    try:
+        city_coordinates, parsed_weather_data = await async_get_weather_in_city(
+            query, options.units, options.lang_preference, translator=options.translator)
+    except (ConnectionError, TimeoutError, ValueError) as e:
+        record.update(status='error', error=e.args[0])
+        return record
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception('Не удалось получить погоду для %r.', query)
+        record.update(status='error', error='Не удалось получить данные о погоде.')
+        return record
+
+    await asyncio.to_thread(history_writer.submit_fill_db, city_coordinates, parsed_weather_data)
+    record.update({field: city_coordinates.get(field) for field in ('city', 'state', 'country', 'lat', 'lon')})
+    record.update(parsed_weather_data)
+    record['status'] = 'ok'
+    return record
+
+
+async def async_run_batch(queries: Iterable[str], record_writer: NdjsonRecordWriter | CsvRecordWriter,
+                          options: BatchOptions, *, window: int) -> Dict[str, int]:
+    '''
+    Получает погоду для всех городов без уточнений у пользователя и выводит записи по мере готовности.
+
+    Одновременно обрабатывается не более window городов, и следующее название читается из входных данных
+    только когда освобождается место, поэтому потребление памяти не зависит от количества городов.
+    Записи выводятся в порядке завершения, порядковый номер названия передается в поле index.
+    Чтение входных данных выполняется в отдельном потоке, чтобы медленный источник не останавливал
+    обработку уже запущенных городов.
+
+    Args:
+        queries (Iterable[str]): Названия городов.
+        record_writer (NdjsonRecordWriter | CsvRecordWriter): Вывод записей.
+        options (BatchOptions): Параметры получения погоды.
+        window (int): Максимальное количество одновременно обрабатываемых городов.
+
+    Returns:
+        Словарь с количеством успешно и неуспешно обработанных городов.
+    '''
+
+    stats = {'ok': 0, 'failed': 0}
+    queries = iter(queries)
+    pending = set()
+
+    async def write_completed():
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            record = task.result()
+            stats['ok' if record['status'] == 'ok' else 'failed'] += 1
+            record_writer.write(record)
+
+    index = 0
+    while (query := await asyncio.to_thread(next, queries, None)) is not None:
+        index += 1
+        pending.add(asyncio.create_task(
+            _process_query(index, query, options)))
+        if len(pending) >= window:
+            await write_completed()
+
+    while pending:
+        await write_completed()
+
+    return stats
@@ -1,33 +1,36 @@
 import asyncio
-import os
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
-import django
-from django.db import transaction
-from googletrans import Translator
 from rich.console import Console
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
-django.setup()
-
-from weather_console.handlers.paginator import Paginator, get_request_id_from_user
+from weather_console.handlers.paginator import Paginator, get_request_id_from_user, redraw_stats
 from weather_console.retrieve_data.retrieve_coordinates import create_table_for_display_coordinate_refinement
-from weather_console.retrieve_data.retrieve_weather import create_table_for_display_weather
+from weather_console.retrieve_data.retrieve_diagnostics import create_table_for_display_diagnostics
+from weather_console.retrieve_data.retrieve_weather import (
+    create_table_for_display_weather, create_table_for_display_weather_in_cities
+)
+from weather_console.services.cache_services import (
+    weather_cache_stats, geocoding_cache_stats, reverse_geocoding_cache_stats
+)
+from weather_console.services.history_writer import history_writer
 from weather_console.services.model_services import (
-    fill_db, get_user_request_history, get_request_instance_by_user_request,
-    get_user_request_instance, increase_user_request_counter, get_weather_instance_by_user_request, get_is_first_time,
-    set_is_first_time, get_instruction_on_start, set_instruction_on_start, get_language_code, get_language,
-    set_language, get_units_code, get_units, set_units
+    get_user_request_history, get_latest_request_response_connection, increase_user_request_counter,
+    get_is_first_time, set_is_first_time, get_instruction_on_start, set_instruction_on_start, get_language_code,
+    get_language, set_language, get_units_code, get_units, set_units, preferences_session
 )
 from weather_console.services.prepare_data import prepare_request_data, prepare_response_data
 from weather_console.utilities.utils import prepare_weather_data_to_representation
-from weather_console.weather_api.geocoding_api import (
-    get_city_coordinates, parse_geocoding_response, get_coordinates_from_parsed_geocoding_response,
-    get_city_coordinates_reversed
+from weather_console.weather_api.cached_api import get_cached_weather_data
+from weather_console.weather_api.geocoding_api import get_coordinates_from_parsed_geocoding_response
+from weather_console.weather_api.http_client import get_connection_stats, run_with_async_client
+from weather_console.weather_api.openweathermap_api import parse_weather_data
+from weather_console.weather_api.pipeline import (
+    async_get_city_candidates, async_get_weather_by_coordinates, async_get_weather_in_cities
 )
-from weather_console.weather_api.openweathermap_api import get_weather_data, parse_weather_data
+from weather_console.weather_api.prefetch import WeatherPrefetcher
 from weather_console.weather_by_location.weather_by_location import get_latitude_and_longitude
-from weather_console.weather_by_name.weather_by_name import get_location_names
+from weather_console.weather_by_name.translator import CachedTranslator
+from weather_console.weather_by_name.weather_by_name import CountryNotFoundError
 
 
 class CommandHandler:
@@ -38,13 +41,16 @@ class CommandHandler:
     def __init__(self):
         self._COMMAND_MAP = {
             r'\вгороде': self._handle_weather_by_name,
+            r'\вгородах': self._handle_weather_in_cities,
             r'\влокации': self._handle_weather_by_location,
             r'\впопулярные': self._handle_request_history,
             r'\внастройки': self._handle_settings,
             r'\винструкцию': self._show_instructions,
+            r'\вдиагностику': self._show_diagnostics,
+            r'\ванализ': self._show_analytics,
             r'\выйти': self._exit,
         }
-        self._translator = Translator()
+        self._translator = CachedTranslator()
         self._console = Console()
         self._is_running = True
         self._HISTORY_CHOICE_MAP = {
@@ -103,22 +109,17 @@ class CommandHandler:
                                          'Формат ввода {город} или {город, страна}: ')
 
         try:
-            city_country_data = get_location_names(user_input, translator=self._translator)
-        except ValueError as e:
+            coordinates_list = run_with_async_client(async_get_city_candidates(
+                user_input,
+                self._language_code,
+                translator=self._translator))
+        except CountryNotFoundError as e:
             self._console.print(e.args[0])
             return self._handle_weather_by_name()
-
-        try:
-            coordinates_geocoding = get_city_coordinates(city_country_data)
         except (ConnectionError, TimeoutError, ValueError) as e:
             self._console.print(e.args[0])
             return
 
-        coordinates_list = parse_geocoding_response(
-            coordinates_geocoding,
-            self._language_code,
-            translator=self._translator)
-
         city_coordinates = self._refinement_city(coordinates_list)
 
         try:
@@ -127,9 +128,44 @@ class CommandHandler:
             self._console.print(e.args[0])
             return
 
-        fill_db(city_coordinates, parsed_weather_data)
+        history_writer.submit_fill_db(city_coordinates, parsed_weather_data)
         self._to_representation_weather(city_coordinates, parsed_weather_data)
 
+    def _handle_weather_in_cities(self):
+        '''
+        Обработка команды \вгородах.
+        '''
+
+        user_input = self._console.input('Введите названия городов через точку с запятой. '
+                                         'Для каждого города будет выбран наиболее подходящий результат. \n'
+                                         'Формат ввода {город}; {город, страна}; ...: ')
+        user_inputs = [city.strip() for city in user_input.split(';') if city.strip()]
+        if not user_inputs:
+            self._console.print('Не указано ни одного города. \n')
+            return
+
+        results = run_with_async_client(async_get_weather_in_cities(
+            user_inputs,
+            self._units_code,
+            self._language_code,
+            translator=self._translator))
+
+        weather_data_list = []
+        for city_input, result in results:
+            if isinstance(result, (ConnectionError, TimeoutError, ValueError)):
+                weather_data_list.append({'city': city_input, 'weather': result.args[0]})
+                continue
+            if isinstance(result, Exception):
+                weather_data_list.append({'city': city_input, 'weather': 'Не удалось получить данные о погоде.'})
+                continue
+
+            city_coordinates, parsed_weather_data = result
+            history_writer.submit_fill_db(city_coordinates, parsed_weather_data)
+            weather_data_list.append(prepare_weather_data_to_representation(parsed_weather_data, city_coordinates,
+                                                                            self._units_code))
+
+        self._console.print(create_table_for_display_weather_in_cities(weather_data_list))
+
     def _get_refinement_index_of_city(self, city_amount: int):
         '''
         Уточняет координаты города, в случае множественного ответа от geocoding.
@@ -156,7 +192,7 @@ class CommandHandler:
     ]:
         '''
         Уточняет город при множественном выборе городов и возвращает словарь выбранного пользователем
-        города.
+        города. Пока пользователь выбирает, погода для всех кандидатов загружается в фоне.
 
         Args:
             parsed_geocoding_response (List[Dict[str, float | str | None]]): Отформатированный ответ от geocoding.
@@ -168,9 +204,11 @@ class CommandHandler:
         city_amount = len(parsed_geocoding_response)
 
         if city_amount != 1:
+            prefetcher = WeatherPrefetcher(parsed_geocoding_response, self._units_code, self._language_code)
             table_coordinates = create_table_for_display_coordinate_refinement(parsed_geocoding_response)
             self._console.print('Выберите номер нужного вам города: ', table_coordinates)
             city_index = self._get_refinement_index_of_city(city_amount)
+            prefetcher.finish(parsed_geocoding_response[city_index])
             return parsed_geocoding_response[city_index]
 
         return parsed_geocoding_response[0]
@@ -192,9 +230,33 @@ class CommandHandler:
         '''
 
         coords = get_coordinates_from_parsed_geocoding_response(city_coordinates)
-        weather_data = get_weather_data(*coords, units=self._units_code, lang_preference=self._language_code)
+        weather_data = get_cached_weather_data(*coords, units=self._units_code, lang_preference=self._language_code)
         return parse_weather_data(weather_data)
 
+    def _get_weather_by_coordinates(self, coords: Dict[str, float]) -> Tuple[Dict[str, float | str | None],
+                                                                             Dict[str, str | float | int]]:
+        '''
+        Предоставляет данные о городе и отформатированные данные о погоде по координатам.
+
+        Args:
+            coords (Dict[str, float]): Словарь с широтой и долготой.
+
+        Raises:
+            ConnectionError: В случае если присутствуют проблемы с интернет-соединением.
+            TimeoutError: В случае проблем подключения к сервису.
+            ValueError: В случае если город по координатам не был найден.
+
+        Returns:
+            Кортеж (данные о городе, данные о погоде).
+        '''
+
+        return run_with_async_client(async_get_weather_by_coordinates(
+            coords.get('lat'),
+            coords.get('lon'),
+            units=self._units_code,
+            lang_preference=self._language_code,
+            translator=self._translator))
+
     def _to_representation_weather(self,
                                    city_coordinates: Dict[str, float | str | None],
                                    parsed_weather_data: Dict[str, str | float | int]
@@ -225,25 +287,12 @@ class CommandHandler:
             return
 
         try:
-            coordinates_geocoding = get_city_coordinates_reversed(**coords)
+            city_coordinates, parsed_weather_data = self._get_weather_by_coordinates(coords)
         except (ConnectionError, TimeoutError, ValueError) as e:
             self._console.print(e.args[0])
             return
 
-        coordinates_list = parse_geocoding_response(
-            coordinates_geocoding,
-            self._language_code,
-            translator=self._translator)
-
-        city_coordinates = self._refinement_city(coordinates_list)
-
-        try:
-            parsed_weather_data = self._get_parsed_weather_data(city_coordinates)
-        except (ConnectionError, TimeoutError) as e:
-            self._console.print(e.args[0])
-            return
-
-        fill_db(city_coordinates, parsed_weather_data, is_current_location=True)
+        history_writer.submit_fill_db(city_coordinates, parsed_weather_data, is_current_location=True)
         self._to_representation_weather(city_coordinates, parsed_weather_data)
 
     def _handle_request_history(self):
@@ -251,6 +300,7 @@ class CommandHandler:
         Обработка команды \впопулярные.
         '''
 
+        history_writer.flush()
         user_request_history = get_user_request_history()
         paginator = Paginator(user_request_history)
         user_request_pk = asyncio.run(get_request_id_from_user(paginator, self._console))
@@ -275,36 +325,23 @@ class CommandHandler:
         return self._refinement_choice()
 
     def _repeat_request(self, user_request_pk: int):
-        user_request = get_user_request_instance(user_request_pk)
-        request = get_request_instance_by_user_request(user_request_pk)
-        coords = prepare_request_data(request)
+        connection_instance = get_latest_request_response_connection(user_request_pk)
+        user_request = connection_instance.user_request
+        coords = prepare_request_data(connection_instance.request)
 
         try:
-            coordinates_geocoding = get_city_coordinates_reversed(**coords)
+            city_coordinates, parsed_weather_data = self._get_weather_by_coordinates(coords)
         except (ConnectionError, TimeoutError, ValueError) as e:
             self._console.print(e.args[0])
             return
 
-        coordinates_list = parse_geocoding_response(
-            coordinates_geocoding,
-            self._language_code,
-            translator=self._translator)
-
-        city_coordinates = self._refinement_city(coordinates_list)
-
-        try:
-            parsed_weather_data = self._get_parsed_weather_data(city_coordinates)
-        except (ConnectionError, TimeoutError) as e:
-            self._console.print(e.args[0])
-            return
-
-        increase_user_request_counter(user_request)
+        history_writer.submit(increase_user_request_counter, user_request)
         self._to_representation_weather(city_coordinates, parsed_weather_data)
 
     def _show_weather_from_history(self, user_request_pk: int):
-        user_request = get_user_request_instance(user_request_pk)
-        response = get_weather_instance_by_user_request(user_request_pk)
-        parsed_weather_data = prepare_response_data(user_request, response, self._units_code)
+        connection_instance = get_latest_request_response_connection(user_request_pk)
+        parsed_weather_data = prepare_response_data(connection_instance.user_request, connection_instance.response,
+                                                    self._units_code)
         weather_table = create_table_for_display_weather(parsed_weather_data)
         self._console.print(weather_table)
 
@@ -313,7 +350,7 @@ class CommandHandler:
         Обработка команды \внастройки.
         '''
 
-        with transaction.atomic():
+        with preferences_session():
             self._process_language()
             self._process_units()
             self._process_instruction()
@@ -359,25 +396,73 @@ class CommandHandler:
 Иногда приложение будет запрашивать ввод букв, для подтверждения или уточнения действий. Пожалуйста, используйте 
 буквы латинского алфавита.
 Чтобы узнать погодные условия в городе, воспользуйтесь командой \вгороде и следуйте дальнейшим указаниям. 
+Чтобы узнать погоду сразу в нескольких городах, введите \вгородах и перечислите города через точку с запятой.
 Для получения информации о погоде по вашему текущему месторасположению, используйте команду \влокации.
 Чтобы посмотреть историю ваших запросов введите \впопулярные. Данная команда позволят как повторить выбранный 
 запрос, так и показать погодные условия, полученные в результате вашего последнего запроса.
 Для настройки используйте команду \внастройки и следуйте инструкциям.
 Для повторного отображения настроек введите команду \винструкцию.
+Чтобы посмотреть статистику работы приложения (переиспользование соединений и т.п.), введите \вдиагностику.
+Для статистики погоды по городам из истории запросов (минимум, максимум, процентили, тренд) введите \ванализ.
 Для выхода из приложения напишите \выйти.
 '''
         self._console.print(instruction)
 
+    def _collect_diagnostics(self) -> Dict[str, Dict[str, int | float | str]]:
+        '''
+        Собирает статистику работы приложения.
+
+        Returns:
+            Статистика, сгруппированная по разделам.
+        '''
+
+        return {
+            'HTTP-соединения': get_connection_stats(),
+            'Кэш погоды': weather_cache_stats.as_dict(),
+            'Кэш геокодирования': geocoding_cache_stats.as_dict(),
+            'Кэш обратного геокодирования': reverse_geocoding_cache_stats.as_dict(),
+            'Кэш переводов': self._translator.get_stats(),
+            'Фоновая запись истории': history_writer.get_stats(),
+            'Перелистывание истории': redraw_stats.as_dict(),
+        }
+
+    def _show_diagnostics(self):
+        '''
+        Обработка команды \вдиагностику.
+        '''
+
+        self._console.print(create_table_for_display_diagnostics(self._collect_diagnostics()))
+
+    def _show_analytics(self):
+        '''
+        Обработка команды \ванализ. Модули аналитики импортируются при первом вызове команды,
+        так как могут загружать NumPy.
+        '''
+
+        from weather_console.retrieve_data.retrieve_analytics import create_table_for_display_analytics
+        from weather_console.services.analytics_services import get_history_statistics
+
+        history_writer.flush()
+        statistics = get_history_statistics()
+        if not statistics:
+            self._console.print('История запросов пуста. \n')
+            return
+
+        self._console.print(create_table_for_display_analytics(statistics))
+
     def _help(self):
         '''Демонстрирует краткую инструкцию.'''
 
         commands = '''
 1. \вгороде - узнать погоду по названию города. \n
-2. \влокации - узнать погоду в текущей локации. \n
-3. \впопулярные - просмотреть список самых популярных запросов. \n
-4. \внастройки - настройки персонализации. \n
-5. \винструкцию - показать инструкцию использования. \n
-6. \выйти - выход из приложения. \n
+2. \вгородах - узнать погоду сразу в нескольких городах. \n
+3. \влокации - узнать погоду в текущей локации. \n
+4. \впопулярные - просмотреть список самых популярных запросов. \n
+5. \внастройки - настройки персонализации. \n
+6. \винструкцию - показать инструкцию использования. \n
+7. \вдиагностику - показать статистику работы приложения. \n
+8. \ванализ - показать статистику погоды по городам из истории. \n
+9. \выйти - выход из приложения. \n
         '''
         self._console.print(commands)
 
@@ -388,6 +473,7 @@ class CommandHandler:
         '''
 
         self._is_running = False
+        history_writer.flush()
         self._console.print('Спасибо, что воспользовались приложением! Всего доброго!')
 
     def run(self):
@@ -410,12 +496,12 @@ class CommandHandler:
                 command = self._console.input('Введите команду: ')
                 if not command.startswith('\\'):
                     self._console.print(f'Введенной команды {command} не существует! Введите одну из '
-                                        f'списка \вгороде, \влокации, \впопулярные, \внастройки, \выйти. \n')
+                                        f'списка {", ".join(self._COMMAND_MAP)}. \n')
                 else:
                     handler = self._COMMAND_MAP.get(command)
                     if not handler:
                         self._console.print(f'Введенной команды {command} не существует! Введите одну из '
-                                            f'списка \вгороде, \влокации, \впопулярные, \внастройки, \выйти. \n')
+                                            f'списка {", ".join(self._COMMAND_MAP)}. \n')
                         self._start()
                     else:
                         handler()
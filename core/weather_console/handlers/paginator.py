@@ -1,26 +1,222 @@
 import asyncio
 import math
-import os
-from typing import Tuple, List
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Tuple, List
 
-import keyboard
-from django.db.models import QuerySet
-from rich.console import Console
+from asgiref.sync import sync_to_async
+from django.db.models import Q, QuerySet
+from rich.console import Console, ConsoleOptions, Group, RenderResult
+from rich.live import Live
+from rich.segment import Segment
 from rich.table import Table
+from rich.text import Text
 
+from weather_console.handlers.terminal_reader import BACKSPACE, ENTER, LEFT, RIGHT, TerminalReader
 from weather_console.models import UserRequestHistory
 
+_KEYS_PROMPT = 'Введите значение номера или просмотрите содержимое страниц, используя стрелки на клавиатуре: '
+_LINE_PROMPT = 'Введите значение номера или < и > для просмотра предыдущей и следующей страниц: '
+_LINE_PAGE_COMMANDS = {'<': LEFT, '>': RIGHT}
+
+
+class RedrawStats:
+    '''
+    Время перерисовки при перелистывании страниц: от нажатия стрелки до вывода новой страницы.
+    '''
+
+    def __init__(self, window: int = 100):
+        self._lock = threading.Lock()
+        self._durations = deque(maxlen=window)
+        self.flips = 0
+        self.cached = 0
+
+    def record(self, seconds: float, is_cached: bool):
+        '''
+        Регистрирует перелистывание страницы.
+
+        Args:
+            seconds (float): Время перерисовки в секундах.
+            is_cached (bool): Таблица страницы была взята из кэша.
+        '''
+
+        with self._lock:
+            self._durations.append(seconds)
+            self.flips += 1
+            self.cached += is_cached
+
+    def as_dict(self) -> Dict[str, int | str]:
+        '''
+        Предоставляет статистику перерисовки в виде словаря.
+
+        Returns:
+            Словарь с количеством перелистываний, количеством перелистываний из кэша и временем перерисовки
+            (последним, медианным и максимальным) по последним перелистываниям.
+        '''
+
+        with self._lock:
+            durations = list(self._durations)
+
+        stats = {'flips': self.flips, 'cached': self.cached}
+        if durations:
+            stats.update(last_ms=f'{durations[-1] * 1000:.1f}',
+                         median_ms=f'{statistics.median(durations) * 1000:.1f}',
+                         max_ms=f'{max(durations) * 1000:.1f}')
+        return stats
+
+
+redraw_stats = RedrawStats()
+
+
+class RenderedPage:
+    '''
+    Таблица страницы, заранее отрисованная в строки сегментов rich. Повторный вывод не требует
+    расчета ширины колонок и стилей.
+    '''
+
+    def __init__(self, lines: List[List[Segment]]):
+        self.lines = lines
+
+    def __rich_console__(self, _console: Console, _options: ConsoleOptions) -> RenderResult:
+        new_line = Segment.line()
+        for line in self.lines:
+            yield from line
+            yield new_line
+
 
 class Paginator:
     '''
     Класс для пагинации истории пользовательских запросов.
+
+    Страницы выбираются по ключу (counter, pk) без OFFSET: следующая страница начинается после последней
+    записи предыдущей. Загруженные и отрисованные страницы хранятся в ограниченных кэшах, поэтому
+    потребление памяти не зависит от размера истории.
+
+    Запросы к базе данных выполняются одним потоком, а кэш отрисованных страниц защищен блокировкой
+    и может читаться из цикла событий без обращения к базе данных.
     '''
 
-    def __init__(self, items: QuerySet[UserRequestHistory], page_size=5):
-        self.items = items
+    def __init__(self, items: QuerySet[UserRequestHistory], page_size=5, cache_size=8):
+        self.items = items.order_by('-counter', '-pk')
         self.page_size = page_size
-        self.total_pages = math.ceil(len(items) / page_size)
+        self.total_pages = math.ceil(self.items.count() / page_size)
         self.current_page = 1
+        self._cache_size = cache_size
+        self._pages: OrderedDict[int, List[Tuple[int, str, str, bool, int]]] = OrderedDict()
+        self._rendered: OrderedDict[Tuple[int, int], RenderedPage] = OrderedDict()
+        self._rendered_lock = threading.Lock()
+
+    def _fetch_page(self, page: int) -> List[Tuple[int, str, str, bool, int]]:
+        '''
+        Загружает страницу из базы данных. Если соседняя страница уже загружена, то выборка начинается
+        от ее граничной записи, иначе используется смещение.
+
+        Args:
+            page (int): Номер страницы.
+
+        Returns:
+            Список записей вида (pk, город, страна, маркер текущей локации, счетчик).
+        '''
+
+        rows = self.items.values_list('pk', 'city', 'country', 'is_current_location', 'counter')
+
+        previous_page = self._pages.get(page - 1)
+        if previous_page:
+            pk, *_, counter = previous_page[-1]
+            return list(rows.filter(Q(counter__lt=counter) | Q(counter=counter, pk__lt=pk))[:self.page_size])
+
+        next_page = self._pages.get(page + 1)
+        if next_page:
+            pk, *_, counter = next_page[0]
+            rows = rows.filter(Q(counter__gt=counter) | Q(counter=counter, pk__gt=pk)).order_by('counter', 'pk')
+            return list(reversed(rows[:self.page_size]))
+
+        start = (page - 1) * self.page_size
+        return list(rows[start:start + self.page_size])
+
+    def _get_page(self, page: int) -> List[Tuple[int, str, str, bool, int]]:
+        '''
+        Предоставляет страницу из кэша, загружая ее при необходимости.
+
+        Args:
+            page (int): Номер страницы.
+
+        Returns:
+            Список записей страницы.
+        '''
+
+        if page in self._pages:
+            self._pages.move_to_end(page)
+            return self._pages[page]
+
+        rows = self._fetch_page(page)
+        self._pages[page] = rows
+        while len(self._pages) > self._cache_size:
+            self._pages.popitem(last=False)
+        return rows
+
+    def render_page(self, console: Console, page: int | None = None) -> RenderedPage:
+        '''
+        Предоставляет отрисованную под ширину консоли таблицу страницы из кэша, отрисовывая ее при необходимости.
+
+        Args:
+            console (Console): Экземпляр консоли.
+            page (int | None): Номер страницы, по умолчанию текущая.
+
+        Returns:
+            Отрисованная страница.
+        '''
+
+        page = page or self.current_page
+        rendered_page = self.get_rendered_page(console, page)
+        if rendered_page is not None:
+            return rendered_page
+
+        table = self._build_table(page)
+        rendered_page = RenderedPage(console.render_lines(table, console.options, pad=False))
+        with self._rendered_lock:
+            self._rendered[page, console.width] = rendered_page
+            while len(self._rendered) > self._cache_size:
+                self._rendered.popitem(last=False)
+        return rendered_page
+
+    def get_rendered_page(self, console: Console, page: int | None = None) -> RenderedPage | None:
+        '''
+        Предоставляет уже отрисованную страницу без обращения к базе данных.
+
+        Args:
+            console (Console): Экземпляр консоли.
+            page (int | None): Номер страницы, по умолчанию текущая.
+
+        Returns:
+            Отрисованная страница или None, если страница еще не отрисована под текущую ширину консоли.
+        '''
+
+        key = (page or self.current_page, console.width)
+        with self._rendered_lock:
+            rendered_page = self._rendered.get(key)
+            if rendered_page is not None:
+                self._rendered.move_to_end(key)
+            return rendered_page
+
+    def prefetch_adjacent_pages(self, console: Console | None = None):
+        '''
+        Загружает в кэш соседние с текущей страницы. Если передана консоль, то страницы также отрисовываются.
+
+        Args:
+            console (Console | None): Экземпляр консоли.
+        '''
+
+        current_page = self.current_page
+        for page in (current_page + 1, current_page - 1):
+            if not 1 <= page <= self.total_pages:
+                continue
+            if console is None:
+                self._get_page(page)
+            else:
+                self.render_page(console, page)
 
     def get_page_items(self) -> List[Tuple[str, str, str, bool]]:
         '''
@@ -30,9 +226,8 @@ class Paginator:
             Список элементов.
         '''
 
-        start = (self.current_page - 1) * self.page_size
-        end = start + self.page_size
-        return [(str(item.pk), item.city, item.country, item.is_current_location) for item in self.items[start:end]]
+        return [(str(pk), city, country, is_current_location)
+                for pk, city, country, is_current_location, _ in self._get_page(self.current_page)]
 
     def next_page(self):
         '''
@@ -76,14 +271,28 @@ class Paginator:
             Таблица для отображения.
         '''
 
-        table = Table(title=f'Страница {self.current_page}/{self.total_pages}')
+        return self._build_table(self.current_page)
+
+    def _build_table(self, page: int) -> Table:
+        '''
+        Строит таблицу страницы.
+
+        Args:
+            page (int): Номер страницы.
+
+        Returns:
+            Таблица для отображения.
+        '''
+
+        table = Table(title=f'Страница {page}/{self.total_pages}')
 
         table.add_column('Номер', justify='left', style='bold')
         table.add_column('Название города', justify='center')
         table.add_column('Название страны', justify='center')
         table.add_column('Текущая локация', justify='center')
 
-        for item_id, city_name, country_name, is_current_location in self.get_page_items():
+        for pk, city_name, country_name, is_current_location, _ in self._get_page(page):
+            item_id = str(pk)
             if is_current_location:
                 table.add_row(item_id, city_name, country_name, '\u2713')
             else:
@@ -91,50 +300,202 @@ class Paginator:
 
         return table
 
-async def handle_arrows(paginator: Paginator, console: Console, stop_event: asyncio.Event):
+
+def _turn_page(paginator: Paginator, key: str) -> bool:
     '''
-    Обработчик нажатия стрелок.
+    Переключает страницу в зависимости от нажатой стрелки.
+
+    Args:
+        paginator (Paginator): Экземпляр класса пагинации.
+        key (str): LEFT или RIGHT.
+
+    Returns:
+        True, если текущая страница изменилась.
+    '''
+
+    page = paginator.current_page
+    if key == LEFT:
+        paginator.prev_page()
+    else:
+        paginator.next_page()
+    return page != paginator.current_page
+
+
+async def _get_current_page(paginator: Paginator, console: Console) -> Tuple[RenderedPage, bool]:
+    '''
+    Предоставляет отрисованную текущую страницу. Страница из кэша берется без переключения потоков,
+    иначе она загружается и отрисовывается вне цикла событий.
+
     Args:
         paginator (Paginator): Экземпляр класса пагинации.
         console (Console): Экземпляр консоли.
-        stop_event (asyncio.Event): Завершающее событие.
 
+    Returns:
+        Кортеж (отрисованная страница, маркер получения страницы из кэша).
     '''
 
-    while not stop_event.is_set():
-        if keyboard.is_pressed("left"):
-            paginator.prev_page()
-            console.clear()
-            console.print(paginator.create_table_for_display_page())
-            console.print("Введите значение номера или просмотрите содержимое страниц,"
-                          " используя стрелки на клавиатуре: \n")
-            await asyncio.sleep(0.2)
-        elif keyboard.is_pressed("right"):
-            paginator.next_page()
-            console.clear()
-            console.print(paginator.create_table_for_display_page())
-            console.print("Введите значение номера или просмотрите содержимое страниц,"
-                          " используя стрелки на клавиатуре: \n")
-            await asyncio.sleep(0.2)
-        await asyncio.sleep(0.1)
+    rendered_page = paginator.get_rendered_page(console)
+    if rendered_page is not None:
+        return rendered_page, True
+    return await sync_to_async(paginator.render_page)(console), False
+
+
+def _prefetch_in_background(paginator: Paginator, console: Console) -> asyncio.Task:
+    '''
+    Запускает фоновую загрузку и отрисовку соседних страниц, не задерживая обработку нажатий.
+
+    Args:
+        paginator (Paginator): Экземпляр класса пагинации.
+        console (Console): Экземпляр консоли.
+
+    Returns:
+        Задача подготовки страниц.
+    '''
+
+    return asyncio.create_task(sync_to_async(paginator.prefetch_adjacent_pages)(console))
+
+
+def _compose_view(rendered_page: RenderedPage, prompt: str, user_input: str, message: str = '') -> Group:
+    parts = [rendered_page]
+    if message:
+        parts.append(Text(message))
+    parts.append(Text(prompt + user_input))
+    return Group(*parts)
+
+
+async def _show_turned_page(paginator: Paginator, console: Console, live: Live, key: str,
+                            user_input: str) -> RenderedPage | None:
+    '''
+    Переключает страницу по нажатию стрелки и перерисовывает область Live с новой страницей.
+
+    Args:
+        paginator (Paginator): Экземпляр класса пагинации.
+        console (Console): Экземпляр консоли.
+        live (Live): Область вывода страницы.
+        key (str): Нажатая клавиша: LEFT или RIGHT.
+        user_input (str): Набранный номер запроса.
+
+    Returns:
+        Отрисованная новая страница или None, если страница не переключилась.
+    '''
+
+    started_at = time.perf_counter()
+    if not _turn_page(paginator, key):
+        return None
+    rendered_page, is_cached = await _get_current_page(paginator, console)
+    live.update(_compose_view(rendered_page, _KEYS_PROMPT, user_input), refresh=True)
+    redraw_stats.record(time.perf_counter() - started_at, is_cached)
+    return rendered_page
+
+
+async def _read_request_id_from_keys(paginator: Paginator, console: Console) -> int:
+    '''
+    Обрабатывает нажатия клавиш в одном месте: стрелки переключают страницы, цифры набирают номер,
+    Enter подтверждает выбор.
+
+    Страница, приглашение и набранный номер выводятся одной областью rich Live, которая при каждом
+    нажатии перерисовывается на месте без очистки экрана. Соседние страницы готовятся в фоне,
+    поэтому при перелистывании страница обычно уже отрисована.
+
+    Args:
+        paginator (Paginator): Экземпляр класса пагинации.
+        console (Console): Экземпляр консоли.
+
+    Returns:
+        Идентификационный номер выбранного запроса.
+    '''
+
+    user_input = ''
+    message = ''
+    rendered_page, _ = await _get_current_page(paginator, console)
+    prefetch_task = _prefetch_in_background(paginator, console)
+
+    try:
+        async with TerminalReader() as reader:
+            with Live(_compose_view(rendered_page, _KEYS_PROMPT, user_input), console=console, auto_refresh=False,
+                      redirect_stdout=False, redirect_stderr=False) as live:
+                while True:
+                    key = await reader.read_key()
+
+                    if key in (LEFT, RIGHT):
+                        turned_page = await _show_turned_page(paginator, console, live, key, user_input)
+                        if turned_page is not None:
+                            rendered_page, message = turned_page, ''
+                            prefetch_task = _prefetch_in_background(paginator, console)
+                        continue
+
+                    if key == ENTER:
+                        try:
+                            return await sync_to_async(paginator.check_inserted_id)(user_input)
+                        except ValueError as e:
+                            message = e.args[0]
+                            user_input = ''
+                    elif key == BACKSPACE:
+                        user_input = user_input[:-1]
+                    elif key.isdigit():
+                        user_input += key
+                    else:
+                        continue
+
+                    live.update(_compose_view(rendered_page, _KEYS_PROMPT, user_input, message), refresh=True)
+    finally:
+        prefetch_task.cancel()
 
 
-async def get_request_id_from_user(paginator: Paginator, console: Console):
-    stop_event = asyncio.Event()
-    console.print(paginator.create_table_for_display_page())
+async def _read_request_id_from_lines(paginator: Paginator, console: Console) -> int:
+    '''
+    Построчный ввод для окружений без поддержки чтения нажатий клавиш (Windows, перенаправленный ввод):
+    страницы переключаются командами < и >, страница выводится заново после очистки экрана.
+
+    Args:
+        paginator (Paginator): Экземпляр класса пагинации.
+        console (Console): Экземпляр консоли.
 
-    arrow_task = asyncio.create_task(handle_arrows(paginator, console, stop_event))
+    Returns:
+        Идентификационный номер выбранного запроса.
+    '''
+
+    rendered_page, _ = await _get_current_page(paginator, console)
+    console.print(rendered_page)
+    console.print(_LINE_PROMPT, end='')
+    prefetch_task = _prefetch_in_background(paginator, console)
 
     try:
         while True:
-            user_input = await asyncio.to_thread(
-                console.input,
-                "Введите значение номера или просмотрите содержимое страниц, используя стрелки на клавиатуре: \n",
-            )
-            try:
-                return paginator.check_inserted_id(user_input)
-            except ValueError as e:
-                console.print(e.args[0])
+            user_input = (await asyncio.to_thread(console.input)).strip()
+            key = _LINE_PAGE_COMMANDS.get(user_input)
+            if key is None:
+                try:
+                    return await sync_to_async(paginator.check_inserted_id)(user_input)
+                except ValueError as e:
+                    console.print(e.args[0])
+                    console.print(_LINE_PROMPT, end='')
+                    continue
+
+            started_at = time.perf_counter()
+            if _turn_page(paginator, key):
+                rendered_page, is_cached = await _get_current_page(paginator, console)
+                redraw_stats.record(time.perf_counter() - started_at, is_cached)
+                prefetch_task = _prefetch_in_background(paginator, console)
+            console.clear()
+            console.print(rendered_page)
+            console.print(_LINE_PROMPT, end='')
     finally:
-        stop_event.set()
-        await arrow_task
+        prefetch_task.cancel()
+
+
+async def get_request_id_from_user(paginator: Paginator, console: Console) -> int:
+    '''
+    Отображает историю запросов постранично и получает от пользователя номер выбранного запроса.
+
+    Args:
+        paginator (Paginator): Экземпляр класса пагинации.
+        console (Console): Экземпляр консоли.
+
+    Returns:
+        Идентификационный номер выбранного запроса.
+    '''
+
+    if TerminalReader.is_supported():
+        return await _read_request_id_from_keys(paginator, console)
+    return await _read_request_id_from_lines(paginator, console)
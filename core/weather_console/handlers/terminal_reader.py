@@ -0,0 +1,179 @@
+import asyncio
+import codecs
+import os
+import sys
+from typing import List, TextIO
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+    tty = None
+
+LEFT = 'left'
+RIGHT = 'right'
+ENTER = 'enter'
+BACKSPACE = 'backspace'
+
+_ESCAPE_SEQUENCES = {
+    '\x1b[D': LEFT,
+    '\x1b[C': RIGHT,
+    '\x1bOD': LEFT,
+    '\x1bOC': RIGHT,
+}
+_MAX_ESCAPE_SEQUENCE_LENGTH = 8
+
+
+class KeyDecoder:
+    '''
+    Преобразует поток символов терминала в нажатия клавиш. Управляющие последовательности стрелок
+    могут прийти по частям, поэтому незавершенная последовательность хранится до следующего чтения.
+    '''
+
+    def __init__(self):
+        self._pending = ''
+
+    def feed(self, data: str) -> List[str]:
+        '''
+        Разбирает очередную порцию символов.
+
+        Args:
+            data (str): Прочитанные символы.
+
+        Returns:
+            Список нажатых клавиш: LEFT, RIGHT, ENTER, BACKSPACE или сам символ.
+        '''
+
+        keys = []
+        buffer = self._pending + data
+        self._pending = ''
+
+        index = 0
+        while index < len(buffer):
+            char = buffer[index]
+            if char != '\x1b':
+                if char in '\r\n':
+                    keys.append(ENTER)
+                elif char in '\x7f\x08':
+                    keys.append(BACKSPACE)
+                elif char.isprintable():
+                    keys.append(char)
+                index += 1
+                continue
+
+            end = self._find_escape_sequence_end(buffer, index)
+            if end is None:
+                break
+
+            key = _ESCAPE_SEQUENCES.get(buffer[index:end])
+            if key is not None:
+                keys.append(key)
+            index = end
+
+        return keys
+
+    def _find_escape_sequence_end(self, buffer: str, index: int) -> int | None:
+        '''
+        Находит конец управляющей последовательности. Незавершенная последовательность сохраняется
+        до следующего чтения, если она не длиннее _MAX_ESCAPE_SEQUENCE_LENGTH.
+
+        Args:
+            buffer (str): Разбираемые символы.
+            index (int): Позиция символа ESC в buffer.
+
+        Returns:
+            Позиция после последовательности или None, если последовательность не завершена.
+        '''
+
+        end = index + 1
+        if end < len(buffer) and buffer[end] in '[O':
+            end += 1
+            while end < len(buffer) and not buffer[end].isalpha() and buffer[end] != '~':
+                end += 1
+            if end == len(buffer):
+                if end - index < _MAX_ESCAPE_SEQUENCE_LENGTH:
+                    self._pending = buffer[index:]
+                return None
+            end += 1
+        elif end == len(buffer):
+            self._pending = buffer[index:]
+            return None
+        return end
+
+
+class TerminalReader:
+    '''
+    Неблокирующее чтение нажатий клавиш из терминала.
+
+    Терминал переводится в режим cbreak (без буферизации строк и эха), а дескриптор стандартного ввода
+    регистрируется в цикле событий через add_reader, поэтому нажатия обрабатываются по мере поступления
+    без опроса клавиатуры и без дополнительных потоков. Ctrl+C продолжает работать.
+
+    Используется как асинхронный контекстный менеджер, при выходе настройки терминала восстанавливаются.
+    '''
+
+    def __init__(self, stream: TextIO | None = None):
+        self._stream = stream or sys.stdin
+        self._fd = self._stream.fileno()
+        self._decoder = KeyDecoder()
+        self._text_decoder = codecs.getincrementaldecoder(self._stream.encoding or 'utf-8')(errors='replace')
+        self._keys: asyncio.Queue[str | None] = asyncio.Queue()
+        self._saved_attributes = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @staticmethod
+    def is_supported(stream: TextIO | None = None) -> bool:
+        '''
+        Проверяет, можно ли читать нажатия клавиш из потока: нужен модуль termios и интерактивный терминал.
+
+        Args:
+            stream (TextIO | None): Поток ввода, по умолчанию стандартный ввод.
+
+        Returns:
+            True, если чтение нажатий поддерживается.
+        '''
+
+        stream = stream or sys.stdin
+        try:
+            return termios is not None and stream.isatty()
+        except ValueError:
+            return False
+
+    async def __aenter__(self) -> 'TerminalReader':
+        self._loop = asyncio.get_running_loop()
+        self._saved_attributes = termios.tcgetattr(self._fd)
+        tty.setcbreak(self._fd)
+        self._loop.add_reader(self._fd, self._on_readable)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._loop.remove_reader(self._fd)
+        termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved_attributes)
+
+    def _on_readable(self):
+        data = os.read(self._fd, 1024)
+        if not data:
+            self._loop.remove_reader(self._fd)
+            self._keys.put_nowait(None)
+            return
+
+        for key in self._decoder.feed(self._text_decoder.decode(data)):
+            self._keys.put_nowait(key)
+
+    async def read_key(self) -> str:
+        '''
+        Ожидает следующее нажатие клавиши.
+
+        Raises:
+            EOFError: В случае если стандартный ввод закрыт.
+
+        Returns:
+            LEFT, RIGHT, ENTER, BACKSPACE или введенный символ.
+        '''
+
+        key = await self._keys.get()
+        if key is None:
+            self._keys.put_nowait(None)
+            raise EOFError
+        return key
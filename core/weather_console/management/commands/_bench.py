@@ -0,0 +1,33 @@
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict
+
+from django.core.management import call_command
+from django.db import connections
+
+
+@contextmanager
+def temporary_database(profile: Dict[str, Any] | None = None):
+    '''
+    Подменяет базу данных по умолчанию временной базой SQLite с примененными миграциями.
+    После выхода соединения закрываются, а исходные настройки базы данных восстанавливаются.
+
+    Args:
+        profile (Dict[str, Any] | None): Дополнительные настройки базы данных, например профиль из SQLITE_PROFILES.
+    '''
+
+    database_settings = connections.settings['default']
+    original_settings = dict(database_settings)
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            connections.close_all()
+            database_settings.update(profile or {}, NAME=Path(directory) / 'bench.sqlite3')
+            call_command('migrate', verbosity=0)
+            yield
+            connections.close_all()
+    finally:
+        connections.close_all()
+        database_settings.clear()
+        database_settings.update(original_settings)
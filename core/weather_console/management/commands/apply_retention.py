@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from weather_console.services.retention_services import apply_retention
+
+
+class Command(BaseCommand):
+    help = ('Сворачивает устаревшие наблюдения погоды в почасовые и суточные агрегаты. '
+            'С флагом --loop выполняется периодически.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Количество записей в одной транзакции, по умолчанию RETENTION["CHUNK_SIZE"].')
+        parser.add_argument('--loop', action='store_true', help='Выполнять периодически до прерывания.')
+        parser.add_argument('--interval', type=int, default=60 * 60, help='Период выполнения в секундах.')
+
+    def handle(self, *args, **options):
+        while True:
+            result = apply_retention(chunk_size=options['chunk_size'])
+            self.stdout.write(f'Свернуто наблюдений: {result["observations"]}, '
+                              f'почасовых агрегатов: {result["hourly"]}.')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,102 @@
+import asyncio
+import io
+import resource
+import time
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand
+
+from weather_console.handlers.batch_handler import BatchOptions, NdjsonRecordWriter, async_run_batch
+from weather_console.management.commands._bench import temporary_database
+from weather_console.services.history_writer import history_writer
+from weather_console.weather_api import http_client
+from weather_console.weather_api.rate_limit import TokenBucket
+from weather_console.weather_by_name.translator import CachedTranslation, CachedTranslator
+
+
+class _EchoTranslator:
+    '''
+    Переводчик без обращения к сети: возвращает исходный текст.
+    '''
+
+    def translate(self, text: str, dest: str = 'en', src: str = 'auto') -> CachedTranslation:
+        return CachedTranslation(text, src, dest)
+
+
+class _FakeResponse:
+
+    def __init__(self, payload: Dict | List):
+        self.status_code = 200
+        self._payload = payload
+
+    def json(self) -> Dict | List:
+        return self._payload
+
+
+class _FakeAsyncClient:
+    '''
+    Асинхронный клиент, отвечающий как OpenWeatherMap с заданной задержкой. Подставляется вместо httpx,
+    поэтому запросы проходят через async_get_json и ограничитель частоты так же, как в рабочем режиме.
+    '''
+
+    def __init__(self, latency: float):
+        self._latency = latency
+        self.requests = 0
+
+    async def get(self, url: str, params: Dict[str, str | int | float]) -> _FakeResponse:
+        self.requests += 1
+        await asyncio.sleep(self._latency)
+        if url.endswith('/direct'):
+            city = params['q'].split(',')[0]
+            index = int(''.join(filter(str.isdigit, city)))
+            return _FakeResponse([{'name': city, 'local_names': {'ru': city}, 'country': 'FR', 'state': 'Область',
+                                   'lat': 40 + index / 100, 'lon': 2 + index / 100}])
+        return _FakeResponse({'dt': int(time.time()), 'weather': [{'description': 'ясно'}],
+                              'main': {'temp': 10.4, 'feels_like': 8.1}, 'wind': {'speed': 3.0}})
+
+
+class Command(BaseCommand):
+    help = ('Измеряет пакетный режим с имитацией OpenWeatherMap: запросы проходят через кэши, async_get_json '
+            'и ограничитель частоты, поэтому время включает ожидание лимита для промахов кэша.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=1000, help='Количество названий городов.')
+        parser.add_argument('--distinct', type=int, default=100, help='Количество различных городов.')
+        parser.add_argument('--window', type=int, default=8, help='Количество одновременно обрабатываемых городов.')
+        parser.add_argument('--latency', type=float, default=50, help='Задержка ответа сервиса в миллисекундах.')
+        parser.add_argument('--rate-calls', type=int, default=http_client.RATE_LIMIT_CALLS,
+                            help='Лимит запросов к сервису за период.')
+        parser.add_argument('--rate-period', type=float, default=http_client.RATE_LIMIT_PERIOD,
+                            help='Период лимита в секундах.')
+
+    def _run_batch(self, options: Dict, client: _FakeAsyncClient) -> Dict[str, int]:
+        async def run() -> Dict[str, int]:
+            queries = (f'Город {index % options["distinct"]}' for index in range(options['queries']))
+            batch_options = BatchOptions('metric', 'ru', CachedTranslator(_EchoTranslator()))
+            return await async_run_batch(queries, NdjsonRecordWriter(io.StringIO()), batch_options,
+                                         window=options['window'])
+
+        get_async_client = http_client.get_async_client
+        rate_limiter = http_client.rate_limiter
+        http_client.get_async_client = lambda: client
+        http_client.rate_limiter = TokenBucket(options['rate_calls'], options['rate_period'])
+        try:
+            return asyncio.run(run())
+        finally:
+            http_client.get_async_client = get_async_client
+            http_client.rate_limiter = rate_limiter
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            client = _FakeAsyncClient(options['latency'] / 1000)
+            started_at = time.perf_counter()
+            stats = self._run_batch(options, client)
+            elapsed = time.perf_counter() - started_at
+            history_writer.flush()
+
+        limit_wait = max(client.requests - options['rate_calls'], 0) * options['rate_period'] / options['rate_calls']
+        self.stdout.write(f'Городов: {stats["ok"]} успешно, {stats["failed"]} с ошибкой')
+        self.stdout.write(f'Запросов к сервису: {client.requests}, '
+                          f'минимальное ожидание лимита: {limit_wait:.2f} с')
+        self.stdout.write(f'Время: {elapsed:.2f} с, {options["queries"] / elapsed:.0f} городов/с')
+        self.stdout.write(f'Пиковая память: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} МБ')
@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+
+from weather_console.management.commands._bench import temporary_database
+from weather_console.services.model_services import fill_db
+
+
+def _get_city_coordinates(index: int) -> Dict[str, float | str]:
+    return {'city': f'Город {index % 50}', 'state': None, 'country': 'Страна',
+            'lat': 55 + index % 50 / 100, 'lon': 37 + index % 50 / 100}
+
+
+def _get_parsed_weather_data() -> Dict[str, str | float]:
+    return {'weather': 'Ясно', 'temperature': 10.4, 'feels_like': 8.1, 'wind_speed': 3.0}
+
+
+class Command(BaseCommand):
+    help = 'Измеряет пропускную способность fill_db для профилей соединения SQLite из SQLITE_PROFILES.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500, help='Количество вызовов fill_db.')
+        parser.add_argument('--writers', type=int, default=4, help='Количество одновременных потоков записи.')
+
+    def _run_writers(self, iterations: int, writers: int) -> Dict[str, float | int]:
+        '''
+        Выполняет вызовы fill_db в нескольких потоках, каждый со своим соединением.
+
+        Args:
+            iterations (int): Общее количество вызовов.
+            writers (int): Количество потоков.
+
+        Returns:
+            Словарь с количеством успешных вызовов, ошибок блокировки и временем выполнения.
+        '''
+
+        result = {'ok': 0, 'locked': 0}
+        lock = threading.Lock()
+
+        def writer(start: int):
+            try:
+                for index in range(start, iterations, writers):
+                    try:
+                        fill_db(_get_city_coordinates(index), _get_parsed_weather_data())
+                        key = 'ok'
+                    except OperationalError:
+                        key = 'locked'
+                    with lock:
+                        result[key] += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=writer, args=(start,)) for start in range(writers)]
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result['seconds'] = time.perf_counter() - started_at
+        return result
+
+    def handle(self, *args, **options):
+        for profile_name, profile in settings.SQLITE_PROFILES.items():
+            with temporary_database(profile):
+                connections.close_all()
+                result = self._run_writers(options['iterations'], options['writers'])
+
+            self.stdout.write(
+                f'{profile_name}: {result["ok"] / result["seconds"]:.0f} вызовов/с, '
+                f'успешно {result["ok"]}, ошибок блокировки {result["locked"]}, {result["seconds"]:.2f} с'
+            )
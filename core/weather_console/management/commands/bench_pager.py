@@ -0,0 +1,87 @@
+import io
+import statistics
+import time
+from typing import List
+
+from django.core.management.base import BaseCommand
+from rich.console import Console
+from rich.live import Live
+
+from weather_console.handlers.paginator import Paginator
+from weather_console.management.commands._bench import temporary_database
+from weather_console.models import UserRequestHistory
+
+
+class Command(BaseCommand):
+    help = ('Измеряет время перерисовки при перелистывании истории запросов: полная перерисовка экрана '
+            'с построением страницы против перерисовки на месте с подготовленными соседними страницами.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--history', type=int, default=10000, help='Количество записей в истории.')
+        parser.add_argument('--flips', type=int, default=200, help='Количество перелистываний.')
+
+    @staticmethod
+    def _make_console() -> Console:
+        return Console(file=io.StringIO(), width=100, height=40, force_terminal=True)
+
+    def _flip_with_clear(self, flips: int) -> List[float]:
+        '''
+        Перелистывание с очисткой экрана и построением каждой страницы заново.
+
+        Args:
+            flips (int): Количество перелистываний.
+
+        Returns:
+            Время перерисовки каждого перелистывания в секундах.
+        '''
+
+        console = self._make_console()
+        durations = []
+        for _ in range(flips):
+            paginator = Paginator(UserRequestHistory.objects.all())
+            paginator.current_page = len(durations) % paginator.total_pages + 1
+            started_at = time.perf_counter()
+            console.clear()
+            console.print(paginator.create_table_for_display_page())
+            durations.append(time.perf_counter() - started_at)
+        return durations
+
+    def _flip_in_place(self, flips: int) -> List[float]:
+        '''
+        Перелистывание с перерисовкой на месте через rich Live. Соседние страницы загружаются и отрисовываются
+        после каждого перелистывания, как это делает фоновая задача пагинатора.
+
+        Args:
+            flips (int): Количество перелистываний.
+
+        Returns:
+            Время перерисовки каждого перелистывания в секундах.
+        '''
+
+        console = self._make_console()
+        paginator = Paginator(UserRequestHistory.objects.all())
+        durations = []
+        with Live(paginator.render_page(console), console=console, auto_refresh=False,
+                  redirect_stdout=False, redirect_stderr=False) as live:
+            paginator.prefetch_adjacent_pages(console)
+            for _ in range(flips):
+                started_at = time.perf_counter()
+                paginator.next_page()
+                live.update(paginator.render_page(console), refresh=True)
+                durations.append(time.perf_counter() - started_at)
+                paginator.prefetch_adjacent_pages(console)
+        return durations
+
+    def _write_result(self, name: str, durations: List[float]):
+        self.stdout.write(f'{name}: медиана {statistics.median(durations) * 1000:.2f} мс, '
+                          f'максимум {max(durations) * 1000:.2f} мс')
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            UserRequestHistory.objects.bulk_create(
+                UserRequestHistory(city=f'Город {index}', country='Страна', counter=index % 97)
+                for index in range(options['history'])
+            )
+
+            self._write_result('Очистка экрана', self._flip_with_clear(options['flips']))
+            self._write_result('Перерисовка на месте', self._flip_in_place(options['flips']))
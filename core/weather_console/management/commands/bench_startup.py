@@ -0,0 +1,54 @@
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+_STARTUP_SCRIPT = 'import main; main.setup_django()'
+_IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Измеряет время холодного запуска консольного приложения до первого приглашения к вводу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Количество запусков.')
+        parser.add_argument('--importtime', type=int, default=0, metavar='N',
+                            help='Показать N модулей верхнего уровня с наибольшим временем импорта (-X importtime).')
+
+    def _show_importtime(self, limit: int):
+        '''
+        Запускает приложение с -X importtime и выводит модули, импортированные напрямую точкой входа
+        и ее зависимостями первого уровня, отсортированные по суммарному времени импорта.
+
+        Args:
+            limit (int): Количество выводимых модулей.
+        '''
+
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', _STARTUP_SCRIPT],
+                                   cwd=settings.BASE_DIR, check=True, capture_output=True, text=True)
+
+        modules = []
+        for line in completed.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match and len(match.group(3)) <= 3:
+                modules.append((int(match.group(2)), match.group(4)))
+
+        for cumulative, module in sorted(modules, reverse=True)[:limit]:
+            self.stdout.write(f'{cumulative / 1000:9.1f} мс  {module}')
+
+    def handle(self, *args, **options):
+        durations = []
+        for _ in range(options['runs']):
+            started_at = time.perf_counter()
+            subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT], cwd=settings.BASE_DIR, check=True)
+            durations.append(time.perf_counter() - started_at)
+
+        self.stdout.write(f'Запуск: медиана {statistics.median(durations):.3f} с, '
+                          f'минимум {min(durations):.3f} с, максимум {max(durations):.3f} с')
+
+        if options['importtime']:
+            self._show_importtime(options['importtime'])
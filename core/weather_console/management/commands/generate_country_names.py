@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand
+from iso3166 import countries
+
+from weather_console.models import UserPreferences
+from weather_console.weather_by_name import country_names
+from weather_console.weather_by_name.translator import CachedTranslator
+
+_HEADER = '''"""
+Названия стран ISO-3166 на языках из UserPreferences.LANGUAGE_CHOICES и распространенные синонимы.
+
+Файл сгенерирован командой `python manage.py generate_country_names`. Команда дополняет таблицу
+недостающими странами и языками, не затрагивая уже существующие записи, поэтому ручные правки сохраняются.
+"""
+from typing import Dict
+
+'''
+
+MAX_LINE_LENGTH = 120
+
+
+def _render_translations(code: str, translations: Dict[str, str]) -> List[str]:
+    '''
+    Формирует строки записи одной страны. Запись выводится в одну строку, если она не длиннее
+    MAX_LINE_LENGTH, иначе каждый перевод выводится на отдельной строке.
+
+    Args:
+        code (str): Код страны.
+        translations (Dict[str, str]): Названия страны вида {код языка: название}.
+
+    Returns:
+        Строки исходного кода.
+    '''
+
+    values = ', '.join(f'{lang!r}: {name!r}' for lang, name in translations.items())
+    line = f'    {code!r}: {{{values}}},'
+    if len(line) <= MAX_LINE_LENGTH:
+        return [line]
+
+    lines = [f'    {code!r}: {{']
+    lines.extend(f'        {lang!r}: {name!r},' for lang, name in translations.items())
+    lines.append('    },')
+    return lines
+
+
+def render_country_names_module(names: Dict[str, Dict[str, str]], aliases: Dict[str, str]) -> str:
+    '''
+    Формирует исходный код модуля с таблицей названий стран.
+
+    Args:
+        names (Dict[str, Dict[str, str]]): Названия стран вида {код страны: {код языка: название}}.
+        aliases (Dict[str, str]): Синонимы названий стран вида {синоним: код страны}.
+
+    Returns:
+        Исходный код модуля.
+    '''
+
+    lines = [_HEADER, 'COUNTRY_NAMES: Dict[str, Dict[str, str]] = {']
+    for code, translations in names.items():
+        lines.extend(_render_translations(code, translations))
+    lines.append('}')
+    lines.append('')
+    lines.append('COUNTRY_ALIASES: Dict[str, str] = {')
+    for alias, code in aliases.items():
+        lines.append(f'    {alias!r}: {code!r},')
+    lines.append('}')
+    lines.append('')
+    return '\n'.join(lines)
+
+
+class Command(BaseCommand):
+    help = 'Дополняет таблицу названий стран недостающими странами и языками.'
+
+    def handle(self, *args, **options):
+        translator = CachedTranslator()
+        languages = [code for code, _ in UserPreferences.LANGUAGE_CHOICES]
+        names = {code: dict(translations) for code, translations in country_names.COUNTRY_NAMES.items()}
+
+        added = 0
+        for country in countries:
+            translations = names.setdefault(country.alpha2, {})
+            for lang in languages:
+                if lang in translations:
+                    continue
+                translated = translator.translate(country.apolitical_name, dest=lang.lower(), src='en').text
+                translations[lang] = ' '.join(word.capitalize() for word in translated.split())
+                added += 1
+
+        module_path = Path(country_names.__file__)
+        module_path.write_text(render_country_names_module(names, country_names.COUNTRY_ALIASES),
+                               encoding='utf-8')
+        self.stdout.write(f'Добавлено переводов: {added}. Файл: {module_path}')
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather_console', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='requestresponseconnection',
+            index=models.Index(fields=['user_request', '-created_at'], name='rr_connection_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userrequesthistory',
+            index=models.Index(fields=['-counter', '-id'], name='user_request_counter_idx'),
+        ),
+    ]
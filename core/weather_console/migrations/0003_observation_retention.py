@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather_console', '0002_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherObservationAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('hour', 'час'), ('day', 'день')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('samples', models.IntegerField()),
+                ('temperature_min', models.IntegerField()),
+                ('temperature_max', models.IntegerField()),
+                ('temperature_avg', models.FloatField()),
+                ('feels_like_avg', models.FloatField()),
+                ('wind_speed_min', models.FloatField()),
+                ('wind_speed_max', models.FloatField()),
+                ('wind_speed_avg', models.FloatField()),
+            ],
+            options={
+                'db_table': 'weather_observation_aggregate',
+                'managed': True,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='responsefromopenweather',
+            index=models.Index(fields=['response_time'], name='response_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='weatherobservationaggregate',
+            name='user_request',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='weather_console.userrequesthistory'),
+        ),
+        migrations.AddIndex(
+            model_name='weatherobservationaggregate',
+            index=models.Index(fields=['resolution', 'period_start'], name='observation_period_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='weatherobservationaggregate',
+            constraint=models.UniqueConstraint(fields=('user_request', 'resolution', 'period_start'), name='observation_aggregate_unique'),
+        ),
+    ]
@@ -0,0 +1,182 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:02
+
+from django.db import migrations, models
+from django.db.models import Max, Min, Sum
+
+
+def _merge_aggregates(WeatherObservationAggregate, keeper_pk, duplicate_pks):
+    for aggregate in WeatherObservationAggregate.objects.filter(user_request__in=duplicate_pks):
+        existing = WeatherObservationAggregate.objects.filter(
+            user_request=keeper_pk, resolution=aggregate.resolution, period_start=aggregate.period_start
+        ).first()
+        if existing is None:
+            aggregate.user_request_id = keeper_pk
+            aggregate.save(update_fields=['user_request'])
+            continue
+
+        samples = existing.samples + aggregate.samples
+        for field in ('temperature_avg', 'feels_like_avg', 'wind_speed_avg'):
+            value = (getattr(existing, field) * existing.samples + getattr(aggregate, field) * aggregate.samples)
+            setattr(existing, field, value / samples)
+        existing.temperature_min = min(existing.temperature_min, aggregate.temperature_min)
+        existing.temperature_max = max(existing.temperature_max, aggregate.temperature_max)
+        existing.wind_speed_min = min(existing.wind_speed_min, aggregate.wind_speed_min)
+        existing.wind_speed_max = max(existing.wind_speed_max, aggregate.wind_speed_max)
+        existing.samples = samples
+        existing.save()
+        aggregate.delete()
+
+
+def deduplicate_rows(apps, schema_editor):
+    '''
+    Объединяет дубликаты, которые могли появиться до добавления ограничений уникальности.
+
+    Пустые city и country приводятся к пустой строке, так как NULL не участвует в проверке уникальности.
+    Для каждого ключа остается запись с наименьшим идентификатором: счетчики дубликатов суммируются,
+    а связи запрос-ответ и агрегаты наблюдений переносятся на оставшуюся запись.
+    '''
+
+    UserRequestHistory = apps.get_model('weather_console', 'UserRequestHistory')
+    RequestParamsToOpenWeather = apps.get_model('weather_console', 'RequestParamsToOpenWeather')
+    RequestResponseConnection = apps.get_model('weather_console', 'RequestResponseConnection')
+    WeatherObservationAggregate = apps.get_model('weather_console', 'WeatherObservationAggregate')
+
+    UserRequestHistory.objects.filter(city__isnull=True).update(city='')
+    UserRequestHistory.objects.filter(country__isnull=True).update(country='')
+
+    duplicate_keys = UserRequestHistory.objects.values('city', 'country', 'is_current_location').annotate(
+        keeper_pk=Min('pk'), total=Sum('counter'), last_updated_at=Max('updated_at'), rows=models.Count('pk')
+    ).filter(rows__gt=1)
+    for key in duplicate_keys:
+        duplicate_pks = list(UserRequestHistory.objects.filter(
+            city=key['city'], country=key['country'], is_current_location=key['is_current_location']
+        ).exclude(pk=key['keeper_pk']).values_list('pk', flat=True))
+
+        RequestResponseConnection.objects.filter(user_request__in=duplicate_pks).update(user_request=key['keeper_pk'])
+        _merge_aggregates(WeatherObservationAggregate, key['keeper_pk'], duplicate_pks)
+        UserRequestHistory.objects.filter(pk__in=duplicate_pks).delete()
+        UserRequestHistory.objects.filter(pk=key['keeper_pk']).update(counter=key['total'],
+                                                                     updated_at=key['last_updated_at'])
+
+    duplicate_keys = RequestParamsToOpenWeather.objects.values('latitude', 'longitude').annotate(
+        keeper_pk=Min('pk'), rows=models.Count('pk')
+    ).filter(rows__gt=1)
+    for key in duplicate_keys:
+        duplicates = RequestParamsToOpenWeather.objects.filter(
+            latitude=key['latitude'], longitude=key['longitude']
+        ).exclude(pk=key['keeper_pk'])
+
+        RequestResponseConnection.objects.filter(request__in=duplicates).update(request=key['keeper_pk'])
+        duplicates.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather_console', '0003_observation_retention'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodingCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255)),
+                ('country_code', models.CharField(blank=True, default='', max_length=2)),
+                ('language', models.CharField(max_length=2)),
+                ('payload', models.JSONField()),
+                ('expires_at', models.DateTimeField()),
+                ('last_accessed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'geocoding_cache',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ReverseGeocodingCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('geohash', models.CharField(max_length=12)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('payload', models.JSONField()),
+                ('expires_at', models.DateTimeField()),
+                ('last_accessed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'reverse_geocoding_cache',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='TranslationCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('source', models.CharField(max_length=8)),
+                ('destination', models.CharField(max_length=8)),
+                ('translation', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'translation_cache',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='WeatherCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('units', models.CharField(max_length=8)),
+                ('language', models.CharField(max_length=2)),
+                ('payload', models.JSONField()),
+                ('observed_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('last_accessed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'weather_cache',
+                'managed': True,
+            },
+        ),
+        migrations.RunPython(deduplicate_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='requestparamstoopenweather',
+            constraint=models.UniqueConstraint(fields=('latitude', 'longitude'), name='request_params_coordinates_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='userrequesthistory',
+            constraint=models.UniqueConstraint(fields=('city', 'country', 'is_current_location'), name='user_request_history_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='geocodingcache',
+            index=models.Index(fields=['last_accessed_at'], name='geocoding_cache_lru_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='geocodingcache',
+            constraint=models.UniqueConstraint(fields=('query', 'country_code', 'language'), name='geocoding_cache_key_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='reversegeocodingcache',
+            index=models.Index(fields=['geohash'], name='reverse_geocoding_geohash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reversegeocodingcache',
+            index=models.Index(fields=['last_accessed_at'], name='reverse_geocoding_lru_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='translationcache',
+            constraint=models.UniqueConstraint(fields=('text', 'source', 'destination'), name='translation_cache_key_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='weathercache',
+            index=models.Index(fields=['last_accessed_at'], name='weather_cache_lru_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='weathercache',
+            constraint=models.UniqueConstraint(fields=('latitude', 'longitude', 'units', 'language'), name='weather_cache_key_unique'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather_console', '0004_cache_tables_and_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userrequesthistory',
+            name='city',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='userrequesthistory',
+            name='country',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
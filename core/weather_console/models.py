@@ -4,8 +4,8 @@ from django.db import models
 
 
 class UserRequestHistory(models.Model):
-    city = models.CharField(max_length=255, null=True)
-    country = models.CharField(max_length=255, null=True)
+    city = models.CharField(max_length=255, blank=True, default='')
+    country = models.CharField(max_length=255, blank=True, default='')
     is_current_location = models.BooleanField(default=False)
     counter = models.IntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
@@ -15,6 +15,13 @@ class UserRequestHistory(models.Model):
     class Meta:
         db_table = 'user_request_history'
         managed = True
+        constraints = [
+            models.UniqueConstraint(fields=['city', 'country', 'is_current_location'],
+                                    name='user_request_history_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['-counter', '-id'], name='user_request_counter_idx'),
+        ]
 
 
 class RequestParamsToOpenWeather(models.Model):
@@ -27,6 +34,9 @@ class RequestParamsToOpenWeather(models.Model):
     class Meta:
         db_table = 'request_params_to_openweather'
         managed = True
+        constraints = [
+            models.UniqueConstraint(fields=['latitude', 'longitude'], name='request_params_coordinates_unique'),
+        ]
 
 
 class ResponseFromOpenWeather(models.Model):
@@ -41,6 +51,9 @@ class ResponseFromOpenWeather(models.Model):
     class Meta:
         db_table = 'response_from_openweather'
         managed = True
+        indexes = [
+            models.Index(fields=['response_time'], name='response_time_idx'),
+        ]
 
 
 class RequestResponseConnection(models.Model):
@@ -53,6 +66,41 @@ class RequestResponseConnection(models.Model):
     class Meta:
         db_table = 'request_response_connection'
         managed = True
+        indexes = [
+            models.Index(fields=['user_request', '-created_at'], name='rr_connection_user_created_idx'),
+        ]
+
+
+class WeatherObservationAggregate(models.Model):
+    RESOLUTION_CHOICES = [
+        ('hour', 'час'),
+        ('day', 'день'),
+    ]
+
+    user_request = models.ForeignKey(UserRequestHistory, on_delete=models.CASCADE)
+    resolution = models.CharField(max_length=4, choices=RESOLUTION_CHOICES)
+    period_start = models.DateTimeField()
+    samples = models.IntegerField()
+    temperature_min = models.IntegerField()
+    temperature_max = models.IntegerField()
+    temperature_avg = models.FloatField()
+    feels_like_avg = models.FloatField()
+    wind_speed_min = models.FloatField()
+    wind_speed_max = models.FloatField()
+    wind_speed_avg = models.FloatField()
+
+    objects = models.Manager()
+
+    class Meta:
+        db_table = 'weather_observation_aggregate'
+        managed = True
+        constraints = [
+            models.UniqueConstraint(fields=['user_request', 'resolution', 'period_start'],
+                                    name='observation_aggregate_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['resolution', 'period_start'], name='observation_period_idx'),
+        ]
 
 
 class UserPreferences(models.Model):
@@ -109,13 +157,106 @@ class UserPreferences(models.Model):
         if self.units not in dict(self.UNITS_CHOICES):
             raise ValueError('Вы ввели неподдерживаемую единицу измерения.')
 
-    def save(self, *args, **kwargs):
+    def normalize(self):
+        '''
+        Приводит словесные представления языка и единиц измерения к кодовым значениям и проверяет их.
+
+        Raises:
+            ValueError: В случае неподдерживаемого языка или единицы измерения.
+        '''
+
         self.save_from_display(self.LANGUAGE_CHOICES, 'language')
         self._validate_language()
         self.save_from_display(self.UNITS_CHOICES, 'units')
         self._validate_units()
+
+    def save(self, *args, **kwargs):
+        self.normalize()
         super().save(*args, **kwargs)
 
     class Meta:
         db_table = 'user_preferences'
         managed = True
+
+
+class WeatherCache(models.Model):
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    units = models.CharField(max_length=8)
+    language = models.CharField(max_length=2)
+    payload = models.JSONField()
+    observed_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+    last_accessed_at = models.DateTimeField()
+
+    objects = models.Manager()
+
+    class Meta:
+        db_table = 'weather_cache'
+        managed = True
+        constraints = [
+            models.UniqueConstraint(fields=['latitude', 'longitude', 'units', 'language'],
+                                    name='weather_cache_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['last_accessed_at'], name='weather_cache_lru_idx'),
+        ]
+
+
+class GeocodingCache(models.Model):
+    query = models.CharField(max_length=255)
+    country_code = models.CharField(max_length=2, blank=True, default='')
+    language = models.CharField(max_length=2)
+    payload = models.JSONField()
+    expires_at = models.DateTimeField()
+    last_accessed_at = models.DateTimeField()
+
+    objects = models.Manager()
+
+    class Meta:
+        db_table = 'geocoding_cache'
+        managed = True
+        constraints = [
+            models.UniqueConstraint(fields=['query', 'country_code', 'language'],
+                                    name='geocoding_cache_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['last_accessed_at'], name='geocoding_cache_lru_idx'),
+        ]
+
+
+class ReverseGeocodingCache(models.Model):
+    geohash = models.CharField(max_length=12)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    payload = models.JSONField()
+    expires_at = models.DateTimeField()
+    last_accessed_at = models.DateTimeField()
+
+    objects = models.Manager()
+
+    class Meta:
+        db_table = 'reverse_geocoding_cache'
+        managed = True
+        indexes = [
+            models.Index(fields=['geohash'], name='reverse_geocoding_geohash_idx'),
+            models.Index(fields=['last_accessed_at'], name='reverse_geocoding_lru_idx'),
+        ]
+
+
+class TranslationCache(models.Model):
+    text = models.TextField()
+    source = models.CharField(max_length=8)
+    destination = models.CharField(max_length=8)
+    translation = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        db_table = 'translation_cache'
+        managed = True
+        constraints = [
+            models.UniqueConstraint(fields=['text', 'source', 'destination'],
+                                    name='translation_cache_key_unique'),
+        ]
@@ -0,0 +1,43 @@
+from typing import Dict, List, Tuple
+
+from rich.table import Table
+
+from weather_console.services.analytics_services import CityObservations
+
+
+def create_table_for_display_analytics(statistics: List[Tuple[CityObservations, Dict[str, float]]]) -> Table:
+    '''
+    Преобразует статистику наблюдений по городам в таблицу.
+    Args:
+        statistics (List[Tuple[CityObservations, Dict[str, float]]]): Статистика по городам.
+
+    Returns:
+        Таблица для вывода.
+    '''
+
+    table = Table(title='Статистика наблюдений')
+    table.add_column('Город', justify='left', style='bold')
+    table.add_column('Страна', justify='left')
+    table.add_column('Наблюдений', justify='right')
+    table.add_column('Температура мин / средн / макс', justify='center')
+    table.add_column('Температура P10 / P50 / P90', justify='center')
+    table.add_column('Ощущается как', justify='right')
+    table.add_column('Ветер средн / макс', justify='center')
+    table.add_column('Тренд температуры в сутки', justify='right')
+
+    for city_observations, stats in statistics:
+        city = city_observations.city
+        if city_observations.is_current_location:
+            city = f'{city} ✓'
+        table.add_row(
+            city,
+            city_observations.country,
+            str(stats['observations']),
+            f'{stats["temperature_min"]:.0f} / {stats["temperature_mean"]:.1f} / {stats["temperature_max"]:.0f}',
+            f'{stats["temperature_p10"]:.1f} / {stats["temperature_p50"]:.1f} / {stats["temperature_p90"]:.1f}',
+            f'{stats["feels_like_mean"]:.1f}',
+            f'{stats["wind_speed_mean"]:.1f} / {stats["wind_speed_max"]:.1f}',
+            f'{stats["temperature_trend"]:+.2f}',
+        )
+
+    return table
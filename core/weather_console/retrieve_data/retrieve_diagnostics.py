@@ -0,0 +1,26 @@
+from typing import Dict
+
+from rich.table import Table
+
+
+def create_table_for_display_diagnostics(diagnostics: Dict[str, Dict[str, int | float | str]]) -> Table:
+    '''
+    Преобразует словарь со статистикой работы приложения в таблицу.
+    Args:
+        diagnostics (Dict[str, Dict[str, int | float | str]]): Статистика, сгруппированная по разделам.
+
+    Returns:
+        Таблица для вывода.
+    '''
+
+    table = Table(title='Диагностика')
+    table.add_column('Раздел', justify='left', style='bold')
+    table.add_column('Показатель', justify='left')
+    table.add_column('Значение', justify='right')
+
+    for section, values in diagnostics.items():
+        for name, value in values.items():
+            table.add_row(section, name, str(value))
+            section = ''
+
+    return table
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 
 from rich.table import Table
 
@@ -37,3 +37,26 @@ def create_table_for_display_weather(weather_data: Dict[str, str]) -> Table:
     # table.add_row('Текущее время', datetime.now().strftime('%H:%M:%S %d.%m.%Y'))
 
     return table
+
+
+def create_table_for_display_weather_in_cities(weather_data_list: List[Dict[str, str]]) -> Table:
+    '''
+    Преобразует список словарей из преобразованных данных от open weather в одну таблицу, по строке на город.
+    Текущее время одинаково для всех городов, поэтому выводится в заголовке таблицы.
+    Args:
+        weather_data_list (List[Dict[str, str]]): Преобразованные данные от open weather.
+
+    Returns:
+        Таблица для вывода.
+    '''
+
+    weather_names = [weather_name for weather_name in _HEADER_MAP if weather_name != 'time']
+
+    table = Table(title=datetime.now().strftime('%H:%M:%S %d.%m.%Y'))
+    for weather_name in weather_names:
+        table.add_column(_HEADER_MAP.get(weather_name), justify='center')
+
+    for weather_data in weather_data_list:
+        table.add_row(*(str(weather_data.get(weather_name, '')) for weather_name in weather_names))
+
+    return table
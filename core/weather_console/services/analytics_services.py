@@ -0,0 +1,238 @@
+import heapq
+from array import array
+from bisect import bisect_right
+from datetime import timedelta
+from itertools import groupby
+from math import ceil, floor
+from operator import itemgetter
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+from weather_console.models import RequestResponseConnection, WeatherObservationAggregate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_SECONDS_IN_DAY = 60 * 60 * 24
+_PERCENTILES = (10, 50, 90)
+_AGGREGATE_HALF_PERIOD = {
+    'hour': timedelta(minutes=30),
+    'day': timedelta(hours=12),
+}
+
+
+class ObservationColumns(NamedTuple):
+    '''
+    Наблюдения одного города в виде колонок. Каждая колонка - компактный массив чисел с плавающей точкой,
+    отсортированный по времени наблюдения.
+
+    Наблюдения, прореженные политикой хранения, представлены агрегатами: значение - среднее за период,
+    вес - количество исходных наблюдений, а минимум и максимум - крайние значения периода.
+    У исходных наблюдений вес равен 1, а минимум и максимум совпадают со значением.
+    '''
+
+    timestamps: array
+    temperature: array
+    feels_like: array
+    wind_speed: array
+    weights: array
+    temperature_min: array
+    temperature_max: array
+    wind_speed_max: array
+
+
+class CityObservations(NamedTuple):
+    '''
+    Наблюдения погоды для одного пользовательского запроса.
+    '''
+
+    city: str
+    country: str
+    is_current_location: bool
+    columns: ObservationColumns
+
+
+def _iter_raw_rows(chunk_size: int) -> Iterator[tuple]:
+    rows = RequestResponseConnection.objects.order_by('user_request', '-created_at').values_list(
+        'user_request_id', 'user_request__city', 'user_request__country', 'user_request__is_current_location',
+        'response__response_time', 'response__temperature', 'response__feels_like', 'response__wind_speed'
+    ).iterator(chunk_size=chunk_size)
+
+    for *user_request, response_time, temperature, feels_like, wind_speed in rows:
+        yield (*user_request, False, response_time.timestamp(), temperature, feels_like, wind_speed, 1,
+               temperature, temperature, wind_speed)
+
+
+def _iter_aggregate_rows(chunk_size: int) -> Iterator[tuple]:
+    rows = WeatherObservationAggregate.objects.order_by('user_request', 'period_start').values_list(
+        'user_request_id', 'user_request__city', 'user_request__country', 'user_request__is_current_location',
+        'resolution', 'period_start', 'temperature_avg', 'feels_like_avg', 'wind_speed_avg', 'samples',
+        'temperature_min', 'temperature_max', 'wind_speed_max'
+    ).iterator(chunk_size=chunk_size)
+
+    for row in rows:
+        resolution, period_start = row[4:6]
+        middle = period_start + _AGGREGATE_HALF_PERIOD[resolution]
+        yield (*row[:4], True, middle.timestamp(), *row[6:])
+
+
+def iter_city_observations(chunk_size: int = 2000) -> Iterator[CityObservations]:
+    '''
+    Построчно читает историю наблюдений вместе с агрегатами, оставшимися после прореживания,
+    и собирает наблюдения каждого пользовательского запроса в колонки.
+
+    Записи и агрегаты читаются порциями через iterator() в порядке индексов по user_request
+    и объединяются слиянием, поэтому в памяти одновременно находятся колонки только одного города.
+    Агрегаты старше исходных наблюдений, поэтому в колонках они идут первыми.
+
+    Args:
+        chunk_size (int): Количество строк, получаемых из базы данных за один раз.
+
+    Yields:
+        Наблюдения очередного города.
+    '''
+
+    rows = heapq.merge(_iter_aggregate_rows(chunk_size), _iter_raw_rows(chunk_size), key=itemgetter(0))
+    for (_, city, country, is_current_location), city_rows in groupby(rows, key=itemgetter(0, 1, 2, 3)):
+        columns = ObservationColumns(*(array('d') for _ in ObservationColumns._fields))
+        raw_start = None
+        for row in city_rows:
+            if raw_start is None and not row[4]:
+                raw_start = len(columns.timestamps)
+            for column, value in zip(columns, row[5:]):
+                column.append(value)
+
+        if raw_start is not None:
+            for column in columns:
+                column[raw_start:] = column[raw_start:][::-1]
+        yield CityObservations(city, country, is_current_location, columns)
+
+
+def _weighted_percentiles(values: Sequence[float], cumulative_weights: Sequence[float]) -> List[float]:
+    '''
+    Вычисляет процентили _PERCENTILES так, как если бы каждое значение повторялось столько раз, каков его вес.
+    Используется линейная интерполяция между соседними значениями (метод inclusive модуля statistics).
+
+    Args:
+        values (Sequence[float]): Значения, отсортированные по возрастанию.
+        cumulative_weights (Sequence[float]): Накопленные веса значений.
+
+    Returns:
+        Список процентилей.
+    '''
+
+    last_position = cumulative_weights[-1] - 1
+    result = []
+    for percentile in _PERCENTILES:
+        position = last_position * percentile / 100
+        lower = values[bisect_right(cumulative_weights, floor(position))]
+        upper = values[bisect_right(cumulative_weights, ceil(position))]
+        result.append(lower + (upper - lower) * (position - floor(position)))
+    return result
+
+
+def _compute_with_numpy(columns: ObservationColumns) -> Dict[str, float]:
+    timestamps = np.frombuffer(columns.timestamps, dtype=np.float64)
+    temperature = np.frombuffer(columns.temperature, dtype=np.float64)
+    weights = np.frombuffer(columns.weights, dtype=np.float64)
+
+    stats = {
+        'temperature_min': float(np.frombuffer(columns.temperature_min, dtype=np.float64).min()),
+        'temperature_max': float(np.frombuffer(columns.temperature_max, dtype=np.float64).max()),
+        'temperature_mean': float(np.average(temperature, weights=weights)),
+        'feels_like_mean': float(np.average(np.frombuffer(columns.feels_like, dtype=np.float64), weights=weights)),
+        'wind_speed_mean': float(np.average(np.frombuffer(columns.wind_speed, dtype=np.float64), weights=weights)),
+        'wind_speed_max': float(np.frombuffer(columns.wind_speed_max, dtype=np.float64).max()),
+    }
+
+    order = np.argsort(temperature, kind='stable')
+    percentiles = _weighted_percentiles(temperature[order], np.cumsum(weights[order]))
+    for percentile, value in zip(_PERCENTILES, percentiles):
+        stats[f'temperature_p{percentile}'] = float(value)
+
+    days = (timestamps - timestamps[0]) / _SECONDS_IN_DAY
+    days_deviation = days - np.average(days, weights=weights)
+    days_variance = (weights * np.square(days_deviation)).sum()
+    stats['temperature_trend'] = (
+        float((weights * days_deviation * (temperature - stats['temperature_mean'])).sum() / days_variance)
+        if days_variance else 0.0
+    )
+    return stats
+
+
+def _weighted_mean(values: Sequence[float], weights: Sequence[float]) -> float:
+    return sum(value * weight for value, weight in zip(values, weights)) / sum(weights)
+
+
+def _compute_with_statistics(columns: ObservationColumns) -> Dict[str, float]:
+    temperature = columns.temperature
+    weights = columns.weights
+    stats = {
+        'temperature_min': min(columns.temperature_min),
+        'temperature_max': max(columns.temperature_max),
+        'temperature_mean': _weighted_mean(temperature, weights),
+        'feels_like_mean': _weighted_mean(columns.feels_like, weights),
+        'wind_speed_mean': _weighted_mean(columns.wind_speed, weights),
+        'wind_speed_max': max(columns.wind_speed_max),
+    }
+
+    order = sorted(range(len(temperature)), key=temperature.__getitem__)
+    cumulative_weights = []
+    total = 0.0
+    for index in order:
+        total += weights[index]
+        cumulative_weights.append(total)
+    percentiles = _weighted_percentiles([temperature[index] for index in order], cumulative_weights)
+    for percentile, value in zip(_PERCENTILES, percentiles):
+        stats[f'temperature_p{percentile}'] = value
+
+    days = [(timestamp - columns.timestamps[0]) / _SECONDS_IN_DAY for timestamp in columns.timestamps]
+    days_mean = _weighted_mean(days, weights)
+    days_variance = sum(weight * (day - days_mean) ** 2 for day, weight in zip(days, weights))
+    covariance = sum(weight * (day - days_mean) * (value - stats['temperature_mean'])
+                     for day, value, weight in zip(days, temperature, weights))
+    stats['temperature_trend'] = covariance / days_variance if days_variance else 0.0
+    return stats
+
+
+def compute_city_statistics(columns: ObservationColumns) -> Dict[str, float]:
+    '''
+    Вычисляет статистику наблюдений одного города. При наличии NumPy вычисления векторизованы,
+    иначе используются вычисления на чистом Python.
+
+    Args:
+        columns (ObservationColumns): Наблюдения города.
+
+    Returns:
+        Словарь с минимумом, максимумом, средним и процентилями температуры, средними ощущаемой температуры
+        и скорости ветра, максимумом скорости ветра и трендом температуры в градусах в сутки.
+        Средние, процентили и тренд учитывают веса наблюдений.
+    '''
+
+    if np is not None:
+        return _compute_with_numpy(columns)
+    return _compute_with_statistics(columns)
+
+
+def get_history_statistics(chunk_size: int = 2000) -> List[Tuple[CityObservations, Dict[str, float]]]:
+    '''
+    Вычисляет статистику наблюдений по всем городам истории, включая прореженные наблюдения.
+    Колонки наблюдений освобождаются сразу после вычисления статистики города.
+
+    Args:
+        chunk_size (int): Количество строк, получаемых из базы данных за один раз.
+
+    Returns:
+        Список кортежей (город, статистика с количеством исходных наблюдений), отсортированный
+        по количеству наблюдений.
+    '''
+
+    result = []
+    for city_observations in iter_city_observations(chunk_size):
+        stats = compute_city_statistics(city_observations.columns)
+        stats['observations'] = int(sum(city_observations.columns.weights))
+        result.append((city_observations._replace(columns=None), stats))
+
+    result.sort(key=lambda item: item[1]['observations'], reverse=True)
+    return result
@@ -0,0 +1,323 @@
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db.models import Model, Q
+from django.utils import timezone
+
+from weather_console.models import WeatherCache, GeocodingCache, ReverseGeocodingCache, TranslationCache
+from weather_console.utilities.geo import (
+    encode_geohash, get_precision_for_radius, get_neighbour_geohashes, get_distance_km
+)
+
+
+class CacheStats:
+    '''
+    Счетчики обращений к кэшу.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def hit(self):
+        '''Регистрирует попадание в кэш.'''
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        '''Регистрирует промах кэша.'''
+        with self._lock:
+            self.misses += 1
+
+    def stale_hit(self):
+        '''Регистрирует выдачу устаревших данных из кэша.'''
+        with self._lock:
+            self.stale += 1
+
+    def as_dict(self) -> Dict[str, int | str]:
+        '''
+        Предоставляет счетчики в виде словаря.
+
+        Returns:
+            Словарь с количеством попаданий, промахов и долей попаданий.
+        '''
+
+        total = self.hits + self.stale + self.misses
+        ratio = (self.hits + self.stale) / total if total else 0
+        return {
+            'hits': self.hits,
+            'stale': self.stale,
+            'misses': self.misses,
+            'hit_ratio': f'{ratio:.0%}',
+        }
+
+
+weather_cache_stats = CacheStats()
+geocoding_cache_stats = CacheStats()
+reverse_geocoding_cache_stats = CacheStats()
+
+
+def _evict_least_recently_used(model: type[Model], max_entries: int):
+    '''
+    Удаляет наиболее давно использованные записи кэша, превышающие лимит.
+
+    Args:
+        model (type[Model]): Модель кэша с полем last_accessed_at.
+        max_entries (int): Максимальное количество записей.
+    '''
+
+    stale_pks = list(
+        model.objects.order_by('-last_accessed_at').values_list('pk', flat=True)[max_entries:]
+    )
+    if stale_pks:
+        model.objects.filter(pk__in=stale_pks).delete()
+
+
+def make_weather_cache_key(lat: float, lon: float, units: str, lang_preference: str) -> Tuple[float, float, str, str]:
+    '''
+    Формирует ключ кэша погоды из квантованных координат, единиц измерения и языка.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+
+    Returns:
+        Кортеж (широта, долгота, единицы измерения, язык).
+    '''
+
+    precision = settings.WEATHER_CACHE['PRECISION']
+    units = units.lower() if units else 'metric'
+    lang_preference = lang_preference.lower() if lang_preference else 'ru'
+    return round(lat, precision), round(lon, precision), units, lang_preference
+
+
+def get_weather_cache_entry(key: Tuple[float, float, str, str]) -> WeatherCache | None:
+    '''
+    Предоставляет запись кэша погоды по ключу.
+
+    Args:
+        key (Tuple[float, float, str, str]): Ключ кэша погоды.
+
+    Returns:
+        Запись кэша или None, если запись отсутствует.
+    '''
+
+    latitude, longitude, units, language = key
+    return WeatherCache.objects.filter(
+        latitude=latitude, longitude=longitude, units=units, language=language
+    ).first()
+
+
+def touch_weather_cache_entry(entry: WeatherCache):
+    '''
+    Обновляет время последнего обращения к записи кэша погоды.
+
+    Args:
+        entry (WeatherCache): Запись кэша.
+    '''
+
+    WeatherCache.objects.filter(pk=entry.pk).update(last_accessed_at=timezone.now())
+
+
+def save_weather_cache_entry(key: Tuple[float, float, str, str], weather_data: Dict):
+    '''
+    Сохраняет ответ OWM в кэш погоды. Время жизни записи отсчитывается от момента наблюдения (поле dt),
+    так как OWM обновляет данные с фиксированным периодом.
+
+    Args:
+        key (Tuple[float, float, str, str]): Ключ кэша погоды.
+        weather_data (Dict): Ответ OWM.
+    '''
+
+    cache_settings = settings.WEATHER_CACHE
+    now = timezone.now()
+
+    observed_at = now
+    if dt := weather_data.get('dt'):
+        observed_at = datetime.fromtimestamp(dt, tz=dt_timezone.utc)
+
+    expires_at = max(
+        observed_at + timedelta(seconds=cache_settings['UPDATE_INTERVAL']),
+        now + timedelta(seconds=cache_settings['MIN_TTL'])
+    )
+
+    latitude, longitude, units, language = key
+    WeatherCache.objects.bulk_create(
+        [WeatherCache(latitude=latitude, longitude=longitude, units=units, language=language, payload=weather_data,
+                      observed_at=observed_at, expires_at=expires_at, last_accessed_at=now)],
+        update_conflicts=True,
+        unique_fields=['latitude', 'longitude', 'units', 'language'],
+        update_fields=['payload', 'observed_at', 'expires_at', 'last_accessed_at'],
+    )
+    _evict_least_recently_used(WeatherCache, cache_settings['MAX_ENTRIES'])
+
+
+def make_geocoding_cache_key(names_map: Dict[str, str], lang_preference: str) -> Tuple[str, str, str]:
+    '''
+    Формирует ключ кэша геокодирования из нормализованного названия города, кода страны и языка.
+
+    Args:
+        names_map (Dict[str, str]): Словарь с наименованием города и кода страны или наименованием города.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+
+    Returns:
+        Кортеж (название города, код страны, язык).
+    '''
+
+    query = ' '.join((names_map.get('city') or '').split()).casefold()
+    country_code = (names_map.get('country_code') or '').upper()
+    lang_preference = lang_preference.lower() if lang_preference else 'ru'
+    return query, country_code, lang_preference
+
+
+def get_geocoding_cache_payload(key: Tuple[str, str, str]) -> List[Dict[str, float | str | None]] | None:
+    '''
+    Предоставляет актуальный список кандидатов из кэша геокодирования и обновляет время обращения к записи.
+
+    Args:
+        key (Tuple[str, str, str]): Ключ кэша геокодирования.
+
+    Returns:
+        Отформатированный ответ от geocoding или None, если запись отсутствует или устарела.
+    '''
+
+    query, country_code, language = key
+    now = timezone.now()
+    entry = GeocodingCache.objects.filter(
+        query=query, country_code=country_code, language=language, expires_at__gt=now
+    ).first()
+    if entry is None:
+        return None
+
+    GeocodingCache.objects.filter(pk=entry.pk).update(last_accessed_at=now)
+    return entry.payload
+
+
+def save_geocoding_cache_payload(key: Tuple[str, str, str], parsed_geocoding_response: List[Dict]):
+    '''
+    Сохраняет список кандидатов в кэш геокодирования.
+
+    Args:
+        key (Tuple[str, str, str]): Ключ кэша геокодирования.
+        parsed_geocoding_response (List[Dict]): Отформатированный ответ от geocoding.
+    '''
+
+    cache_settings = settings.GEOCODING_CACHE
+    now = timezone.now()
+    query, country_code, language = key
+    GeocodingCache.objects.bulk_create(
+        [GeocodingCache(query=query, country_code=country_code, language=language, payload=parsed_geocoding_response,
+                        expires_at=now + timedelta(seconds=cache_settings['TTL']), last_accessed_at=now)],
+        update_conflicts=True,
+        unique_fields=['query', 'country_code', 'language'],
+        update_fields=['payload', 'expires_at', 'last_accessed_at'],
+    )
+    _evict_least_recently_used(GeocodingCache, cache_settings['MAX_ENTRIES'])
+
+
+def get_nearest_reverse_geocoding_payload(lat: float, lon: float) -> List[Dict] | None:
+    '''
+    Предоставляет ответ обратного геокодирования для ближайшей сохраненной точки в пределах
+    REVERSE_GEOCODING_CACHE['RADIUS_KM'].
+
+    Поиск ведется по ячейке geohash точки и соседним ячейкам, размер которых не меньше радиуса,
+    после чего кандидаты сравниваются по расстоянию.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+
+    Returns:
+        Ответ geocoding-api или None, если подходящая точка не найдена.
+    '''
+
+    radius_km = settings.REVERSE_GEOCODING_CACHE['RADIUS_KM']
+    precision = get_precision_for_radius(lat, radius_km)
+
+    cells_filter = Q()
+    for geohash in get_neighbour_geohashes(lat, lon, precision):
+        cells_filter |= Q(geohash__gte=geohash, geohash__lt=geohash + '~')
+
+    now = timezone.now()
+    candidates = ReverseGeocodingCache.objects.filter(cells_filter, expires_at__gt=now).only(
+        'pk', 'latitude', 'longitude', 'payload'
+    )
+
+    nearest, nearest_distance = None, radius_km
+    for candidate in candidates:
+        distance = get_distance_km(lat, lon, candidate.latitude, candidate.longitude)
+        if distance <= nearest_distance:
+            nearest, nearest_distance = candidate, distance
+
+    if nearest is None:
+        return None
+
+    ReverseGeocodingCache.objects.filter(pk=nearest.pk).update(last_accessed_at=now)
+    return nearest.payload
+
+
+def save_reverse_geocoding_payload(lat: float, lon: float, coordinates_geocoding: List[Dict]):
+    '''
+    Сохраняет ответ обратного геокодирования для точки.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        coordinates_geocoding (List[Dict]): Ответ geocoding-api.
+    '''
+
+    cache_settings = settings.REVERSE_GEOCODING_CACHE
+    now = timezone.now()
+    ReverseGeocodingCache.objects.create(
+        geohash=encode_geohash(lat, lon),
+        latitude=lat,
+        longitude=lon,
+        payload=coordinates_geocoding,
+        expires_at=now + timedelta(seconds=cache_settings['TTL']),
+        last_accessed_at=now,
+    )
+    _evict_least_recently_used(ReverseGeocodingCache, cache_settings['MAX_ENTRIES'])
+
+
+def get_cached_translation(text: str, src: str, dest: str) -> str | None:
+    '''
+    Предоставляет сохраненный перевод строки.
+
+    Args:
+        text (str): Исходная строка.
+        src (str): Код исходного языка.
+        dest (str): Код языка перевода.
+
+    Returns:
+        Перевод или None, если он не сохранялся.
+    '''
+
+    return TranslationCache.objects.filter(
+        text=text, source=src, destination=dest
+    ).values_list('translation', flat=True).first()
+
+
+def save_translation(text: str, src: str, dest: str, translation: str):
+    '''
+    Сохраняет перевод строки. Запись выполняется одним запросом INSERT ... ON CONFLICT DO UPDATE, поэтому
+    одновременные сохранения из разных потоков не конфликтуют при повышении блокировки SQLite.
+
+    Args:
+        text (str): Исходная строка.
+        src (str): Код исходного языка.
+        dest (str): Код языка перевода.
+        translation (str): Перевод.
+    '''
+
+    TranslationCache.objects.bulk_create(
+        [TranslationCache(text=text, source=src, destination=dest, translation=translation)],
+        update_conflicts=True,
+        unique_fields=['text', 'source', 'destination'],
+        update_fields=['translation'],
+    )
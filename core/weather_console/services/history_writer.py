@@ -0,0 +1,150 @@
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from weather_console.services.model_services import fill_db
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+    '''
+    Фоновая запись истории запросов. Операции записи ставятся в ограниченную очередь и выполняются
+    отдельным потоком пачками, по одной транзакции на пачку, поэтому вывод прогноза не ждет записи на диск.
+
+    Если очередь заполнена, то постановка новой операции ждет освобождения места.
+    Ошибки операций записываются в журнал и учитываются в статистике, поток записи при этом продолжает работу.
+    '''
+
+    def __init__(self, max_queue_size: int | None = None, batch_size: int | None = None,
+                 flush_timeout: float | None = None):
+        self._queue = queue.Queue(maxsize=max_queue_size or settings.HISTORY_WRITER['MAX_QUEUE_SIZE'])
+        self._batch_size = batch_size or settings.HISTORY_WRITER['BATCH_SIZE']
+        self._flush_timeout = flush_timeout or settings.HISTORY_WRITER['FLUSH_TIMEOUT']
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._written = 0
+        self._failed = 0
+
+    def submit(self, func: Callable, *args: Any, **kwargs: Any):
+        '''
+        Ставит операцию записи в очередь.
+
+        Args:
+            func (Callable): Функция записи.
+            *args (Any): Позиционные аргументы функции.
+            **kwargs (Any): Именованные аргументы функции.
+        '''
+
+        self._ensure_started()
+        self._queue.put((func, args, kwargs))
+
+    def submit_fill_db(self, city_coordinates: Dict[str, float | str | None],
+                       parsed_weather_data: Dict[str, str | float | int], is_current_location: bool = False):
+        '''
+        Ставит в очередь заполнение базы данных результатом запроса погоды. Словари копируются,
+        так как вызывающий код может изменить их при подготовке данных к выводу.
+
+        Args:
+            city_coordinates (Dict[str, float | str | None]): Данные о городе.
+            parsed_weather_data (Dict[str, str | float | int]): Данные о погоде.
+            is_current_location (bool): Маркер для заполнения данных в текущей локации.
+        '''
+
+        self.submit(fill_db, dict(city_coordinates), dict(parsed_weather_data),
+                    is_current_location=is_current_location)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+                self._thread.start()
+
+    def _get_batch(self) -> list:
+        batch = [self._queue.get()]
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        try:
+            while True:
+                batch = self._get_batch()
+                try:
+                    self._write_batch(batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            connection.close()
+
+    def _write_batch(self, batch: list):
+        '''
+        Выполняет пачку операций в одной транзакции. Ошибка одной операции откатывает только ее.
+        Если откатывается вся транзакция, то неудавшимися считаются все операции пачки.
+
+        Args:
+            batch (list): Операции вида (функция, позиционные аргументы, именованные аргументы).
+        '''
+
+        written = 0
+        try:
+            with transaction.atomic():
+                for func, args, kwargs in batch:
+                    try:
+                        with transaction.atomic():
+                            func(*args, **kwargs)
+                    except Exception:  # pylint: disable=broad-exception-caught
+                        logger.exception('Не удалось выполнить запись истории %s.', getattr(func, '__name__', func))
+                        continue
+                    written += 1
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception('Транзакция пачки записи истории из %d операций откатилась.', len(batch))
+            written = 0
+
+        self._written += written
+        self._failed += len(batch) - written
+
+    def flush(self, timeout: float | None = None) -> bool:
+        '''
+        Ожидает выполнения всех операций, поставленных в очередь, но не дольше timeout секунд.
+
+        Args:
+            timeout (float | None): Максимальное время ожидания в секундах,
+                по умолчанию HISTORY_WRITER['FLUSH_TIMEOUT'].
+
+        Returns:
+            True, если все операции выполнены, иначе False.
+        '''
+
+        if self._thread is None:
+            return True
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks,
+                                                       timeout or self._flush_timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        '''
+        Предоставляет статистику фоновой записи.
+
+        Returns:
+            Словарь с глубиной очереди, количеством выполненных и неудавшихся операций.
+        '''
+
+        return {
+            'queue_depth': self._queue.qsize(),
+            'written': self._written,
+            'failed': self._failed,
+        }
+
+
+history_writer = HistoryWriter()
+atexit.register(history_writer.flush)
@@ -1,18 +1,33 @@
-from typing import Dict
+from contextlib import contextmanager
+from typing import Dict, List, Set
 
-from django.db import transaction
-from django.db.models import QuerySet
+from django.db import connection, transaction
+from django.db.models import F, OuterRef, QuerySet, Subquery
+from django.utils import timezone
 
 from weather_console.models import (UserRequestHistory, RequestParamsToOpenWeather, ResponseFromOpenWeather,
                                     RequestResponseConnection, UserPreferences)
 from weather_console.weather_api.geocoding_api import get_coordinates_from_parsed_geocoding_response
 
 
+class _UserPreferencesCache:
+    '''
+    Закэшированный экземпляр настроек пользователя и поля, сохранение которых отложено блоком preferences_session.
+    '''
+
+    def __init__(self):
+        self.instance: UserPreferences | None = None
+        self.session_fields: Set[str] | None = None
+
+
+_preferences_cache = _UserPreferencesCache()
+
+
 def _process_user_request(
         city_name: str = None,
         country_name: str = None,
         *,
-        is_current_location: bool = False, ) -> UserRequestHistory:
+        is_current_location: bool = False, ) -> int:
     '''
     Создает или обновляет данные модели UserRequestHistory, исходя из данных
     введенных пользователем.
@@ -24,41 +39,43 @@ def _process_user_request(
     В данной ситуации происходит обновление полей counter (увеличивается на 1),
     также происходит данных о времени последнего запроса.
 
+    Оба случая выполняются одним запросом INSERT ... ON CONFLICT DO UPDATE, счетчик увеличивается
+    на стороне базы данных, поэтому одновременные запросы из нескольких процессов не теряют приращения.
+    Отсутствующие названия сохраняются пустой строкой: NULL не участвует в проверке уникальности,
+    и такие запросы создавали бы новую запись вместо увеличения счетчика.
+
     Args:
         city_name (str): Наименование города.
         country_name (str): Наименование страны.
         is_current_location (bool): Маркер определения по текущей локации.
 
     Returns:
-        Экземпляр пользовательского запроса.
+        Идентификатор пользовательского запроса.
     '''
 
-    if is_current_location:
-        user_request_instance, _ = UserRequestHistory.objects.get_or_create(
-            city=city_name, country=country_name, is_current_location=is_current_location)
-        user_request_instance.counter += 1
-        user_request_instance.save()
-        return user_request_instance
-
-    try:
-        user_request_instance = UserRequestHistory.objects.get(city=city_name, country=country_name,
-                                                               is_current_location=is_current_location)
-    except UserRequestHistory.DoesNotExist:
-        return UserRequestHistory.objects.create(
-            city=city_name,
-            country=country_name,
-            is_current_location=is_current_location,
-            counter=1
+    quote_name = connection.ops.quote_name
+    meta = UserRequestHistory._meta
+    table = quote_name(meta.db_table)
+    city, country, is_current, counter, updated_at, pk = (
+        quote_name(meta.get_field(name).column)
+        for name in ('city', 'country', 'is_current_location', 'counter', 'updated_at', 'id')
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({city}, {country}, {is_current}, {counter}, {updated_at}) '
+            'VALUES (%s, %s, %s, 1, %s) '
+            f'ON CONFLICT ({city}, {country}, {is_current}) '
+            f'DO UPDATE SET {counter} = {table}.{counter} + 1, {updated_at} = excluded.{updated_at} '
+            f'RETURNING {pk}',
+            [city_name or '', country_name or '', is_current_location,
+             connection.ops.adapt_datetimefield_value(timezone.now())]
         )
-
-    user_request_instance.counter += 1
-    user_request_instance.save()
-    return user_request_instance
+        return cursor.fetchone()[0]
 
 
 def _process_geocoding_api_response(latitude: float, longitude: float) -> RequestParamsToOpenWeather:
     '''
-    Создает или получает экземпляр модели RequestParansToOpenWeather.
+    Создает или получает экземпляр модели RequestParansToOpenWeather одним запросом.
 
     Args:
         latitude (float): Широта.
@@ -67,9 +84,12 @@ def _process_geocoding_api_response(latitude: float, longitude: float) -> Reques
     Returns:
         Экземпляр параметров запроса к OW.
     '''
-    instance, _ = RequestParamsToOpenWeather.objects.get_or_create(
-        latitude=latitude,
-        longitude=longitude
+
+    instance, = RequestParamsToOpenWeather.objects.bulk_create(
+        [RequestParamsToOpenWeather(latitude=latitude, longitude=longitude)],
+        update_conflicts=True,
+        unique_fields=['latitude', 'longitude'],
+        update_fields=['request_time'],
     )
     return instance
 
@@ -94,7 +114,7 @@ def _process_open_weather_map_response(
 
 
 def _create_request_response_connection(
-        user_request: UserRequestHistory,
+        user_request_pk: int,
         request: RequestParamsToOpenWeather,
         response: ResponseFromOpenWeather
 ):
@@ -102,14 +122,14 @@ def _create_request_response_connection(
     Создает экземпляр модели RequestResponseConnection. Связывает все инстансы между собой.
 
     Args:
-        user_request (UserRequestHistory): Экземпляр пользовательского запроса.
+        user_request_pk (int): Идентификатор пользовательского запроса.
         request (RequestParamsToOpenWeather): Экземпляр параметров запроса к OW.
         response (ResponseFromOpenWeather): Экземпляр ответа от OW.
 
     '''
 
     RequestResponseConnection.objects.create(
-        user_request=user_request,
+        user_request_id=user_request_pk,
         request=request,
         response=response
     )
@@ -119,6 +139,7 @@ def fill_db(city_coordinates: Dict[str, float | str | None], parsed_weather_data
             is_current_location: bool = False):
     '''
     Заполнение базы данных полученными данными в случае определения погоды по названию города.
+    Выполняет ровно шесть запросов: BEGIN, два upsert, две вставки и COMMIT.
 
     Args:
         city_coordinates (Dict[str, float | str | None]): Данные о городе.
@@ -131,11 +152,11 @@ def fill_db(city_coordinates: Dict[str, float | str | None], parsed_weather_data
         city_name = city_coordinates.get('city')
         country_name = city_coordinates.get('country')
         coords = get_coordinates_from_parsed_geocoding_response(city_coordinates)
-        user_request_instance = _process_user_request(city_name, country_name, is_current_location=is_current_location)
+        user_request_pk = _process_user_request(city_name, country_name, is_current_location=is_current_location)
         geocoding_api_response_instance = _process_geocoding_api_response(*coords)
         openweathermap_response_instance = _process_open_weather_map_response(parsed_weather_data)
         _create_request_response_connection(
-            user_request=user_request_instance,
+            user_request_pk=user_request_pk,
             request=geocoding_api_response_instance,
             response=openweathermap_response_instance
         )
@@ -150,58 +171,58 @@ def get_user_request_history() -> QuerySet[UserRequestHistory]:
         Множество экземпляров пользовательских запросов.
     '''
 
-    return UserRequestHistory.objects.all().order_by('-counter')
+    return UserRequestHistory.objects.all().order_by('-counter', '-pk')
 
 
-def get_user_request_instance(user_request_pk: int) -> UserRequestHistory:
+def _get_latest_connections_queryset() -> QuerySet[RequestResponseConnection]:
     '''
-    Предоставляет экземпляр пользовательского запроса по идентификатору.
-
-    Args:
-        user_request_pk (int): Идентификационный номер пользовательского запроса.
+    Предоставляет множество последних связей запрос-ответ для каждого пользовательского запроса
+    вместе с пользовательским запросом, параметрами запроса к OWM и ответом от OWM.
 
     Returns:
-        Экземпляр пользовательского запроса.
+        Множество экземпляров связей.
     '''
 
-    connection_instance = RequestResponseConnection.objects.filter(
-        user_request=user_request_pk
-    ).order_by('-created_at').first()
-    return connection_instance.user_request
+    latest_connection = RequestResponseConnection.objects.filter(
+        user_request=OuterRef('user_request')
+    ).order_by('-created_at', '-pk').values('pk')[:1]
+    return RequestResponseConnection.objects.filter(
+        pk=Subquery(latest_connection)
+    ).select_related('user_request', 'request', 'response')
 
 
-def get_request_instance_by_user_request(user_request_pk: int) -> RequestParamsToOpenWeather:
+def get_latest_request_response_connection(user_request_pk: int) -> RequestResponseConnection | None:
     '''
-    Предоставляет экземпляр параметров запроса к OWM по идентификатору пользовательского запроса.
+    Предоставляет последнюю связь запрос-ответ пользовательского запроса одним запросом к базе данных.
+    Пользовательский запрос, параметры запроса к OWM и ответ от OWM доступны через атрибуты
+    user_request, request и response без дополнительных запросов.
 
     Args:
         user_request_pk (int): Идентификационный номер пользовательского запроса.
 
     Returns:
-        Экземпляр параметров запроса к OWM.
+        Экземпляр связи или None, если пользовательский запрос не найден.
     '''
 
-    connection_instance = RequestResponseConnection.objects.filter(
+    return RequestResponseConnection.objects.filter(
         user_request=user_request_pk
-    ).order_by('-created_at').first()
-    return connection_instance.request
+    ).select_related('user_request', 'request', 'response').order_by('-created_at', '-pk').first()
 
 
-def get_weather_instance_by_user_request(user_request_pk: int) -> ResponseFromOpenWeather:
+def get_latest_request_response_connections(user_request_pks: List[int]) -> Dict[int, RequestResponseConnection]:
     '''
-    Предоставляет экземпляр ответа от OWM с информацией о погоде по идентификатору пользовательского запроса.
+    Предоставляет последние связи запрос-ответ для нескольких пользовательских запросов одним запросом
+    к базе данных.
 
     Args:
-        user_request_pk (int): Идентификационный номер пользовательского запроса.
+        user_request_pks (List[int]): Идентификационные номера пользовательских запросов.
 
     Returns:
-        Экземпляр ответа от OWM.
+        Словарь вида {идентификатор пользовательского запроса: экземпляр связи}.
     '''
 
-    connection_instance = RequestResponseConnection.objects.filter(
-        user_request=user_request_pk
-    ).order_by('-created_at').first()
-    return connection_instance.response
+    connections = _get_latest_connections_queryset().filter(user_request__in=user_request_pks)
+    return {connection_instance.user_request_id: connection_instance for connection_instance in connections}
 
 
 def increase_user_request_counter(user_request: UserRequestHistory):
@@ -212,8 +233,9 @@ def increase_user_request_counter(user_request: UserRequestHistory):
         user_request (UserRequestHistory): Экземпляр пользовательского запроса.
     '''
 
-    user_request.counter += 1
-    user_request.save()
+    UserRequestHistory.objects.filter(pk=user_request.pk).update(counter=F('counter') + 1,
+                                                                 updated_at=timezone.now())
+    user_request.refresh_from_db(fields=['counter', 'updated_at'])
 
 
 def get_is_first_time() -> bool:
@@ -237,9 +259,7 @@ def set_is_first_time(marker: bool):
 
     '''
 
-    user_preferences_instance = _get_user_preferences_instance()
-    user_preferences_instance.is_first_time = marker
-    user_preferences_instance.save()
+    _set_user_preference('is_first_time', marker)
 
 
 def get_instruction_on_start() -> bool:
@@ -263,9 +283,7 @@ def set_instruction_on_start(marker: bool):
 
     '''
 
-    user_preferences_instance = _get_user_preferences_instance()
-    user_preferences_instance.instruction_on_start = marker
-    user_preferences_instance.save()
+    _set_user_preference('instruction_on_start', marker)
 
 
 def get_language_code() -> str:
@@ -301,9 +319,7 @@ def set_language(lang: str):
 
     '''
 
-    user_preferences_instance = _get_user_preferences_instance()
-    user_preferences_instance.language = lang
-    user_preferences_instance.save()
+    _set_user_preference('language', lang)
 
 
 def get_units_code() -> str:
@@ -340,17 +356,83 @@ def set_units(units: str):
 
     '''
 
+    _set_user_preference('units', units)
+
+
+@contextmanager
+def preferences_session():
+    '''
+    Откладывает сохранение настроек до выхода из блока: все изменения записываются одним запросом.
+    В случае исключения изменения отменяются.
+    '''
+
+    _preferences_cache.session_fields = set()
+    try:
+        yield
+    except BaseException:
+        _reset_user_preferences_instance()
+        raise
+    else:
+        if _preferences_cache.session_fields:
+            _get_user_preferences_instance().save(update_fields=list(_preferences_cache.session_fields))
+    finally:
+        _preferences_cache.session_fields = None
+
+
+def _set_user_preference(field_name: str, value: bool | str):
+    '''
+    Устанавливает значение полю экземпляра настроек и сохраняет его, если сохранение не отложено
+    блоком preferences_session.
+
+    Args:
+        field_name (str): Имя поля.
+        value (bool | str): Новое значение.
+
+    Raises:
+        ValueError: В случае неподдерживаемого языка или единицы измерения. Значение поля при этом не меняется.
+    '''
+
     user_preferences_instance = _get_user_preferences_instance()
-    user_preferences_instance.units = units
-    user_preferences_instance.save()
+    previous_value = getattr(user_preferences_instance, field_name)
+    setattr(user_preferences_instance, field_name, value)
+    try:
+        user_preferences_instance.normalize()
+    except ValueError:
+        setattr(user_preferences_instance, field_name, previous_value)
+        raise
+
+    if _preferences_cache.session_fields is None:
+        user_preferences_instance.save(update_fields=[field_name])
+    else:
+        _preferences_cache.session_fields.add(field_name)
+
+
+def ensure_user_preferences():
+    '''
+    Создает экземпляр настроек пользователя, если он отсутствует, и загружает его в кэш.
+    '''
+
+    if _get_user_preferences_instance() is None:
+        _preferences_cache.instance = UserPreferences.objects.create(is_first_time=True)
+
+
+def _reset_user_preferences_instance():
+    '''
+    Сбрасывает закэшированный экземпляр настроек, следующее обращение загрузит его из базы данных.
+    '''
+
+    _preferences_cache.instance = None
 
 
 def _get_user_preferences_instance() -> UserPreferences:
     '''
-    Предоставляет экземпляр настроек пользователя.
+    Предоставляет экземпляр настроек пользователя. Экземпляр загружается из базы данных один раз
+    и переиспользуется, функции set_* изменяют его на месте.
 
     Returns:
         Экземпляр настроек пользователя.
     '''
 
-    return UserPreferences.objects.all().first()
+    if _preferences_cache.instance is None:
+        _preferences_cache.instance = UserPreferences.objects.all().first()
+    return _preferences_cache.instance
@@ -0,0 +1,212 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from weather_console.models import RequestResponseConnection, ResponseFromOpenWeather, WeatherObservationAggregate
+
+_AGGREGATE_FIELDS = ['samples', 'temperature_min', 'temperature_max', 'temperature_avg', 'feels_like_avg',
+                     'wind_speed_min', 'wind_speed_max', 'wind_speed_avg']
+
+
+def _truncate(moment: datetime, resolution: str) -> datetime:
+    '''
+    Округляет момент времени вниз до начала часа или суток.
+
+    Args:
+        moment (datetime): Момент времени.
+        resolution (str): Разрешение агрегата: hour или day.
+
+    Returns:
+        Начало периода.
+    '''
+
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if resolution == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _merge(target: WeatherObservationAggregate, source: WeatherObservationAggregate):
+    '''
+    Добавляет значения агрегата source к агрегату target.
+
+    Args:
+        target (WeatherObservationAggregate): Агрегат, который изменяется.
+        source (WeatherObservationAggregate): Добавляемый агрегат.
+    '''
+
+    samples = target.samples + source.samples
+    for field_name in ('temperature_avg', 'feels_like_avg', 'wind_speed_avg'):
+        total = getattr(target, field_name) * target.samples + getattr(source, field_name) * source.samples
+        setattr(target, field_name, total / samples)
+    target.temperature_min = min(target.temperature_min, source.temperature_min)
+    target.temperature_max = max(target.temperature_max, source.temperature_max)
+    target.wind_speed_min = min(target.wind_speed_min, source.wind_speed_min)
+    target.wind_speed_max = max(target.wind_speed_max, source.wind_speed_max)
+    target.samples = samples
+
+
+def _save_aggregates(aggregates: Iterable[WeatherObservationAggregate]):
+    '''
+    Объединяет агрегаты с уже сохраненными агрегатами тех же периодов и сохраняет результат
+    одним запросом INSERT ... ON CONFLICT DO UPDATE.
+
+    Args:
+        aggregates (Iterable[WeatherObservationAggregate]): Новые агрегаты, не более одного на период.
+    '''
+
+    aggregates = {(item.user_request_id, item.resolution, item.period_start): item for item in aggregates}
+    if not aggregates:
+        return
+
+    existing = WeatherObservationAggregate.objects.filter(
+        user_request__in={key[0] for key in aggregates},
+        resolution__in={key[1] for key in aggregates},
+        period_start__in={key[2] for key in aggregates},
+    )
+    for item in existing:
+        aggregate = aggregates.get((item.user_request_id, item.resolution, item.period_start))
+        if aggregate is not None:
+            _merge(aggregate, item)
+
+    WeatherObservationAggregate.objects.bulk_create(
+        aggregates.values(),
+        update_conflicts=True,
+        unique_fields=['user_request', 'resolution', 'period_start'],
+        update_fields=_AGGREGATE_FIELDS,
+    )
+
+
+def _add_to_buckets(buckets: Dict[Tuple[int, datetime], WeatherObservationAggregate],
+                    aggregate: WeatherObservationAggregate):
+    key = (aggregate.user_request_id, aggregate.period_start)
+    if key in buckets:
+        _merge(buckets[key], aggregate)
+    else:
+        buckets[key] = aggregate
+
+
+def _downsample_observations_chunk(cutoff: datetime, chunk_size: int) -> int:
+    '''
+    Сворачивает в почасовые агрегаты и удаляет одну порцию наблюдений старше cutoff.
+    Последнее наблюдение каждого пользовательского запроса не затрагивается.
+
+    Args:
+        cutoff (datetime): Граница хранения наблюдений в полном разрешении.
+        chunk_size (int): Размер порции.
+
+    Returns:
+        Количество обработанных наблюдений.
+    '''
+
+    latest_connection = RequestResponseConnection.objects.filter(
+        user_request=OuterRef('user_request')
+    ).order_by('-created_at', '-pk').values('pk')[:1]
+
+    with transaction.atomic():
+        rows = list(
+            RequestResponseConnection.objects.filter(
+                response__response_time__lt=cutoff
+            ).exclude(
+                pk=Subquery(latest_connection)
+            ).order_by('pk').values_list(
+                'pk', 'user_request_id', 'response_id', 'response__response_time', 'response__temperature',
+                'response__feels_like', 'response__wind_speed'
+            )[:chunk_size]
+        )
+        if not rows:
+            return 0
+
+        buckets = {}
+        for _, user_request_id, _, response_time, temperature, feels_like, wind_speed in rows:
+            _add_to_buckets(buckets, WeatherObservationAggregate(
+                user_request_id=user_request_id,
+                resolution='hour',
+                period_start=_truncate(response_time, 'hour'),
+                samples=1,
+                temperature_min=temperature,
+                temperature_max=temperature,
+                temperature_avg=temperature,
+                feels_like_avg=feels_like,
+                wind_speed_min=wind_speed,
+                wind_speed_max=wind_speed,
+                wind_speed_avg=wind_speed,
+            ))
+        _save_aggregates(buckets.values())
+
+        RequestResponseConnection.objects.filter(pk__in=[row[0] for row in rows]).delete()
+        ResponseFromOpenWeather.objects.filter(pk__in=[row[2] for row in rows]).delete()
+
+    return len(rows)
+
+
+def _downsample_hourly_chunk(cutoff: datetime, chunk_size: int) -> int:
+    '''
+    Сворачивает в суточные агрегаты и удаляет одну порцию почасовых агрегатов старше cutoff.
+
+    Args:
+        cutoff (datetime): Граница хранения почасовых агрегатов.
+        chunk_size (int): Размер порции.
+
+    Returns:
+        Количество обработанных почасовых агрегатов.
+    '''
+
+    with transaction.atomic():
+        hourly = list(
+            WeatherObservationAggregate.objects.filter(
+                resolution='hour', period_start__lt=cutoff
+            ).order_by('pk')[:chunk_size]
+        )
+        if not hourly:
+            return 0
+
+        buckets = {}
+        for aggregate in hourly:
+            daily = WeatherObservationAggregate(
+                user_request_id=aggregate.user_request_id,
+                resolution='day',
+                period_start=_truncate(aggregate.period_start, 'day'),
+                **{field_name: getattr(aggregate, field_name) for field_name in _AGGREGATE_FIELDS},
+            )
+            _add_to_buckets(buckets, daily)
+        _save_aggregates(buckets.values())
+
+        WeatherObservationAggregate.objects.filter(pk__in=[aggregate.pk for aggregate in hourly]).delete()
+
+    return len(hourly)
+
+
+def apply_retention(now: datetime | None = None, chunk_size: int | None = None) -> Dict[str, int]:
+    '''
+    Сворачивает устаревшие наблюдения в почасовые агрегаты, а устаревшие почасовые агрегаты - в суточные.
+
+    Работа выполняется порциями по chunk_size записей, каждая порция - в отдельной короткой транзакции,
+    поэтому блокировка на запись не удерживается долго и консольное приложение может работать одновременно.
+
+    Args:
+        now (datetime | None): Текущий момент, по умолчанию timezone.now().
+        chunk_size (int | None): Размер порции, по умолчанию RETENTION['CHUNK_SIZE'].
+
+    Returns:
+        Словарь с количеством свернутых наблюдений и почасовых агрегатов.
+    '''
+
+    retention_settings = settings.RETENTION
+    now = now or timezone.now()
+    chunk_size = chunk_size or retention_settings['CHUNK_SIZE']
+
+    result = {'observations': 0, 'hourly': 0}
+    for key, downsample_chunk, ttl in (
+            ('observations', _downsample_observations_chunk, retention_settings['RAW_TTL']),
+            ('hourly', _downsample_hourly_chunk, retention_settings['HOURLY_TTL']),
+    ):
+        cutoff = now - timedelta(seconds=ttl)
+        while processed := downsample_chunk(cutoff, chunk_size):
+            result[key] += processed
+
+    return result
@@ -1,3 +1,818 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import math
+import os
+import threading
+from array import array
+from concurrent import futures
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rich.console import Console
+
+from weather_console import views
+from weather_console.handlers import batch_handler
+from weather_console.handlers.paginator import Paginator
+from weather_console.handlers.terminal_reader import BACKSPACE, ENTER, LEFT, RIGHT, KeyDecoder, TerminalReader, termios
+from weather_console.models import (UserRequestHistory, RequestParamsToOpenWeather, RequestResponseConnection,
+                                    UserPreferences, ResponseFromOpenWeather, WeatherCache, GeocodingCache,
+                                    WeatherObservationAggregate)
+from weather_console.services import model_services
+from weather_console.services.model_services import (
+    fill_db, increase_user_request_counter, get_language_code, get_units_code, set_language,
+    set_units, set_instruction_on_start, preferences_session, get_latest_request_response_connection,
+    get_latest_request_response_connections
+)
+from weather_console.services import analytics_services
+from weather_console.services.analytics_services import ObservationColumns, get_history_statistics
+from weather_console.services.history_writer import HistoryWriter
+from weather_console.services.retention_services import apply_retention
+from weather_console.weather_api import http_client
+from weather_console.services.cache_services import (
+    geocoding_cache_stats, get_nearest_reverse_geocoding_payload, make_geocoding_cache_key, make_weather_cache_key,
+    save_geocoding_cache_payload, save_reverse_geocoding_payload, save_weather_cache_entry
+)
+from weather_console.utilities.geo import (
+    encode_geohash, get_distance_km, get_geohash_cell_size, get_neighbour_geohashes, get_precision_for_radius
+)
+from weather_console.weather_api import cached_api, pipeline, prefetch
+from weather_console.weather_api.cached_api import async_get_cached_weather_data, get_cached_weather_data
+from weather_console.weather_api.rate_limit import TokenBucket
+from weather_console.weather_by_name.translator import CachedTranslation, CachedTranslator, translation_scope
+
+
+def _get_city_coordinates(city: str = 'Париж') -> dict:
+    return {'city': city, 'state': 'Иль-де-Франс', 'country': 'Франция', 'lat': 48.85, 'lon': 2.35}
+
+
+def _get_parsed_weather_data() -> dict:
+    return {'weather': 'Ясно', 'temperature': 10.4, 'feels_like': 8.1, 'wind_speed': 3.0}
+
+
+class FillDbTestCase(TransactionTestCase):
+
+    def test_query_count(self):
+        with self.assertNumQueries(6):
+            fill_db(_get_city_coordinates(), _get_parsed_weather_data())
+
+        with self.assertNumQueries(6):
+            fill_db(_get_city_coordinates(), _get_parsed_weather_data())
+
+    def test_repeated_request_increments_counter(self):
+        for _ in range(3):
+            fill_db(_get_city_coordinates(), _get_parsed_weather_data())
+        fill_db(_get_city_coordinates(), _get_parsed_weather_data(), is_current_location=True)
+
+        user_request = UserRequestHistory.objects.get(city='Париж', is_current_location=False)
+        self.assertEqual(user_request.counter, 3)
+        self.assertEqual(UserRequestHistory.objects.count(), 2)
+        self.assertEqual(RequestParamsToOpenWeather.objects.count(), 1)
+        self.assertEqual(RequestResponseConnection.objects.filter(user_request=user_request).count(), 3)
+
+    def test_request_without_names_increments_counter(self):
+        city_coordinates = {'city': None, 'state': None, 'country': None, 'lat': 48.85, 'lon': 2.35}
+        for _ in range(2):
+            fill_db(city_coordinates, _get_parsed_weather_data(), is_current_location=True)
+
+        user_request = UserRequestHistory.objects.get()
+        self.assertEqual((user_request.city, user_request.country, user_request.counter), ('', '', 2))
+
+    def test_increase_user_request_counter(self):
+        fill_db(_get_city_coordinates(), _get_parsed_weather_data())
+        user_request = UserRequestHistory.objects.get()
+
+        increase_user_request_counter(user_request)
+
+        self.assertEqual(user_request.counter, 2)
+        self.assertEqual(UserRequestHistory.objects.get().counter, 2)
+
+
+class WeatherCacheTestCase(TestCase):
+
+    def _save(self, lat: float, temperature: float, expires_in: timedelta):
+        key = make_weather_cache_key(lat, 2.35, 'metric', 'ru')
+        save_weather_cache_entry(key, {'main': {'temp': temperature}})
+        WeatherCache.objects.filter(latitude=key[0]).update(expires_at=timezone.now() + expires_in)
+
+    def test_fresh_hit_skips_network(self):
+        self._save(48.85, 10, timedelta(minutes=5))
+
+        with mock.patch.object(cached_api, 'get_weather_data') as get_weather_data:
+            weather_data = get_cached_weather_data(48.85, 2.35, 'metric', 'ru')
+
+        self.assertEqual(weather_data, {'main': {'temp': 10}})
+        get_weather_data.assert_not_called()
+
+    def test_stale_hit_returns_old_value_and_refreshes(self):
+        self._save(48.85, 10, -timedelta(minutes=5))
+
+        with override_settings(WEATHER_CACHE={**settings.WEATHER_CACHE, 'STALE_WHILE_REVALIDATE': True}), \
+                mock.patch.object(cached_api, 'get_weather_data') as get_weather_data, \
+                mock.patch.object(cached_api, '_revalidate_in_background') as revalidate:
+            weather_data = get_cached_weather_data(48.85, 2.35, 'metric', 'ru')
+
+        self.assertEqual(weather_data, {'main': {'temp': 10}})
+        get_weather_data.assert_not_called()
+        revalidate.assert_called_once_with((48.85, 2.35, 'metric', 'ru'), 48.85, 2.35, 'metric', 'ru')
+
+    def test_expired_entry_is_fetched_without_stale_mode(self):
+        self._save(48.85, 10, -timedelta(minutes=5))
+
+        with override_settings(WEATHER_CACHE={**settings.WEATHER_CACHE, 'STALE_WHILE_REVALIDATE': False}), \
+                mock.patch.object(cached_api, 'get_weather_data', return_value={'main': {'temp': 12}}):
+            weather_data = get_cached_weather_data(48.85, 2.35, 'metric', 'ru')
+
+        self.assertEqual(weather_data, {'main': {'temp': 12}})
+
+    def test_eviction_removes_least_recently_accessed(self):
+        with override_settings(WEATHER_CACHE={**settings.WEATHER_CACHE, 'MAX_ENTRIES': 2}):
+            for lat in (10, 20):
+                self._save(lat, lat, timedelta(minutes=5))
+            WeatherCache.objects.filter(latitude=10).update(last_accessed_at=timezone.now() - timedelta(hours=1))
+            WeatherCache.objects.filter(latitude=20).update(last_accessed_at=timezone.now() - timedelta(hours=2))
+            get_cached_weather_data(20, 2.35, 'metric', 'ru')
+            self._save(30, 30, timedelta(minutes=5))
+
+        self.assertEqual(sorted(WeatherCache.objects.values_list('latitude', flat=True)), [20, 30])
+
+
+class GeocodingCacheTestCase(TestCase):
+
+    def _lookup(self, city: str, parsed_response: list | None = None) -> tuple:
+        parsed_response = parsed_response or [_get_city_coordinates(city)]
+        with mock.patch.object(cached_api, 'async_get_city_coordinates', mock.AsyncMock(return_value=[])) as geocode, \
+                mock.patch.object(cached_api, 'async_parse_geocoding_response',
+                                  mock.AsyncMock(return_value=parsed_response)):
+            result = async_to_sync(cached_api.async_get_cached_parsed_city_coordinates)({'city': city}, 'ru',
+                                                                                       translator=None)
+        return result, geocode
+
+    def test_second_lookup_skips_network(self):
+        hits, misses = geocoding_cache_stats.hits, geocoding_cache_stats.misses
+
+        first, geocode = self._lookup('Париж')
+        geocode.assert_awaited_once_with({'city': 'Париж'})
+        second, geocode = self._lookup('  париж ')
+        geocode.assert_not_called()
+
+        self.assertEqual(first, second)
+        self.assertEqual(geocoding_cache_stats.hits - hits, 1)
+        self.assertEqual(geocoding_cache_stats.misses - misses, 1)
+
+    def test_expired_entry_is_fetched_again(self):
+        self._lookup('Париж')
+        GeocodingCache.objects.update(expires_at=timezone.now() - timedelta(minutes=5))
+        misses = geocoding_cache_stats.misses
+
+        result, geocode = self._lookup('Париж', [_get_city_coordinates('Paris')])
+
+        geocode.assert_awaited_once()
+        self.assertEqual(result[0]['city'], 'Paris')
+        self.assertEqual(geocoding_cache_stats.misses - misses, 1)
+        self.assertGreater(GeocodingCache.objects.get().expires_at, timezone.now())
+
+    def test_eviction_removes_least_recently_accessed(self):
+        with override_settings(GEOCODING_CACHE={**settings.GEOCODING_CACHE, 'MAX_ENTRIES': 2}):
+            for city in ('Париж', 'Лион'):
+                save_geocoding_cache_payload(make_geocoding_cache_key({'city': city}, 'ru'),
+                                             [_get_city_coordinates(city)])
+            GeocodingCache.objects.filter(query='париж').update(last_accessed_at=timezone.now() - timedelta(hours=1))
+            GeocodingCache.objects.filter(query='лион').update(last_accessed_at=timezone.now() - timedelta(hours=2))
+            _, geocode = self._lookup('Лион')
+            self._lookup('Марсель')
+
+        geocode.assert_not_called()
+        self.assertEqual(sorted(GeocodingCache.objects.values_list('query', flat=True)), ['лион', 'марсель'])
+
+
+class CityCandidatesTestCase(SimpleTestCase):
+
+    def test_country_qualified_geocoding(self):
+        candidates = [{'city': 'Париж', 'country_code': 'US'}] * 5
+        geocode = mock.AsyncMock(return_value=candidates)
+        with mock.patch.object(pipeline, 'async_get_country_code', mock.AsyncMock(return_value='US')), \
+                mock.patch.object(pipeline, 'async_get_cached_parsed_city_coordinates', geocode):
+            result = asyncio.run(pipeline.async_get_city_candidates('Париж, США', 'ru', translator=None))
+
+        self.assertEqual(result, candidates)
+        geocode.assert_awaited_once()
+        self.assertEqual(geocode.call_args.args[0], {'city': 'Париж', 'country_code': 'US'})
+
+
+class _FakeTranslator:
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def translate(self, text: str, dest: str = 'en', src: str = 'auto') -> CachedTranslation:
+        self.calls.append(text)
+        self.threads.add(threading.get_ident())
+        return CachedTranslation(text.upper(), src, dest)
+
+
+class CachedTranslatorTestCase(TestCase):
+
+    def test_cold_instance_is_served_from_database(self):
+        CachedTranslator(_FakeTranslator()).translate(['Париж', 'Лион'], dest='en', src='ru')
+        translator = _FakeTranslator()
+
+        results = CachedTranslator(translator).translate(['Лион', 'Париж', 'Лион'], dest='EN', src='RU')
+
+        self.assertEqual([result.text for result in results], ['ЛИОН', 'ПАРИЖ', 'ЛИОН'])
+        self.assertEqual(translator.calls, [])
+
+    def test_stats_are_attributed_to_scope(self):
+        translator = CachedTranslator(_FakeTranslator())
+        with translation_scope('parse_geocoding_response'):
+            translator.translate('Париж', dest='en', src='ru')
+            translator.translate('Париж', dest='en', src='ru')
+        translator.translate(['Париж', 'Лион'], dest='en', src='ru')
+
+        self.assertEqual(translator.get_stats(), {'other': '1/2 (50%)', 'parse_geocoding_response': '1/2 (50%)'})
+
+    def test_each_worker_thread_gets_own_googletrans_instance(self):
+        instances = []
+
+        def create_translator():
+            instances.append(_FakeTranslator())
+            return instances[-1]
+
+        with mock.patch('googletrans.Translator', side_effect=create_translator):
+            results = CachedTranslator().translate([f'Город {index}' for index in range(20)], dest='en', src='ru')
+
+        self.assertEqual(len(results), 20)
+        self.assertEqual(sum(len(instance.calls) for instance in instances), 20)
+        self.assertTrue(all(len(instance.threads) == 1 for instance in instances))
+        self.assertEqual(len({thread for instance in instances for thread in instance.threads}), len(instances))
+
+
+class GeoTestCase(SimpleTestCase):
+
+    def test_encode_known_geohash(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, precision=11), 'u4pruydqqvj')
+        self.assertEqual(encode_geohash(57.64911, 10.40744), 'u4pruydqq')
+
+    def test_neighbours_cover_radius(self):
+        precision = get_precision_for_radius(48.85, 5)
+        cell_lat, cell_lon = get_geohash_cell_size(precision)
+
+        self.assertGreaterEqual(get_distance_km(48.85, 0, 48.85, cell_lon), 5)
+        self.assertGreaterEqual(get_distance_km(0, 2.35, cell_lat, 2.35), 5)
+        self.assertEqual(len(get_neighbour_geohashes(48.85, 2.35, precision)), 9)
+
+
+class ReverseGeocodingCacheTestCase(TestCase):
+    payload = [{'name': 'Paris', 'country': 'FR', 'lat': 48.85, 'lon': 2.35}]
+
+    def test_point_across_cell_boundary_is_found(self):
+        precision = get_precision_for_radius(48.85, settings.REVERSE_GEOCODING_CACHE['RADIUS_KM'])
+        _, cell_lon = get_geohash_cell_size(precision)
+        boundary = math.ceil((2.35 + 180) / cell_lon) * cell_lon - 180
+        self.assertNotEqual(encode_geohash(48.85, boundary - 0.01, precision),
+                            encode_geohash(48.85, boundary + 0.01, precision))
+
+        save_reverse_geocoding_payload(48.85, boundary - 0.01, self.payload)
+
+        self.assertEqual(get_nearest_reverse_geocoding_payload(48.85, boundary + 0.01), self.payload)
+
+    def test_point_outside_radius_is_rejected(self):
+        save_reverse_geocoding_payload(48.85, 2.35, self.payload)
+        lon = 2.35 + 0.1
+        self.assertGreater(get_distance_km(48.85, 2.35, 48.85, lon), settings.REVERSE_GEOCODING_CACHE['RADIUS_KM'])
+
+        self.assertIsNone(get_nearest_reverse_geocoding_payload(48.85, lon))
+
+
+class UserPreferencesCacheTestCase(TestCase):
+
+    def setUp(self):
+        model_services._reset_user_preferences_instance()
+        if not UserPreferences.objects.exists():
+            UserPreferences.objects.create()
+
+    def tearDown(self):
+        model_services._reset_user_preferences_instance()
+
+    def test_preferences_are_loaded_once(self):
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                get_language_code()
+                get_units_code()
+
+    def test_settings_session_saves_once(self):
+        get_language_code()
+
+        with self.assertNumQueries(1):
+            with preferences_session():
+                set_language('английский')
+                set_units('имперская')
+                set_instruction_on_start(False)
+
+        preferences = UserPreferences.objects.get()
+        self.assertEqual((preferences.language, preferences.units, preferences.instruction_on_start),
+                         ('EN', 'imperial', False))
+
+    def test_invalid_value_keeps_previous(self):
+        with self.assertRaises(ValueError):
+            set_language('немецкий')
+
+        self.assertEqual(get_language_code(), 'RU')
+
+
+class QueryPlanTestCase(TestCase):
+
+    def assertUsesIndex(self, queryset, index_name: str):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn('USE TEMP B-TREE', plan)
+
+    def test_history_ordering_uses_counter_index(self):
+        self.assertUsesIndex(model_services.get_user_request_history(), 'user_request_counter_idx')
+
+    def test_latest_connection_uses_composite_index(self):
+        queryset = RequestResponseConnection.objects.filter(user_request=1).order_by('-created_at')
+        self.assertUsesIndex(queryset, 'rr_connection_user_created_idx')
+
+    def test_user_request_lookup_uses_unique_index(self):
+        queryset = UserRequestHistory.objects.filter(city='Париж', country='Франция', is_current_location=False)
+        plan = queryset.explain()
+        self.assertIn('USING INDEX', plan)
+        self.assertNotIn('SCAN', plan)
+
+    def test_request_params_lookup_uses_unique_index(self):
+        plan = RequestParamsToOpenWeather.objects.filter(latitude=48.85, longitude=2.35).explain()
+        self.assertIn('USING INDEX', plan)
+        self.assertNotIn('SCAN', plan)
+
+
+class LatestConnectionTestCase(TestCase):
+
+    def setUp(self):
+        for city in ('Париж', 'Лион', 'Париж'):
+            fill_db(_get_city_coordinates(city), _get_parsed_weather_data())
+        self.paris = UserRequestHistory.objects.get(city='Париж')
+        self.lyon = UserRequestHistory.objects.get(city='Лион')
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            connection_instance = get_latest_request_response_connection(self.paris.pk)
+            self.assertEqual(connection_instance.user_request.city, 'Париж')
+            self.assertEqual(connection_instance.request.latitude, 48.85)
+            self.assertEqual(connection_instance.response.weather, 'Ясно')
+
+        self.assertEqual(connection_instance.pk, RequestResponseConnection.objects.order_by('-pk').first().pk)
+
+    def test_batched_query(self):
+        with self.assertNumQueries(1):
+            connections = get_latest_request_response_connections([self.paris.pk, self.lyon.pk])
+            self.assertEqual({pk: c.user_request.city for pk, c in connections.items()},
+                             {self.paris.pk: 'Париж', self.lyon.pk: 'Лион'})
+            self.assertTrue(all(c.response.temperature == 10 for c in connections.values()))
+
+
+class PaginatorTestCase(TestCase):
+
+    def setUp(self):
+        UserRequestHistory.objects.bulk_create([
+            UserRequestHistory(city=f'Город {i}', country='Страна', counter=i % 4) for i in range(23)
+        ])
+        history = model_services.get_user_request_history()
+        self.expected_ids = [str(pk) for pk in history.values_list('pk', flat=True)]
+
+    def _get_page_ids(self, paginator: Paginator):
+        return [item[0] for item in paginator.get_page_items()]
+
+    def test_pages_match_history_order(self):
+        paginator = Paginator(model_services.get_user_request_history())
+        self.assertEqual(paginator.total_pages, 5)
+
+        for page in range(1, 6):
+            self.assertEqual(self._get_page_ids(paginator), self.expected_ids[(page - 1) * 5:page * 5])
+            paginator.next_page()
+
+        for page in range(5, 0, -1):
+            paginator.current_page = page
+            self.assertEqual(self._get_page_ids(paginator), self.expected_ids[(page - 1) * 5:page * 5])
+
+    def test_keyset_and_cache(self):
+        paginator = Paginator(model_services.get_user_request_history(), cache_size=2)
+        paginator.get_page_items()
+        paginator.prefetch_adjacent_pages()
+
+        with self.assertNumQueries(0):
+            paginator.next_page()
+            paginator.get_page_items()
+            paginator.check_inserted_id(self.expected_ids[5])
+
+        with CaptureQueriesContext(connection) as queries:
+            paginator.next_page()
+            paginator.get_page_items()
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+
+        paginator.current_page = 1
+        self.assertEqual(self._get_page_ids(paginator), self.expected_ids[:5])
+
+    def test_rendered_pages_are_cached(self):
+        console = Console(file=io.StringIO(), width=100)
+        paginator = Paginator(model_services.get_user_request_history())
+        rendered_page = paginator.render_page(console)
+        paginator.prefetch_adjacent_pages(console)
+
+        with self.assertNumQueries(0):
+            self.assertIs(paginator.get_rendered_page(console), rendered_page)
+            paginator.next_page()
+            self.assertIsNotNone(paginator.get_rendered_page(console))
+        self.assertIsNone(paginator.get_rendered_page(Console(file=io.StringIO(), width=60)))
+
+        console.print(paginator.render_page(console))
+        self.assertIn('Страница 2/5', console.file.getvalue())
+        self.assertIn(self.expected_ids[5], console.file.getvalue())
+
+
+class RetentionTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now().replace(minute=30)
+        ages = [timedelta(days=40, minutes=10), timedelta(days=40), timedelta(days=3, minutes=5), timedelta(days=3),
+                timedelta(hours=1)]
+        for index, age in enumerate(ages):
+            weather_data = {**_get_parsed_weather_data(), 'temperature': index * 2}
+            fill_db(_get_city_coordinates(), weather_data)
+            connection_instance = RequestResponseConnection.objects.latest('pk')
+            RequestResponseConnection.objects.filter(pk=connection_instance.pk).update(created_at=self.now - age)
+            ResponseFromOpenWeather.objects.filter(pk=connection_instance.response_id).update(
+                response_time=self.now - age)
+
+    def test_downsampling(self):
+        result = apply_retention(now=self.now, chunk_size=2)
+
+        self.assertEqual(result, {'observations': 4, 'hourly': 1})
+        self.assertEqual(ResponseFromOpenWeather.objects.count(), 1)
+        self.assertEqual(RequestResponseConnection.objects.get().response.temperature, 8)
+
+        hourly = WeatherObservationAggregate.objects.get(resolution='hour')
+        self.assertEqual((hourly.samples, hourly.temperature_min, hourly.temperature_max, hourly.temperature_avg),
+                         (2, 4, 6, 5))
+
+        daily = WeatherObservationAggregate.objects.get(resolution='day')
+        self.assertEqual((daily.samples, daily.temperature_min, daily.temperature_max, daily.temperature_avg),
+                         (2, 0, 2, 1))
+
+        self.assertEqual(apply_retention(now=self.now), {'observations': 0, 'hourly': 0})
+
+
+class AnalyticsTestCase(TestCase):
+
+    def test_history_statistics(self):
+        now = timezone.now()
+        for day, temperature in enumerate((0, 2, 4, 6)):
+            fill_db(_get_city_coordinates(), {**_get_parsed_weather_data(), 'temperature': temperature})
+            connection_instance = RequestResponseConnection.objects.latest('pk')
+            moment = now - timedelta(days=3 - day)
+            RequestResponseConnection.objects.filter(pk=connection_instance.pk).update(created_at=moment)
+            ResponseFromOpenWeather.objects.filter(pk=connection_instance.response_id).update(response_time=moment)
+        fill_db(_get_city_coordinates('Лион'), _get_parsed_weather_data())
+
+        (paris, paris_stats), (lyon, lyon_stats) = get_history_statistics(chunk_size=2)
+
+        self.assertEqual((paris.city, lyon.city), ('Париж', 'Лион'))
+        self.assertEqual(paris_stats['observations'], 4)
+        self.assertEqual((paris_stats['temperature_min'], paris_stats['temperature_max']), (0, 6))
+        self.assertAlmostEqual(paris_stats['temperature_mean'], 3)
+        self.assertAlmostEqual(paris_stats['temperature_p50'], 3)
+        self.assertAlmostEqual(paris_stats['temperature_trend'], 2)
+        self.assertEqual((lyon_stats['observations'], lyon_stats['temperature_trend']), (1, 0))
+
+    def test_includes_downsampled_aggregates(self):
+        now = timezone.now()
+        for temperature in (0, 2):
+            fill_db(_get_city_coordinates(), {**_get_parsed_weather_data(), 'temperature': temperature})
+        WeatherObservationAggregate.objects.create(
+            user_request=UserRequestHistory.objects.get(), resolution='day', period_start=now - timedelta(days=30),
+            samples=4, temperature_min=5, temperature_max=15, temperature_avg=10, feels_like_avg=8,
+            wind_speed_min=1, wind_speed_max=9, wind_speed_avg=3)
+
+        ((paris, paris_stats),) = get_history_statistics()
+
+        self.assertEqual(paris.city, 'Париж')
+        self.assertEqual(paris_stats['observations'], 6)
+        self.assertEqual((paris_stats['temperature_min'], paris_stats['temperature_max']), (0, 15))
+        self.assertAlmostEqual(paris_stats['temperature_mean'], 7)
+        self.assertAlmostEqual(paris_stats['temperature_p10'], 1)
+        self.assertAlmostEqual(paris_stats['temperature_p50'], 10)
+        self.assertEqual(paris_stats['wind_speed_max'], 9)
+        self.assertLess(paris_stats['temperature_trend'], 0)
+
+    @skipUnless(analytics_services.np is not None, 'NumPy не установлен')
+    def test_numpy_matches_statistics(self):
+        temperature = [3.5, -1, 3.5, 7.25, 0, 12, 7.25]
+        weights = [1, 24, 1, 1, 4, 1, 1]
+        columns = ObservationColumns(
+            array('d', (1_700_000_000 + index * 5000 * (index + 1) for index in range(len(temperature)))),
+            array('d', temperature),
+            array('d', (value - 2.5 for value in temperature)),
+            array('d', (index % 4 + 0.5 for index in range(len(temperature)))),
+            array('d', weights),
+            array('d', (value - weight / 2 for value, weight in zip(temperature, weights))),
+            array('d', (value + weight / 2 for value, weight in zip(temperature, weights))),
+            array('d', (index % 4 + 3 for index in range(len(temperature)))),
+        )
+
+        numpy_stats = analytics_services._compute_with_numpy(columns)
+        statistics_stats = analytics_services._compute_with_statistics(columns)
+
+        self.assertEqual(numpy_stats.keys(), statistics_stats.keys())
+        for name, value in statistics_stats.items():
+            self.assertAlmostEqual(numpy_stats[name], value, msg=name)
+
+
+class WeatherPrefetcherTestCase(TestCase):
+
+    def test_candidate_errors_are_logged(self):
+        paris, lyon = _get_city_coordinates(), {**_get_city_coordinates('Лион'), 'lat': 45.76, 'lon': 4.83}
+
+        def get_weather_data(lat, lon, units, lang_preference):
+            if lat == lyon['lat']:
+                raise KeyError('main')
+            return {'weather': [{'description': 'ясно'}], 'main': {'temp': 10}}
+
+        with mock.patch.object(prefetch, 'get_weather_data', get_weather_data):
+            prefetcher = prefetch.WeatherPrefetcher([paris, lyon], 'metric', 'ru')
+            futures.wait(prefetcher._futures.values())
+            with self.assertLogs(prefetch.logger, 'WARNING'):
+                prefetcher.finish(paris)
+
+            prefetcher = prefetch.WeatherPrefetcher([lyon], 'metric', 'ru')
+            with self.assertNoLogs(prefetch.logger):
+                prefetcher.finish(lyon)
+
+        self.assertEqual(list(WeatherCache.objects.values_list('latitude', flat=True)), [paris['lat']])
+
+
+class HistoryWriterTestCase(TransactionTestCase):
+
+    def test_flush_writes_all_batches(self):
+        writer = HistoryWriter(max_queue_size=4, batch_size=3)
+        with self.assertLogs('weather_console.services.history_writer', 'ERROR'):
+            for city in ('Париж', 'Лион', 'Париж', 'Рим', 'Париж'):
+                writer.submit_fill_db(_get_city_coordinates(city), _get_parsed_weather_data())
+            writer.submit(fill_db, _get_city_coordinates(), {'weather': 'Ясно'})
+
+            writer.flush()
+
+        self.assertEqual(writer.get_stats(), {'queue_depth': 0, 'written': 5, 'failed': 1})
+        self.assertEqual(UserRequestHistory.objects.get(city='Париж').counter, 3)
+        self.assertEqual(RequestResponseConnection.objects.count(), 5)
+
+    def test_unexpected_error_does_not_stop_writer(self):
+        def fail():
+            raise RuntimeError('сбой')
+
+        writer = HistoryWriter(batch_size=1)
+        with self.assertLogs('weather_console.services.history_writer', 'ERROR'):
+            writer.submit(fail)
+            writer.submit_fill_db(_get_city_coordinates(), _get_parsed_weather_data())
+            self.assertTrue(writer.flush())
+
+        self.assertEqual(writer.get_stats(), {'queue_depth': 0, 'written': 1, 'failed': 1})
+
+    def test_flush_timeout(self):
+        release = threading.Event()
+        writer = HistoryWriter()
+        writer.submit(release.wait)
+
+        self.assertFalse(writer.flush(timeout=0.05))
+        release.set()
+        self.assertTrue(writer.flush())
+
+
+class TokenBucketTestCase(SimpleTestCase):
+
+    def test_throttles_after_idle_gap(self):
+        now = [0.0]
+        bucket = TokenBucket(calls=2, period=1, clock=lambda: now[0])
+
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0.5])
+
+        now[0] = 100
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0, 0, 0.5, 1])
+
+    def test_acquire_waits_for_token(self):
+        bucket = TokenBucket(calls=1, period=60)
+        bucket.reserve()
+
+        with mock.patch('asyncio.sleep', mock.AsyncMock()) as sleep:
+            asyncio.run(bucket.acquire())
+
+        self.assertAlmostEqual(sleep.call_args.args[0], 60, places=1)
+
+
+class _JsonRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class AsyncHttpClientTestCase(SimpleTestCase):
+
+    def test_cli_commands_share_client_connections(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _JsonRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f'http://127.0.0.1:{server.server_port}/'
+
+        before = http_client.get_connection_stats()
+        with mock.patch.object(http_client, 'rate_limiter', TokenBucket(calls=10, period=1)):
+            for _ in range(3):
+                self.assertEqual(http_client.run_with_async_client(http_client.async_get_json(url, {})), {'ok': True})
+        after = http_client.get_connection_stats()
+
+        self.assertEqual(after['requests'] - before['requests'], 3)
+        self.assertEqual(after['connections'] - before['connections'], 1)
+
+
+class KeyDecoderTestCase(SimpleTestCase):
+
+    def test_decodes_keys(self):
+        decoder = KeyDecoder()
+
+        self.assertEqual(decoder.feed('1\x1b[D2\x7f\x1bOC\r'), ['1', LEFT, '2', BACKSPACE, RIGHT, ENTER])
+        self.assertEqual(decoder.feed('\x1b[A\x1b[3~\t'), [])
+
+    def test_keeps_split_escape_sequence(self):
+        decoder = KeyDecoder()
+
+        self.assertEqual(decoder.feed('7\x1b'), ['7'])
+        self.assertEqual(decoder.feed('['), [])
+        self.assertEqual(decoder.feed('C8'), [RIGHT, '8'])
+
+
+@skipUnless(termios is not None, 'Требуется termios')
+class TerminalReaderTestCase(SimpleTestCase):
+
+    def test_reads_keys_from_terminal(self):
+        import pty
+
+        master_fd, slave_fd = pty.openpty()
+        with os.fdopen(slave_fd, encoding='utf-8') as slave, os.fdopen(master_fd, 'wb', buffering=0) as master:
+            attributes = termios.tcgetattr(slave_fd)
+
+            async def read_keys():
+                async with TerminalReader(slave) as reader:
+                    master.write('\x1b[C4'.encode())
+                    return [await reader.read_key(), await reader.read_key()]
+
+            self.assertTrue(TerminalReader.is_supported(slave))
+            self.assertEqual(asyncio.run(read_keys()), [RIGHT, '4'])
+            self.assertEqual(termios.tcgetattr(slave_fd), attributes)
+
+
+class BatchHandlerTestCase(SimpleTestCase):
+
+    def test_streams_records_within_window(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_weather_in_city(query, units, lang_preference, *, translator):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01 if query == 'Париж' else 0)
+            in_flight -= 1
+            if query == 'Нигде':
+                raise ValueError('Город не найден.')
+            return _get_city_coordinates(query), _get_parsed_weather_data()
+
+        stream = io.StringIO()
+        queries = batch_handler.iter_queries(['Париж'], io.StringIO('Лион\n\n Нигде \nРим\n'))
+        with mock.patch.object(batch_handler, 'async_get_weather_in_city', get_weather_in_city), \
+                mock.patch.object(batch_handler, 'history_writer') as writer:
+            stats = asyncio.run(batch_handler.async_run_batch(
+                queries, batch_handler.NdjsonRecordWriter(stream), batch_handler.BatchOptions('metric', 'ru', None),
+                window=2))
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(stats, {'ok': 3, 'failed': 1})
+        self.assertEqual(max_in_flight, 2)
+        self.assertEqual(sorted(record['index'] for record in records), [1, 2, 3, 4])
+        self.assertEqual(records[-1]['query'], 'Париж')
+        self.assertEqual(next(record for record in records if record['query'] == 'Нигде')['error'],
+                         'Город не найден.')
+        self.assertEqual(writer.submit_fill_db.call_count, 3)
+
+    def test_csv_header(self):
+        stream = io.StringIO()
+        batch_handler.CsvRecordWriter(stream).write(batch_handler._make_record(1, 'Рим', 'metric'))
+
+        header, row = stream.getvalue().splitlines()
+        self.assertEqual(header.split(','), batch_handler.RECORD_FIELDS)
+        self.assertTrue(row.startswith('1,Рим,'))
+
+
+@override_settings(SECRET_KEY='test')
+class WeatherApiTestCase(TestCase):
+
+    def setUp(self):
+        self.client = AsyncClient()
+
+    async def test_weather_by_city(self):
+        get_weather_in_city = mock.AsyncMock(return_value=(_get_city_coordinates(), _get_parsed_weather_data()))
+        with mock.patch.object(views, 'async_get_weather_in_city', get_weather_in_city), \
+                mock.patch.object(views, 'history_writer') as writer:
+            response = await self.client.get('/weather', {'city': 'Париж', 'country': 'Франция'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['city'], 'Париж')
+        self.assertEqual(response.json()['temperature'], 10.4)
+        self.assertEqual(get_weather_in_city.call_args.args[0], 'Париж, Франция')
+        writer.submit_fill_db.assert_called_once()
+
+    async def test_weather_errors(self):
+        not_found = mock.AsyncMock(side_effect=ValueError('Город не найден.'))
+        with mock.patch.object(views, 'async_get_weather_in_city', not_found):
+            response = await self.client.get('/weather', {'city': 'Нигде'})
+        self.assertEqual((response.status_code, response.json()), (404, {'error': 'Город не найден.'}))
+
+        self.assertEqual((await self.client.get('/weather')).status_code, 400)
+        self.assertEqual((await self.client.get('/weather', {'lat': 'a', 'lon': '1'})).status_code, 400)
+        self.assertEqual((await self.client.post('/weather')).status_code, 405)
+
+    async def test_only_upstream_requests_are_rate_limited(self):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'weather': [{'description': 'ясно'}], 'main': {'temp': 10}}
+        client = mock.Mock(get=mock.AsyncMock(return_value=response))
+        with mock.patch.object(http_client, 'get_async_client', return_value=client), \
+                mock.patch.object(http_client, 'rate_limiter') as rate_limiter:
+            rate_limiter.acquire = mock.AsyncMock()
+            for _ in range(3):
+                await async_get_cached_weather_data(48.85, 2.35, 'metric', 'ru')
+
+        client.get.assert_awaited_once()
+        rate_limiter.acquire.assert_awaited_once()
+
+    def test_history(self):
+        fill_db(_get_city_coordinates(), _get_parsed_weather_data())
+        fill_db(_get_city_coordinates(), _get_parsed_weather_data())
+        fill_db(_get_city_coordinates('Лион'), _get_parsed_weather_data())
+
+        with self.assertNumQueries(2):
+            items = async_to_sync(views.history)(RequestFactory().get('/history', {'limit': 5}))
+        items = json.loads(items.content)['items']
+
+        self.assertEqual([(item['city'], item['counter']) for item in items], [('Париж', 2), ('Лион', 1)])
+        self.assertEqual(items[0]['latest']['weather'], 'Ясно')
+
+
+class DeduplicationMigrationTestCase(TransactionTestCase):
+    before = ('weather_console', '0003_observation_retention')
+    after = ('weather_console', '0004_cache_tables_and_unique_constraints')
+
+    def _migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([target])
+        return executor.loader.project_state(target).apps
+
+    def test_duplicates_are_merged_before_constraints(self):
+        apps = self._migrate(self.before)
+        UserRequestHistory = apps.get_model('weather_console', 'UserRequestHistory')
+        RequestParamsToOpenWeather = apps.get_model('weather_console', 'RequestParamsToOpenWeather')
+        ResponseFromOpenWeather = apps.get_model('weather_console', 'ResponseFromOpenWeather')
+        RequestResponseConnection = apps.get_model('weather_console', 'RequestResponseConnection')
+
+        user_requests = [UserRequestHistory.objects.create(city=city, country=None, counter=counter)
+                         for city, counter in (('Париж', 2), ('Париж', 3), (None, 1), (None, 1))]
+        requests = [RequestParamsToOpenWeather.objects.create(latitude=48.85, longitude=2.35) for _ in range(2)]
+        for user_request, request in zip(user_requests, requests * 2):
+            response = ResponseFromOpenWeather.objects.create(weather='Ясно', temperature=1, feels_like=1,
+                                                              wind_speed=1)
+            RequestResponseConnection.objects.create(user_request=user_request, request=request, response=response)
+
+        self._migrate(self.after)
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes('weather_console')[0])
+
+        self.assertEqual(sorted(UserRequestHistory.objects.values_list('city', 'country', 'counter')),
+                         [('', '', 2), ('Париж', '', 5)])
+        self.assertEqual(RequestParamsToOpenWeather.objects.count(), 1)
+        self.assertEqual(RequestResponseConnection.objects.count(), 4)
+        self.assertEqual(RequestResponseConnection.objects.values('user_request').distinct().count(), 2)
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from weather_console import views
+
+urlpatterns = [
+    path('weather', views.weather, name='weather'),
+    path('history', views.history, name='history'),
+]
@@ -0,0 +1,133 @@
+import math
+from typing import List, Tuple
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEGREE = math.pi * _EARTH_RADIUS_KM / 180
+MAX_GEOHASH_PRECISION = 9
+
+
+def encode_geohash(lat: float, lon: float, precision: int = MAX_GEOHASH_PRECISION) -> str:
+    '''
+    Кодирует координаты в geohash.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        precision (int): Длина geohash.
+
+    Returns:
+        Строка geohash.
+    '''
+
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    is_lon = True
+
+    while len(geohash) < precision:
+        value, value_range = (lon, lon_range) if is_lon else (lat, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+
+        is_lon = not is_lon
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+
+def get_geohash_cell_size(precision: int) -> Tuple[float, float]:
+    '''
+    Предоставляет размер ячейки geohash в градусах.
+
+    Args:
+        precision (int): Длина geohash.
+
+    Returns:
+        Кортеж (высота ячейки по широте, ширина ячейки по долготе).
+    '''
+
+    total_bits = 5 * precision
+    lat_bits = total_bits // 2
+    lon_bits = total_bits - lat_bits
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def get_precision_for_radius(lat: float, radius_km: float) -> int:
+    '''
+    Подбирает наибольшую длину geohash, при которой ячейка на данной широте не меньше заданного радиуса.
+    В таком случае все точки в пределах радиуса попадают в ячейку точки или в одну из соседних.
+
+    Args:
+        lat (float): Широта.
+        radius_km (float): Радиус поиска в километрах.
+
+    Returns:
+        Длина geohash.
+    '''
+
+    lat_scale = max(math.cos(math.radians(lat)), 1e-6)
+    for precision in range(MAX_GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = get_geohash_cell_size(precision)
+        if cell_lat * _KM_PER_DEGREE >= radius_km and cell_lon * _KM_PER_DEGREE * lat_scale >= radius_km:
+            return precision
+
+    return 1
+
+
+def get_neighbour_geohashes(lat: float, lon: float, precision: int) -> List[str]:
+    '''
+    Предоставляет geohash ячейки точки и восьми соседних ячеек.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        precision (int): Длина geohash.
+
+    Returns:
+        Список уникальных geohash.
+    '''
+
+    cell_lat, cell_lon = get_geohash_cell_size(precision)
+    geohashes = []
+    for lat_step in (-1, 0, 1):
+        neighbour_lat = min(max(lat + lat_step * cell_lat, -90.0), 90.0)
+        for lon_step in (-1, 0, 1):
+            neighbour_lon = (lon + lon_step * cell_lon + 180) % 360 - 180
+            geohash = encode_geohash(neighbour_lat, neighbour_lon, precision)
+            if geohash not in geohashes:
+                geohashes.append(geohash)
+
+    return geohashes
+
+
+def get_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    '''
+    Вычисляет расстояние между двумя точками по формуле гаверсинусов.
+
+    Args:
+        lat1 (float): Широта первой точки.
+        lon1 (float): Долгота первой точки.
+        lat2 (float): Широта второй точки.
+        lon2 (float): Долгота второй точки.
+
+    Returns:
+        Расстояние в километрах.
+    '''
+
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(a))
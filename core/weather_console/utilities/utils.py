@@ -1,10 +1,15 @@
+from __future__ import annotations
+
 from datetime import datetime
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 
 import pytz
-from googletrans import Translator
 from weather_console.services.prepare_data import METRICS_MAP
 
+if TYPE_CHECKING:
+    from googletrans import Translator
+
+
 def get_translator() -> Translator:
     '''
     Получение экземпляра переводчика.
@@ -15,6 +20,8 @@ def get_translator() -> Translator:
     Returns:
         экземпляр переводчика.
     '''
+    from googletrans import Translator
+
     try:
         return Translator()
     except ConnectionError as e:
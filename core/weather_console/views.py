@@ -1,3 +1,138 @@
-from django.shortcuts import render
+import asyncio
+from typing import Dict, List
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.http import require_GET
+
+from weather_console.services.history_writer import history_writer
+from weather_console.services.model_services import (
+    get_language_code, get_latest_request_response_connections, get_units_code, get_user_request_history
+)
+from weather_console.weather_api.pipeline import async_get_weather_by_coordinates, async_get_weather_in_city
+from weather_console.weather_by_name.translator import CachedTranslator
+
+HISTORY_DEFAULT_LIMIT = 20
+HISTORY_MAX_LIMIT = 100
+
+# Переводчик с кэшем в памяти общий для всех запросов процесса, как и HTTP-клиенты http_client.
+_translator = CachedTranslator()
+
+
+def _error_response(message: str, status: int) -> JsonResponse:
+    return JsonResponse({'error': message}, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+def _get_preferences() -> Dict[str, str]:
+    return {'units': get_units_code(), 'lang': get_language_code()}
+
+
+@require_GET
+async def weather(request: HttpRequest) -> JsonResponse:
+    '''
+    Погода по названию города (?city=...&country=...) или по координатам (?lat=...&lon=...).
+    Для названия выбирается наиболее подходящий результат геокодирования. Ответы из кэшей выдаются сразу,
+    ограничение частоты задерживает только запросы к OpenWeatherMap. Запрос сохраняется в историю
+    через фоновую запись.
+
+    Args:
+        request (HttpRequest): Запрос.
+
+    Returns:
+        Данные о городе и погоде или описание ошибки.
+    '''
+
+    city = request.GET.get('city', '').strip()
+    country = request.GET.get('country', '').strip()
+    lat = request.GET.get('lat')
+    lon = request.GET.get('lon')
+
+    if not city and (lat is None or lon is None):
+        return _error_response('Укажите параметр city или параметры lat и lon.', 400)
+
+    preferences = await sync_to_async(_get_preferences)()
+    try:
+        if city:
+            user_input = f'{city}, {country}' if country else city
+            city_coordinates, parsed_weather_data = await async_get_weather_in_city(
+                user_input, preferences['units'], preferences['lang'], translator=_translator)
+        else:
+            try:
+                lat, lon = float(lat), float(lon)
+            except ValueError:
+                return _error_response('Параметры lat и lon должны быть числами.', 400)
+            city_coordinates, parsed_weather_data = await async_get_weather_by_coordinates(
+                lat, lon, preferences['units'], preferences['lang'], translator=_translator)
+    except ValueError as e:
+        return _error_response(e.args[0], 404)
+    except ConnectionError as e:
+        return _error_response(e.args[0], 502)
+    except TimeoutError as e:
+        return _error_response(e.args[0], 504)
+
+    await asyncio.to_thread(history_writer.submit_fill_db, city_coordinates, parsed_weather_data)
+    return JsonResponse({**city_coordinates, **parsed_weather_data, 'units': preferences['units']},
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def _get_history(limit: int) -> List[Dict[str, str | float | int | bool | None]]:
+    '''
+    Предоставляет самые частые пользовательские запросы с последним полученным прогнозом.
+    Очередь фоновой записи не ожидается, поэтому только что выполненные запросы могут появиться
+    в истории с небольшой задержкой.
+
+    Args:
+        limit (int): Количество запросов.
+
+    Returns:
+        Список запросов в порядке убывания частоты.
+    '''
+
+    user_requests = list(get_user_request_history()[:limit])
+    connections = get_latest_request_response_connections([user_request.pk for user_request in user_requests])
+
+    items = []
+    for user_request in user_requests:
+        item = {
+            'id': user_request.pk,
+            'city': user_request.city,
+            'country': user_request.country,
+            'is_current_location': user_request.is_current_location,
+            'counter': user_request.counter,
+            'latest': None,
+        }
+        connection_instance = connections.get(user_request.pk)
+        if connection_instance is not None:
+            response = connection_instance.response
+            item['latest'] = {
+                'weather': response.weather,
+                'temperature': response.temperature,
+                'feels_like': response.feels_like,
+                'wind_speed': response.wind_speed,
+                'response_time': response.response_time.isoformat(),
+            }
+        items.append(item)
+    return items
+
+
+@require_GET
+async def history(request: HttpRequest) -> JsonResponse:
+    '''
+    История пользовательских запросов (?limit=...), отсортированная по частоте использования.
+
+    Args:
+        request (HttpRequest): Запрос.
+
+    Returns:
+        Список запросов с последним прогнозом или описание ошибки.
+    '''
+
+    try:
+        limit = int(request.GET.get('limit', HISTORY_DEFAULT_LIMIT))
+    except ValueError:
+        return _error_response('Параметр limit должен быть целым числом.', 400)
+    if not 1 <= limit <= HISTORY_MAX_LIMIT:
+        return _error_response(f'Параметр limit должен быть от 1 до {HISTORY_MAX_LIMIT}.', 400)
+
+    items = await sync_to_async(_get_history)(limit)
+    return JsonResponse({'items': items}, json_dumps_params={'ensure_ascii': False})
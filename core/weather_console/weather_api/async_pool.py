@@ -0,0 +1,24 @@
+from typing import Dict, Optional
+
+import httpcore
+from httpcore._async.connection import AsyncHTTPConnection
+
+
+class CountingConnectionPool(httpcore.AsyncConnectionPool):
+    '''
+    Пул соединений httpx, который считает выполненные запросы и установленные соединения.
+    Импортируется при создании асинхронного клиента вместе с httpx.
+    '''
+
+    def __init__(self, stats: Dict[str, int], **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    async def request(self, *args, **kwargs):
+        self._stats['requests'] += 1
+        return await super().request(*args, **kwargs)
+
+    async def _add_to_pool(self, connection: AsyncHTTPConnection,
+                           timeout: Optional[Dict[str, Optional[float]]] = None):
+        self._stats['connections'] += 1
+        await super()._add_to_pool(connection, timeout=timeout)
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from weather_console.services.cache_services import (
+    weather_cache_stats, make_weather_cache_key, get_weather_cache_entry, touch_weather_cache_entry,
+    save_weather_cache_entry, geocoding_cache_stats, make_geocoding_cache_key, get_geocoding_cache_payload,
+    save_geocoding_cache_payload, reverse_geocoding_cache_stats, get_nearest_reverse_geocoding_payload,
+    save_reverse_geocoding_payload
+)
+from weather_console.weather_api.geocoding_api import (
+    get_city_coordinates, parse_geocoding_response, get_city_coordinates_reversed, async_get_city_coordinates,
+    async_parse_geocoding_response, async_get_city_coordinates_reversed
+)
+from weather_console.weather_api.openweathermap_api import get_weather_data, async_get_weather_data
+
+if TYPE_CHECKING:
+    from googletrans import Translator
+
+_revalidating_keys = set()
+_revalidating_lock = threading.Lock()
+
+
+def _revalidate_weather_data(key: Tuple[float, float, str, str], lat: float, lon: float, units: str,
+                             lang_preference: str):
+    '''
+    Обновляет запись кэша погоды. Выполняется в фоновом потоке.
+
+    Args:
+        key (Tuple[float, float, str, str]): Ключ кэша погоды.
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+    '''
+
+    try:
+        weather_data = get_weather_data(lat, lon, units=units, lang_preference=lang_preference)
+        save_weather_cache_entry(key, weather_data)
+    except (ConnectionError, TimeoutError):
+        pass
+    finally:
+        with _revalidating_lock:
+            _revalidating_keys.discard(key)
+        connection.close()
+
+
+def _revalidate_in_background(key: Tuple[float, float, str, str], lat: float, lon: float, units: str,
+                              lang_preference: str):
+    '''
+    Запускает фоновое обновление записи кэша погоды, если оно еще не запущено для данного ключа.
+
+    Args:
+        key (Tuple[float, float, str, str]): Ключ кэша погоды.
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+    '''
+
+    with _revalidating_lock:
+        if key in _revalidating_keys:
+            return
+        _revalidating_keys.add(key)
+
+    threading.Thread(
+        target=_revalidate_weather_data,
+        args=(key, lat, lon, units, lang_preference),
+        daemon=True
+    ).start()
+
+
+def _get_cached_weather_payload(key: Tuple[float, float, str, str], lat: float, lon: float, units: str,
+                                lang_preference: str) -> Dict | None:
+    '''
+    Предоставляет данные о погоде из кэша, если они актуальны или допускается выдача устаревших данных.
+
+    Args:
+        key (Tuple[float, float, str, str]): Ключ кэша погоды.
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+
+    Returns:
+        Данные о погоде или None, если их необходимо запросить у openweathermap.
+    '''
+
+    cache_settings = settings.WEATHER_CACHE
+    entry = get_weather_cache_entry(key)
+    now = timezone.now()
+
+    if entry is not None:
+        if entry.expires_at > now:
+            weather_cache_stats.hit()
+            touch_weather_cache_entry(entry)
+            return entry.payload
+
+        stale_until = entry.expires_at + timedelta(seconds=cache_settings['STALE_TTL'])
+        if cache_settings['STALE_WHILE_REVALIDATE'] and stale_until > now:
+            weather_cache_stats.stale_hit()
+            touch_weather_cache_entry(entry)
+            _revalidate_in_background(key, lat, lon, units, lang_preference)
+            return entry.payload
+
+    weather_cache_stats.miss()
+    return None
+
+
+def get_cached_weather_data(lat: float, lon: float, units: str, lang_preference: str) -> Dict:
+    '''
+    Получение данных о погоде из кэша или, при его отсутствии или устаревании, из openweathermap.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+
+    Raises:
+        ConnectionError: В случае если присутствуют проблемы с интернет-соединением.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Данные о погоде в виде словаря.
+    '''
+
+    key = make_weather_cache_key(lat, lon, units, lang_preference)
+    weather_data = _get_cached_weather_payload(key, lat, lon, units, lang_preference)
+    if weather_data is not None:
+        return weather_data
+
+    weather_data = get_weather_data(lat, lon, units=units, lang_preference=lang_preference)
+    save_weather_cache_entry(key, weather_data)
+    return weather_data
+
+
+async def async_get_cached_weather_data(lat: float, lon: float, units: str, lang_preference: str) -> Dict:
+    '''
+    Асинхронный вариант get_cached_weather_data.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+
+    Raises:
+        ConnectionError: В случае если присутствуют проблемы с интернет-соединением.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Данные о погоде в виде словаря.
+    '''
+
+    key = make_weather_cache_key(lat, lon, units, lang_preference)
+    weather_data = await sync_to_async(_get_cached_weather_payload)(key, lat, lon, units, lang_preference)
+    if weather_data is not None:
+        return weather_data
+
+    weather_data = await async_get_weather_data(lat, lon, units=units, lang_preference=lang_preference)
+    await sync_to_async(save_weather_cache_entry)(key, weather_data)
+    return weather_data
+
+
+def get_cached_parsed_city_coordinates(names_map: Dict[str, str], lang_preference: str, *,
+                                       translator: Translator) -> List[Dict[str, float | str | None]]:
+    '''
+    Получение отформатированного ответа geocoding-api по названию города из кэша или, при его отсутствии,
+    из geocoding-api с последующим переводом.
+
+    Args:
+        names_map (dict[str, str]): Словарь с наименованием города и кода страны или наименованием города.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+        ValueError: В случае если пользователь ввел некорректные данные.
+
+    Returns:
+        Список словарей с данными о городах-кандидатах.
+    '''
+
+    key = make_geocoding_cache_key(names_map, lang_preference)
+    parsed_geocoding_response = get_geocoding_cache_payload(key)
+    if parsed_geocoding_response is not None:
+        geocoding_cache_stats.hit()
+        return parsed_geocoding_response
+
+    geocoding_cache_stats.miss()
+    coordinates_geocoding = get_city_coordinates(names_map)
+    parsed_geocoding_response = parse_geocoding_response(coordinates_geocoding, lang_preference,
+                                                         translator=translator)
+    if parsed_geocoding_response:
+        save_geocoding_cache_payload(key, parsed_geocoding_response)
+
+    return parsed_geocoding_response
+
+
+def get_cached_city_coordinates_reversed(lat: float, lon: float) -> List[Dict]:
+    '''
+    Получение ответа geocoding-api по координатам из ближайшей сохраненной точки или, при ее отсутствии,
+    из geocoding-api.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Список словарей с названием города, кодом страны, а также широтой и долготой.
+    '''
+
+    coordinates_geocoding = get_nearest_reverse_geocoding_payload(lat, lon)
+    if coordinates_geocoding is not None:
+        reverse_geocoding_cache_stats.hit()
+        return coordinates_geocoding
+
+    reverse_geocoding_cache_stats.miss()
+    coordinates_geocoding = get_city_coordinates_reversed(lat, lon)
+    if coordinates_geocoding:
+        save_reverse_geocoding_payload(lat, lon, coordinates_geocoding)
+
+    return coordinates_geocoding
+
+
+async def async_get_cached_parsed_city_coordinates(names_map: Dict[str, str], lang_preference: str, *,
+                                                   translator: Translator) -> List[Dict[str, float | str | None]]:
+    '''
+    Асинхронный вариант get_cached_parsed_city_coordinates.
+
+    Args:
+        names_map (dict[str, str]): Словарь с наименованием города и кода страны или наименованием города.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+        ValueError: В случае если пользователь ввел некорректные данные.
+
+    Returns:
+        Список словарей с данными о городах-кандидатах.
+    '''
+
+    key = make_geocoding_cache_key(names_map, lang_preference)
+    parsed_geocoding_response = await sync_to_async(get_geocoding_cache_payload)(key)
+    if parsed_geocoding_response is not None:
+        geocoding_cache_stats.hit()
+        return parsed_geocoding_response
+
+    geocoding_cache_stats.miss()
+    coordinates_geocoding = await async_get_city_coordinates(names_map)
+    parsed_geocoding_response = await async_parse_geocoding_response(coordinates_geocoding, lang_preference,
+                                                                     translator=translator)
+    if parsed_geocoding_response:
+        await sync_to_async(save_geocoding_cache_payload)(key, parsed_geocoding_response)
+
+    return parsed_geocoding_response
+
+
+async def async_get_cached_city_coordinates_reversed(lat: float, lon: float) -> List[Dict]:
+    '''
+    Асинхронный вариант get_cached_city_coordinates_reversed.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Список словарей с названием города, кодом страны, а также широтой и долготой.
+    '''
+
+    coordinates_geocoding = await sync_to_async(get_nearest_reverse_geocoding_payload)(lat, lon)
+    if coordinates_geocoding is not None:
+        reverse_geocoding_cache_stats.hit()
+        return coordinates_geocoding
+
+    reverse_geocoding_cache_stats.miss()
+    coordinates_geocoding = await async_get_city_coordinates_reversed(lat, lon)
+    if coordinates_geocoding:
+        await sync_to_async(save_reverse_geocoding_payload)(lat, lon, coordinates_geocoding)
+
+    return coordinates_geocoding
@@ -1,17 +1,52 @@
+from __future__ import annotations
+
 import os
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-import requests
+from asgiref.sync import sync_to_async
 from dotenv import load_dotenv
-from googletrans import Translator
-from requests import exceptions
-from weather_console.weather_by_name.weather_by_name import translate_anything, get_translated_country_name_by_code
+from weather_console.weather_api.http_client import get_json, async_get_json
+from weather_console.weather_by_name.weather_by_name import translate_many, get_translated_country_name_by_code
+
+if TYPE_CHECKING:
+    from googletrans import Translator
 
 load_dotenv()
 
 API_KEY = os.getenv('OWM_API_KEY')
 
 
+_DIRECT_GEOCODING_URL = 'https://api.openweathermap.org/geo/1.0/direct'
+_REVERSE_GEOCODING_URL = 'https://api.openweathermap.org/geo/1.0/reverse'
+
+
+def _get_direct_geocoding_params(names_map: Dict[str, str]) -> Dict[str, str | int]:
+    city_name = names_map.get('city')
+    country_code = names_map.get('country_code') or ''
+
+    return {
+        'q': f'{city_name},{country_code}',
+        'limit': 5,
+        'appid': API_KEY
+    }
+
+
+def _check_direct_geocoding_response(response: List[Dict], names_map: Dict[str, str]) -> List[Dict]:
+    if not response:
+        raise ValueError(f'К сожалению данные о погоде не были получены.'
+                         f'Проверьте введенные данные "{names_map.get("city")}" и повторите запрос.')
+    return response
+
+
+def _get_reverse_geocoding_params(lat: float, lon: float) -> Dict[str, float | str | int]:
+    return {
+        'lat': lat,
+        'lon': lon,
+        'limit': 1,
+        'appid': API_KEY
+    }
+
+
 def get_city_coordinates(names_map: Dict[str, str]) -> Dict[str, float | str | dict[str, str]]:
     '''
     Получение координат города через geocoding-api.
@@ -29,30 +64,29 @@ def get_city_coordinates(names_map: Dict[str, str]) -> Dict[str, float | str | d
 
     '''
 
-    city_name = names_map.get('city')
-    country_code = names_map.get('country_code') or ''
+    response = get_json(_DIRECT_GEOCODING_URL, _get_direct_geocoding_params(names_map))
+    return _check_direct_geocoding_response(response, names_map)
 
-    params = {
-        'q': f'{city_name},{country_code}',
-        'limit': 5,
-        'appid': API_KEY
-    }
 
-    try:
-        response = requests.get('http://api.openweathermap.org/geo/1.0/direct', params=params, timeout=5)
-    except exceptions.ConnectionError as e:
-        raise ConnectionError('Проверьте подключение к интернету и повторите попытку.') from e
-    except (exceptions.Timeout, exceptions.ReadTimeout) as e:
-        raise TimeoutError('Проблемы соединения с сервисом. Повторите попытку позже') from e
+async def async_get_city_coordinates(names_map: Dict[str, str]) -> Dict[str, float | str | dict[str, str]]:
+    '''
+    Асинхронный вариант get_city_coordinates.
+    Args:
+        names_map (dict[str, str]): Словарь с наименованием города и кода страны или наименованием города.
+        {'city': val, 'country_code': val}
 
-    if response.status_code == 200:
-        response = response.json()
-        if not response:
-            raise ValueError(f'К сожалению данные о погоде не были получены.'
-                             f'Проверьте введенные данные "{city_name}" и повторите запрос.')
-        return response
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+        ValueError: В случае если пользователь ввел некорректные данные.
 
-    raise ConnectionError('Произошла проблема на стороне сервиса. Попробуйте повторить попытку позже.')
+    Returns:
+        Список словарей с названием города, кодом страны, а также широтой и долготой.
+
+    '''
+
+    response = await async_get_json(_DIRECT_GEOCODING_URL, _get_direct_geocoding_params(names_map))
+    return _check_direct_geocoding_response(response, names_map)
 
 
 def get_city_coordinates_reversed(lat: float, lon: float) -> Dict[str, float | str | dict[str, str]]:
@@ -72,28 +106,33 @@ def get_city_coordinates_reversed(lat: float, lon: float) -> Dict[str, float | s
 
     '''
 
-    params = {
-        'lat': lat,
-        'lon': lon,
-        'limit': 1,
-        'appid': API_KEY
-    }
+    return get_json(_REVERSE_GEOCODING_URL, _get_reverse_geocoding_params(lat, lon))
+
+
+async def async_get_city_coordinates_reversed(lat: float, lon: float) -> Dict[str, float | str | dict[str, str]]:
+    '''
+    Асинхронный вариант get_city_coordinates_reversed.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
 
-    try:
-        response = requests.get('http://api.openweathermap.org/geo/1.0/reverse', params=params, timeout=5)
-    except exceptions.ConnectionError as e:
-        raise ConnectionError('Проверьте подключение к интернету и повторите попытку.') from e
-    except (exceptions.Timeout, exceptions.ReadTimeout) as e:
-        raise TimeoutError('Проблемы соединения с сервисом. Повторите попытку позже') from e
+    Returns:
+        Список словарей с названием города, кодом страны, а также широтой и долготой.
 
-    if response.status_code == 200:
-        return response.json()
+    '''
 
-    raise ConnectionError('Произошла проблема на стороне сервиса. Попробуйте повторить попытку позже.')
+    return await async_get_json(_REVERSE_GEOCODING_URL, _get_reverse_geocoding_params(lat, lon))
 
 def parse_geocoding_response(response: List[Dict], lang_preference: str, *, translator: Translator) -> List[
     Dict[str, float | str | None]]:
     '''
+    Преобразует ответ geocoding-api в список городов-кандидатов. Названия областей всех кандидатов
+    переводятся одним пакетом после разбора ответа.
 
     Args:
         response (list[dict]): Данные, полученные в ответе.
@@ -119,6 +158,7 @@ def parse_geocoding_response(response: List[Dict], lang_preference: str, *, tran
         lang_preference = 'ru'
 
     parsed_list = []
+    states_to_translate = []
 
     static_city_name = ''
 
@@ -150,15 +190,39 @@ def parse_geocoding_response(response: List[Dict], lang_preference: str, *, tran
         if state == city_dict.get('city'):
             state = current_city_info['city']
         elif state:
-            state = translate_anything(state, lang_preference, translator=translator)
+            states_to_translate.append(state)
 
         current_city_info.update({'state': state})
 
         parsed_list.append(current_city_info)
 
+    translated_states = translate_many(states_to_translate, lang_preference, translator=translator)
+    for current_city_info in parsed_list:
+        state = current_city_info['state']
+        current_city_info['state'] = translated_states.get(state, state)
+
     return parsed_list
 
 
+async def async_parse_geocoding_response(response: List[Dict], lang_preference: str, *,
+                                         translator: Translator) -> List[Dict[str, float | str | None]]:
+    '''
+    Асинхронный вариант parse_geocoding_response. Выполняется в отдельном потоке пула,
+    так как переводчик и кэш переводов синхронные; одновременные вызовы не ждут друг друга.
+
+    Args:
+        response (list[dict]): Данные, полученные в ответе.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Returns:
+        Список словарей с данными о городах-кандидатах.
+    '''
+
+    return await sync_to_async(parse_geocoding_response, thread_sensitive=False)(response, lang_preference,
+                                                                                 translator=translator)
+
+
 def get_coordinates_from_parsed_geocoding_response(parsed_geocoding_response: Dict[str, float | str | None]) -> Tuple[
     float,
     float]:
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import ssl
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Coroutine, Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+from weather_console.weather_api.rate_limit import TokenBucket
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+load_dotenv()
+
+POOL_CONNECTIONS = int(os.getenv('OWM_POOL_CONNECTIONS', '4'))
+POOL_MAXSIZE = int(os.getenv('OWM_POOL_MAXSIZE', '10'))
+CONNECT_TIMEOUT = float(os.getenv('OWM_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT = float(os.getenv('OWM_READ_TIMEOUT', '5'))
+KEEPALIVE_EXPIRY = float(os.getenv('OWM_KEEPALIVE_EXPIRY', '60'))
+# Не более RATE_LIMIT_CALLS асинхронных запросов к OpenWeatherMap за RATE_LIMIT_PERIOD секунд
+# (лимит бесплатного тарифа - 60 запросов в минуту).
+RATE_LIMIT_CALLS = int(os.getenv('OWM_RATE_LIMIT_CALLS', '60'))
+RATE_LIMIT_PERIOD = float(os.getenv('OWM_RATE_LIMIT_PERIOD', '60'))
+
+rate_limiter = TokenBucket(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+
+
+class _SharedClients:
+    '''
+    Общие для процесса HTTP-клиенты и фоновый цикл событий. Создаются при первом обращении.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop_lock = threading.Lock()
+        self._background_loop: asyncio.AbstractEventLoop | None = None
+        self.created_session: requests.Session | None = None
+        self.async_clients = weakref.WeakKeyDictionary()
+        self.async_stats = {'requests': 0, 'connections': 0}
+
+    @property
+    def session(self) -> requests.Session:
+        '''
+        Сессия requests с пулом keep-alive соединений. requests импортируется при создании сессии,
+        чтобы не замедлять запуск приложения.
+        '''
+
+        if self.created_session is None:
+            with self._lock:
+                if self.created_session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers.update({'Connection': 'keep-alive'})
+                    self.created_session = session
+
+        return self.created_session
+
+    def close_session(self):
+        '''
+        Закрывает сессию и все соединения пула.
+        '''
+
+        with self._lock:
+            if self.created_session is not None:
+                self.created_session.close()
+                self.created_session = None
+
+    @property
+    def background_loop(self) -> asyncio.AbstractEventLoop:
+        '''
+        Долгоживущий цикл событий, работающий в отдельном потоке.
+        '''
+
+        with self._loop_lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='async-http', daemon=True).start()
+                atexit.register(_stop_background_loop, loop)
+                self._background_loop = loop
+
+        return self._background_loop
+
+
+_clients = _SharedClients()
+
+
+def get_session() -> requests.Session:
+    '''
+    Предоставляет общую для всех запросов к OpenWeatherMap сессию с пулом keep-alive соединений.
+
+    Сессия создается один раз на процесс, поэтому повторные запросы к api.openweathermap.org используют
+    уже установленные TCP/TLS соединения.
+
+    Returns:
+        Экземпляр сессии.
+    '''
+
+    return _clients.session
+
+
+def get_timeout() -> Tuple[float, float]:
+    '''
+    Предоставляет таймауты подключения и чтения для запросов к OpenWeatherMap.
+
+    Returns:
+        Кортеж (таймаут подключения, таймаут чтения) в секундах.
+    '''
+
+    return CONNECT_TIMEOUT, READ_TIMEOUT
+
+
+def get_connection_stats() -> Dict[str, int]:
+    '''
+    Предоставляет статистику использования пулов соединений общей сессии requests и асинхронных клиентов httpx.
+
+    Returns:
+        Словарь с количеством выполненных запросов, установленных соединений (рукопожатий)
+        и запросов, выполненных по уже открытому соединению.
+
+    Examples:
+        {
+            'requests': 3,
+            'connections': 1,
+            'reused': 2,
+        }
+    '''
+
+    stats = dict(_clients.async_stats)
+    session = _clients.created_session
+    if session is not None:
+        seen_adapters = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen_adapters:
+                continue
+            seen_adapters.add(id(adapter))
+
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['requests'] += pool.num_requests
+                stats['connections'] += pool.num_connections
+
+    stats['reused'] = max(stats['requests'] - stats['connections'], 0)
+    return stats
+
+
+def close_session():
+    '''
+    Закрывает общую сессию и все соединения пула.
+    '''
+
+    _clients.close_session()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    '''
+    Предоставляет общий асинхронный клиент с пулом keep-alive соединений для текущего цикла событий.
+
+    Соединения httpx привязаны к циклу событий, поэтому клиент создается один раз на каждый цикл:
+    в долгоживущем процессе (например, ASGI) и в консольном приложении (см. run_with_async_client)
+    все запросы используют один клиент.
+
+    Returns:
+        Экземпляр асинхронного клиента.
+    '''
+
+    import certifi
+    import httpx
+
+    from weather_console.weather_api.async_pool import CountingConnectionPool
+
+    loop = asyncio.get_running_loop()
+    client = _clients.async_clients.get(loop)
+    if client is None:
+        transport = CountingConnectionPool(
+            _clients.async_stats,
+            ssl_context=ssl.create_default_context(cafile=certifi.where()),
+            max_keepalive=POOL_MAXSIZE,
+            max_connections=POOL_MAXSIZE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(READ_TIMEOUT, connect_timeout=CONNECT_TIMEOUT),
+            transport=transport,
+        )
+        _clients.async_clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    '''
+    Закрывает асинхронный клиент текущего цикла событий.
+    '''
+
+    client = _clients.async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _stop_background_loop(loop: asyncio.AbstractEventLoop):
+    '''
+    Закрывает асинхронный клиент фонового цикла событий и останавливает цикл. Вызывается при завершении процесса.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): Фоновый цикл событий.
+    '''
+
+    try:
+        asyncio.run_coroutine_threadsafe(close_async_client(), loop).result(timeout=CONNECT_TIMEOUT)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def run_with_async_client(coroutine: Coroutine) -> Any:
+    '''
+    Выполняет корутину в долгоживущем фоновом цикле событий и ожидает результат.
+    Используется синхронным кодом консольного приложения: все команды выполняются в одном цикле,
+    поэтому используют один асинхронный клиент и его keep-alive соединения.
+
+    Args:
+        coroutine (Coroutine): Корутина для выполнения.
+
+    Returns:
+        Результат корутины.
+    '''
+
+    future = asyncio.run_coroutine_threadsafe(coroutine, _clients.background_loop)
+    try:
+        return future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        raise
+
+
+def _raise_for_status(status_code: int):
+    '''
+    Проверяет статус ответа сервиса.
+
+    Args:
+        status_code (int): HTTP статус ответа.
+
+    Raises:
+        ConnectionError: В случае проблем на стороне сервиса.
+    '''
+
+    if status_code != 200:
+        raise ConnectionError('Произошла проблема на стороне сервиса. Попробуйте повторить попытку позже.')
+
+
+def get_json(url: str, params: Dict[str, str | int | float]) -> Dict | List:
+    '''
+    Выполняет GET-запрос к OpenWeatherMap через общую сессию.
+
+    Args:
+        url (str): Адрес запроса.
+        params (Dict[str, str | int | float]): Параметры запроса.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Тело ответа.
+    '''
+
+    from requests import exceptions
+
+    try:
+        response = get_session().get(url, params=params, timeout=get_timeout())
+    except exceptions.ConnectionError as e:
+        raise ConnectionError('Проверьте подключение к интернету и повторите попытку.') from e
+    except (exceptions.Timeout, exceptions.ReadTimeout) as e:
+        raise TimeoutError('Проблемы соединения с сервисом. Повторите попытку позже') from e
+
+    _raise_for_status(response.status_code)
+    return response.json()
+
+
+async def async_get_json(url: str, params: Dict[str, str | int | float]) -> Dict | List:
+    '''
+    Выполняет асинхронный GET-запрос к OpenWeatherMap через общий асинхронный клиент.
+    Запрос учитывается в общем ограничении частоты rate_limiter. Функция вызывается только при промахе
+    кэшей, поэтому ответы из кэша ограничением не задерживаются.
+
+    Args:
+        url (str): Адрес запроса.
+        params (Dict[str, str | int | float]): Параметры запроса.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Тело ответа.
+    '''
+
+    import httpx
+
+    await rate_limiter.acquire()
+    try:
+        response = await get_async_client().get(url, params=params)
+    except (httpx.ConnectTimeout, httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout) as e:
+        raise TimeoutError('Проблемы соединения с сервисом. Повторите попытку позже') from e
+    except httpx.NetworkError as e:
+        raise ConnectionError('Проверьте подключение к интернету и повторите попытку.') from e
+
+    _raise_for_status(response.status_code)
+    return response.json()
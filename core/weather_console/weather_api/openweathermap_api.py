@@ -2,28 +2,14 @@ import os
 from typing import Dict
 from dotenv import load_dotenv
 
-import requests
-from requests import exceptions
+from weather_console.weather_api.http_client import get_json, async_get_json
 
 load_dotenv()
 
-def get_weather_data(lat:float, lon:float, units: str, lang_preference: str) -> Dict:
-    '''
-    Получение данных о погоде из openweathermap.
-    Args:
-        lat (float): Широта.
-        lon (float): Долгота.
-        units (str): Единицы измерения.
-        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+_WEATHER_URL = 'https://api.openweathermap.org/data/2.5/weather'
 
-    Raises:
-        ConnectionError: В случае если присутствуют проблемы с интернет-соединением.
-        TimeoutError: В случае проблем подключения к сервису.
-
-    Returns:
-        Данные о погоде в виде словаря.
-    '''
 
+def _get_weather_params(lat: float, lon: float, units: str, lang_preference: str) -> Dict[str, float | str]:
     if units:
         units = units.lower()
     else:
@@ -34,7 +20,7 @@ def get_weather_data(lat:float, lon:float, units: str, lang_preference: str) ->
     else:
         lang_preference = 'ru'
 
-    params = {
+    return {
         'lat': lat,
         'lon': lon,
         'appid': os.getenv('OWM_API_KEY'),
@@ -43,18 +29,45 @@ def get_weather_data(lat:float, lon:float, units: str, lang_preference: str) ->
         'lang': lang_preference,
     }
 
-    try:
-        response = requests.get('https://api.openweathermap.org/data/2.5/weather', params=params, timeout=5)
-    except exceptions.ConnectionError as e:
-        raise ConnectionError('Проверьте подключение к интернету и повторите попытку.') from e
-    except (exceptions.Timeout, exceptions.ReadTimeout) as e:
-        raise TimeoutError('Проблемы соединения с сервисом. Повторите попытку позже') from e
 
-    if response.status_code == 200:
-        response = response.json()
-        return response
+def get_weather_data(lat:float, lon:float, units: str, lang_preference: str) -> Dict:
+    '''
+    Получение данных о погоде из openweathermap.
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+
+    Raises:
+        ConnectionError: В случае если присутствуют проблемы с интернет-соединением.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Данные о погоде в виде словаря.
+    '''
+
+    return get_json(_WEATHER_URL, _get_weather_params(lat, lon, units, lang_preference))
+
+
+async def async_get_weather_data(lat: float, lon: float, units: str, lang_preference: str) -> Dict:
+    '''
+    Асинхронный вариант get_weather_data.
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+
+    Raises:
+        ConnectionError: В случае если присутствуют проблемы с интернет-соединением.
+        TimeoutError: В случае проблем подключения к сервису.
+
+    Returns:
+        Данные о погоде в виде словаря.
+    '''
 
-    raise ConnectionError('Произошла проблема на стороне сервиса. Попробуйте повторить попытку позже.')
+    return await async_get_json(_WEATHER_URL, _get_weather_params(lat, lon, units, lang_preference))
 
 
 def parse_weather_data(data: Dict) -> Dict[str, str | float | int]:
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from django.conf import settings
+
+from weather_console.weather_api.cached_api import (
+    async_get_cached_parsed_city_coordinates, async_get_cached_city_coordinates_reversed,
+    async_get_cached_weather_data
+)
+from weather_console.weather_api.geocoding_api import (
+    async_parse_geocoding_response, get_coordinates_from_parsed_geocoding_response
+)
+from weather_console.weather_api.openweathermap_api import parse_weather_data
+from weather_console.weather_by_name.weather_by_name import parse_user_input, async_get_country_code
+
+if TYPE_CHECKING:
+    from googletrans import Translator
+
+
+async def async_get_city_candidates(user_input: str, lang_preference: str, *,
+                                    translator: Translator) -> List[Dict[str, float | str | None]]:
+    '''
+    Получение городов-кандидатов по введенным пользователем названиям города и страны.
+
+    Если страна указана, то сначала определяется ее код, и geocoding-api получает запрос с кодом страны,
+    поэтому кандидаты те же, что и у синхронного get_city_coordinates.
+
+    Args:
+        user_input (str): Название города или название города, название страны.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Raises:
+        CountryNotFoundError: В случае, если страна была указана неверно.
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+        ValueError: В случае если город не был найден.
+
+    Returns:
+        Список словарей с данными о городах-кандидатах.
+    '''
+
+    names_map = parse_user_input(user_input)
+    city_map = {'city': names_map.get('city')}
+    country_name = names_map.get('country')
+
+    if country_name:
+        city_map['country_code'] = await async_get_country_code(country_name, translator=translator)
+    return await async_get_cached_parsed_city_coordinates(city_map, lang_preference, translator=translator)
+
+
+async def async_get_weather_by_coordinates(lat: float, lon: float, units: str, lang_preference: str, *,
+                                           translator: Translator) -> Tuple[Dict[str, float | str | None],
+                                                                            Dict[str, str | float | int]]:
+    '''
+    Получение данных о городе и погоде по координатам. Перевод названия области и запрос погоды
+    выполняются одновременно.
+
+    Args:
+        lat (float): Широта.
+        lon (float): Долгота.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Raises:
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+        ValueError: В случае если город по координатам не был найден.
+
+    Returns:
+        Кортеж (данные о городе, отформатированные данные о погоде).
+    '''
+
+    coordinates_geocoding = await async_get_cached_city_coordinates_reversed(lat, lon)
+    if not coordinates_geocoding:
+        raise ValueError('Не удалось определить город по координатам. Попробуйте повторить попытку позже.')
+
+    place = coordinates_geocoding[0]
+    coordinates_list, weather_data = await asyncio.gather(
+        async_parse_geocoding_response(coordinates_geocoding, lang_preference, translator=translator),
+        async_get_cached_weather_data(place.get('lat'), place.get('lon'), units=units,
+                                      lang_preference=lang_preference),
+    )
+    if not coordinates_list:
+        raise ValueError('Не удалось определить город по координатам. Попробуйте повторить попытку позже.')
+
+    return coordinates_list[0], parse_weather_data(weather_data)
+
+
+async def async_get_weather_in_city(user_input: str, units: str, lang_preference: str, *,
+                                    translator: Translator) -> Tuple[Dict[str, float | str | None],
+                                                                     Dict[str, str | float | int]]:
+    '''
+    Получение погоды в городе без уточнения у пользователя: выбирается первый кандидат геокодирования.
+    Ограничение частоты применяется только к запросам, не найденным в кэшах (см. http_client.rate_limiter).
+
+    Args:
+        user_input (str): Название города или название города, название страны.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Raises:
+        CountryNotFoundError: В случае, если страна была указана неверно.
+        ConnectionError: В случае проблем подключения к интернету или проблем на стороне сервиса.
+        TimeoutError: В случае проблем подключения к сервису.
+        ValueError: В случае если город не был найден.
+
+    Returns:
+        Кортеж (данные о городе, отформатированные данные о погоде).
+    '''
+
+    candidates = await async_get_city_candidates(user_input, lang_preference, translator=translator)
+    city = candidates[0]
+    weather_data = await async_get_cached_weather_data(
+        *get_coordinates_from_parsed_geocoding_response(city),
+        units=units,
+        lang_preference=lang_preference)
+    return city, parse_weather_data(weather_data)
+
+
+async def async_get_weather_in_cities(user_inputs: List[str], units: str, lang_preference: str, *,
+                                      translator: Translator) -> List[Tuple[str, Tuple | Exception]]:
+    '''
+    Получение погоды сразу в нескольких городах. Для каждого города выбирается первый кандидат геокодирования.
+
+    Города обрабатываются одновременно, но не более MULTI_CITY['MAX_CONCURRENCY'] за раз, запросы
+    к OpenWeatherMap - с ограничением частоты. Ошибка в одном городе не прерывает обработку остальных.
+
+    Args:
+        user_inputs (List[str]): Названия городов в формате {город} или {город, страна}.
+        units (str): Единицы измерения.
+        lang_preference (str): ISO-3166 код предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Returns:
+        Список кортежей (введенное название, (данные о городе, данные о погоде) или исключение)
+        в порядке введенных названий.
+    '''
+
+    semaphore = asyncio.Semaphore(settings.MULTI_CITY['MAX_CONCURRENCY'])
+
+    async def get_weather_in_city(user_input: str) -> Tuple[Dict[str, float | str | None],
+                                                             Dict[str, str | float | int]]:
+        async with semaphore:
+            return await async_get_weather_in_city(user_input, units, lang_preference, translator=translator)
+
+    results = await asyncio.gather(*(get_weather_in_city(user_input) for user_input in user_inputs),
+                                   return_exceptions=True)
+    return list(zip(user_inputs, results))
@@ -0,0 +1,69 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from django.utils import timezone
+
+from weather_console.services.cache_services import (
+    make_weather_cache_key, get_weather_cache_entry, save_weather_cache_entry
+)
+from weather_console.weather_api.geocoding_api import get_coordinates_from_parsed_geocoding_response
+from weather_console.weather_api.openweathermap_api import get_weather_data
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherPrefetcher:
+    '''
+    Загружает погоду для всех городов-кандидатов в фоновых потоках, пока пользователь выбирает город.
+
+    После выбора готовые ответы сохраняются в кэш погоды, поэтому прогноз для выбранного города
+    выводится без ожидания сети. Еще не начатые загрузки отменяются, а незавершенные отбрасываются.
+    '''
+
+    def __init__(self, candidates: List[Dict[str, float | str | None]], units: str, lang_preference: str):
+        self._units = units
+        self._lang_preference = lang_preference
+        self._futures: Dict[Tuple[float, float, str, str], Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(len(candidates), 1),
+                                            thread_name_prefix='weather-prefetch')
+
+        now = timezone.now()
+        for candidate in candidates:
+            lat, lon = get_coordinates_from_parsed_geocoding_response(candidate)
+            key = make_weather_cache_key(lat, lon, units, lang_preference)
+            if key in self._futures:
+                continue
+
+            entry = get_weather_cache_entry(key)
+            if entry is not None and entry.expires_at > now:
+                continue
+
+            self._futures[key] = self._executor.submit(get_weather_data, lat, lon, units, lang_preference)
+
+    def finish(self, chosen: Dict[str, float | str | None]):
+        '''
+        Дожидается загрузки погоды для выбранного города и сохраняет в кэш все завершенные загрузки.
+
+        Ошибки загрузки других кандидатов записываются в журнал и не влияют на вывод. Если не удалась
+        загрузка выбранного города, то запись в кэш не добавляется и погода запрашивается заново.
+
+        Args:
+            chosen (Dict[str, float | str | None]): Выбранный пользователем город.
+        '''
+
+        lat, lon = get_coordinates_from_parsed_geocoding_response(chosen)
+        chosen_key = make_weather_cache_key(lat, lon, self._units, self._lang_preference)
+
+        for key, future in self._futures.items():
+            if key != chosen_key and not future.done():
+                future.cancel()
+                continue
+
+            try:
+                save_weather_cache_entry(key, future.result())
+            except Exception:  # pylint: disable=broad-exception-caught
+                if key != chosen_key:
+                    logger.warning('Не удалось загрузить погоду для кандидата %s.', key, exc_info=True)
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
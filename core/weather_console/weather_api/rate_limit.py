@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    '''
+    Ограничитель частоты запросов по алгоритму маркерной корзины: не более calls запросов подряд
+    и в среднем не более calls запросов за period секунд.
+
+    Маркеры пополняются непрерывно по монотонным часам, поэтому после простоя разрешается не больше calls
+    запросов сразу, а дальше запросы снова распределяются равномерно. Запрос резервирует маркер заранее
+    и ждет своей очереди в цикле событий, не занимая поток и не удерживая блокировку. Блокировка защищает
+    только пересчет маркеров, поэтому один ограничитель можно использовать из разных циклов событий и потоков.
+    '''
+
+    def __init__(self, calls: int, period: float, clock: Callable[[], float] = time.monotonic):
+        self._capacity = calls
+        self._rate = calls / period
+        self._clock = clock
+        self._tokens = float(calls)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        '''
+        Резервирует маркер для одного запроса.
+
+        Returns:
+            Время в секундах, через которое запрос можно выполнить.
+        '''
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return max(-self._tokens / self._rate, 0)
+
+    async def acquire(self):
+        '''
+        Ожидает, пока запрос не будет разрешен ограничением частоты.
+        '''
+
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
@@ -1,6 +1,5 @@
 from typing import Dict
 
-from geocoder import ipinfo
 
 def get_latitude_and_longitude() -> Dict[str, float]:
     '''
@@ -18,6 +17,8 @@ def get_latitude_and_longitude() -> Dict[str, float]:
             'lon': ...,
          }
     '''
+    from geocoder import ipinfo
+
     names = ('lat', 'lon')
     try:
         response = ipinfo('me')
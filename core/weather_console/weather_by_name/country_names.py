@@ -0,0 +1,382 @@
+"""
+Названия стран ISO-3166 на языках из UserPreferences.LANGUAGE_CHOICES и распространенные синонимы.
+
+Файл сгенерирован командой `python manage.py generate_country_names`. Команда дополняет таблицу
+недостающими странами и языками, не затрагивая уже существующие записи, поэтому ручные правки сохраняются.
+"""
+from typing import Dict
+
+
+COUNTRY_NAMES: Dict[str, Dict[str, str]] = {
+    'AF': {'RU': 'Афганистан', 'EN': 'Afghanistan', 'ES': 'Afganistán'},
+    'AX': {'RU': 'Аландские острова', 'EN': 'Åland Islands', 'ES': 'Islas Åland'},
+    'AL': {'RU': 'Албания', 'EN': 'Albania', 'ES': 'Albania'},
+    'DZ': {'RU': 'Алжир', 'EN': 'Algeria', 'ES': 'Argelia'},
+    'AS': {'RU': 'Американское Самоа', 'EN': 'American Samoa', 'ES': 'Samoa Americana'},
+    'AD': {'RU': 'Андорра', 'EN': 'Andorra', 'ES': 'Andorra'},
+    'AO': {'RU': 'Ангола', 'EN': 'Angola', 'ES': 'Angola'},
+    'AI': {'RU': 'Ангилья', 'EN': 'Anguilla', 'ES': 'Anguila'},
+    'AQ': {'RU': 'Антарктида', 'EN': 'Antarctica', 'ES': 'Antártida'},
+    'AG': {'RU': 'Антигуа и Барбуда', 'EN': 'Antigua and Barbuda', 'ES': 'Antigua y Barbuda'},
+    'AR': {'RU': 'Аргентина', 'EN': 'Argentina', 'ES': 'Argentina'},
+    'AM': {'RU': 'Армения', 'EN': 'Armenia', 'ES': 'Armenia'},
+    'AW': {'RU': 'Аруба', 'EN': 'Aruba', 'ES': 'Aruba'},
+    'AU': {'RU': 'Австралия', 'EN': 'Australia', 'ES': 'Australia'},
+    'AT': {'RU': 'Австрия', 'EN': 'Austria', 'ES': 'Austria'},
+    'AZ': {'RU': 'Азербайджан', 'EN': 'Azerbaijan', 'ES': 'Azerbaiyán'},
+    'BS': {'RU': 'Багамские Острова', 'EN': 'Bahamas', 'ES': 'Bahamas'},
+    'BH': {'RU': 'Бахрейн', 'EN': 'Bahrain', 'ES': 'Baréin'},
+    'BD': {'RU': 'Бангладеш', 'EN': 'Bangladesh', 'ES': 'Bangladés'},
+    'BB': {'RU': 'Барбадос', 'EN': 'Barbados', 'ES': 'Barbados'},
+    'BY': {'RU': 'Беларусь', 'EN': 'Belarus', 'ES': 'Bielorrusia'},
+    'BE': {'RU': 'Бельгия', 'EN': 'Belgium', 'ES': 'Bélgica'},
+    'BZ': {'RU': 'Белиз', 'EN': 'Belize', 'ES': 'Belice'},
+    'BJ': {'RU': 'Бенин', 'EN': 'Benin', 'ES': 'Benín'},
+    'BM': {'RU': 'Бермудские Острова', 'EN': 'Bermuda', 'ES': 'Bermudas'},
+    'BT': {'RU': 'Бутан', 'EN': 'Bhutan', 'ES': 'Bután'},
+    'BO': {'RU': 'Боливия', 'EN': 'Bolivia', 'ES': 'Bolivia'},
+    'BQ': {
+        'RU': 'Бонайре, Синт-Эстатиус и Саба',
+        'EN': 'Bonaire, Sint Eustatius and Saba',
+        'ES': 'Bonaire, San Eustaquio y Saba',
+    },
+    'BA': {'RU': 'Босния и Герцеговина', 'EN': 'Bosnia and Herzegovina', 'ES': 'Bosnia y Herzegovina'},
+    'BW': {'RU': 'Ботсвана', 'EN': 'Botswana', 'ES': 'Botsuana'},
+    'BV': {'RU': 'Остров Буве', 'EN': 'Bouvet Island', 'ES': 'Isla Bouvet'},
+    'BR': {'RU': 'Бразилия', 'EN': 'Brazil', 'ES': 'Brasil'},
+    'IO': {
+        'RU': 'Британская территория в Индийском океане',
+        'EN': 'British Indian Ocean Territory',
+        'ES': 'Territorio Británico del Océano Índico',
+    },
+    'BN': {'RU': 'Бруней', 'EN': 'Brunei', 'ES': 'Brunéi'},
+    'BG': {'RU': 'Болгария', 'EN': 'Bulgaria', 'ES': 'Bulgaria'},
+    'BF': {'RU': 'Буркина-Фасо', 'EN': 'Burkina Faso', 'ES': 'Burkina Faso'},
+    'BI': {'RU': 'Бурунди', 'EN': 'Burundi', 'ES': 'Burundi'},
+    'KH': {'RU': 'Камбоджа', 'EN': 'Cambodia', 'ES': 'Camboya'},
+    'CM': {'RU': 'Камерун', 'EN': 'Cameroon', 'ES': 'Camerún'},
+    'CA': {'RU': 'Канада', 'EN': 'Canada', 'ES': 'Canadá'},
+    'CV': {'RU': 'Кабо-Верде', 'EN': 'Cabo Verde', 'ES': 'Cabo Verde'},
+    'KY': {'RU': 'Каймановы Острова', 'EN': 'Cayman Islands', 'ES': 'Islas Caimán'},
+    'CF': {
+        'RU': 'Центральноафриканская Республика',
+        'EN': 'Central African Republic',
+        'ES': 'República Centroafricana',
+    },
+    'TD': {'RU': 'Чад', 'EN': 'Chad', 'ES': 'Chad'},
+    'CL': {'RU': 'Чили', 'EN': 'Chile', 'ES': 'Chile'},
+    'CN': {'RU': 'Китай', 'EN': 'China', 'ES': 'China'},
+    'CX': {'RU': 'Остров Рождества', 'EN': 'Christmas Island', 'ES': 'Isla de Navidad'},
+    'CC': {'RU': 'Кокосовые острова', 'EN': 'Cocos (Keeling) Islands', 'ES': 'Islas Cocos'},
+    'CO': {'RU': 'Колумбия', 'EN': 'Colombia', 'ES': 'Colombia'},
+    'KM': {'RU': 'Коморские Острова', 'EN': 'Comoros', 'ES': 'Comoras'},
+    'CG': {'RU': 'Республика Конго', 'EN': 'Congo', 'ES': 'Congo'},
+    'CD': {
+        'RU': 'Демократическая Республика Конго',
+        'EN': 'Democratic Republic of the Congo',
+        'ES': 'República Democrática del Congo',
+    },
+    'CK': {'RU': 'Острова Кука', 'EN': 'Cook Islands', 'ES': 'Islas Cook'},
+    'CR': {'RU': 'Коста-Рика', 'EN': 'Costa Rica', 'ES': 'Costa Rica'},
+    'CI': {'RU': 'Кот-д’Ивуар', 'EN': "Côte d'Ivoire", 'ES': 'Costa de Marfil'},
+    'HR': {'RU': 'Хорватия', 'EN': 'Croatia', 'ES': 'Croacia'},
+    'CU': {'RU': 'Куба', 'EN': 'Cuba', 'ES': 'Cuba'},
+    'CW': {'RU': 'Кюрасао', 'EN': 'Curaçao', 'ES': 'Curazao'},
+    'CY': {'RU': 'Кипр', 'EN': 'Cyprus', 'ES': 'Chipre'},
+    'CZ': {'RU': 'Чехия', 'EN': 'Czechia', 'ES': 'Chequia'},
+    'DK': {'RU': 'Дания', 'EN': 'Denmark', 'ES': 'Dinamarca'},
+    'DJ': {'RU': 'Джибути', 'EN': 'Djibouti', 'ES': 'Yibuti'},
+    'DM': {'RU': 'Доминика', 'EN': 'Dominica', 'ES': 'Dominica'},
+    'DO': {'RU': 'Доминиканская Республика', 'EN': 'Dominican Republic', 'ES': 'República Dominicana'},
+    'EC': {'RU': 'Эквадор', 'EN': 'Ecuador', 'ES': 'Ecuador'},
+    'EG': {'RU': 'Египет', 'EN': 'Egypt', 'ES': 'Egipto'},
+    'SV': {'RU': 'Сальвадор', 'EN': 'El Salvador', 'ES': 'El Salvador'},
+    'GQ': {'RU': 'Экваториальная Гвинея', 'EN': 'Equatorial Guinea', 'ES': 'Guinea Ecuatorial'},
+    'ER': {'RU': 'Эритрея', 'EN': 'Eritrea', 'ES': 'Eritrea'},
+    'EE': {'RU': 'Эстония', 'EN': 'Estonia', 'ES': 'Estonia'},
+    'ET': {'RU': 'Эфиопия', 'EN': 'Ethiopia', 'ES': 'Etiopía'},
+    'FK': {'RU': 'Фолклендские острова', 'EN': 'Falkland Islands', 'ES': 'Islas Malvinas'},
+    'FO': {'RU': 'Фарерские острова', 'EN': 'Faroe Islands', 'ES': 'Islas Feroe'},
+    'FJ': {'RU': 'Фиджи', 'EN': 'Fiji', 'ES': 'Fiyi'},
+    'FI': {'RU': 'Финляндия', 'EN': 'Finland', 'ES': 'Finlandia'},
+    'FR': {'RU': 'Франция', 'EN': 'France', 'ES': 'Francia'},
+    'GF': {'RU': 'Французская Гвиана', 'EN': 'French Guiana', 'ES': 'Guayana Francesa'},
+    'PF': {'RU': 'Французская Полинезия', 'EN': 'French Polynesia', 'ES': 'Polinesia Francesa'},
+    'TF': {
+        'RU': 'Французские Южные территории',
+        'EN': 'French Southern Territories',
+        'ES': 'Territorios Australes Franceses',
+    },
+    'GA': {'RU': 'Габон', 'EN': 'Gabon', 'ES': 'Gabón'},
+    'GM': {'RU': 'Гамбия', 'EN': 'Gambia', 'ES': 'Gambia'},
+    'GE': {'RU': 'Грузия', 'EN': 'Georgia', 'ES': 'Georgia'},
+    'DE': {'RU': 'Германия', 'EN': 'Germany', 'ES': 'Alemania'},
+    'GH': {'RU': 'Гана', 'EN': 'Ghana', 'ES': 'Ghana'},
+    'GI': {'RU': 'Гибралтар', 'EN': 'Gibraltar', 'ES': 'Gibraltar'},
+    'GR': {'RU': 'Греция', 'EN': 'Greece', 'ES': 'Grecia'},
+    'GL': {'RU': 'Гренландия', 'EN': 'Greenland', 'ES': 'Groenlandia'},
+    'GD': {'RU': 'Гренада', 'EN': 'Grenada', 'ES': 'Granada'},
+    'GP': {'RU': 'Гваделупа', 'EN': 'Guadeloupe', 'ES': 'Guadalupe'},
+    'GU': {'RU': 'Гуам', 'EN': 'Guam', 'ES': 'Guam'},
+    'GT': {'RU': 'Гватемала', 'EN': 'Guatemala', 'ES': 'Guatemala'},
+    'GG': {'RU': 'Гернси', 'EN': 'Guernsey', 'ES': 'Guernsey'},
+    'GN': {'RU': 'Гвинея', 'EN': 'Guinea', 'ES': 'Guinea'},
+    'GW': {'RU': 'Гвинея-Бисау', 'EN': 'Guinea-Bissau', 'ES': 'Guinea-Bisáu'},
+    'GY': {'RU': 'Гайана', 'EN': 'Guyana', 'ES': 'Guyana'},
+    'HT': {'RU': 'Гаити', 'EN': 'Haiti', 'ES': 'Haití'},
+    'HM': {
+        'RU': 'Остров Херд и острова Макдональд',
+        'EN': 'Heard Island and McDonald Islands',
+        'ES': 'Islas Heard y McDonald',
+    },
+    'VA': {'RU': 'Ватикан', 'EN': 'Vatican City', 'ES': 'Ciudad del Vaticano'},
+    'HN': {'RU': 'Гондурас', 'EN': 'Honduras', 'ES': 'Honduras'},
+    'HK': {'RU': 'Гонконг', 'EN': 'Hong Kong', 'ES': 'Hong Kong'},
+    'HU': {'RU': 'Венгрия', 'EN': 'Hungary', 'ES': 'Hungría'},
+    'IS': {'RU': 'Исландия', 'EN': 'Iceland', 'ES': 'Islandia'},
+    'IN': {'RU': 'Индия', 'EN': 'India', 'ES': 'India'},
+    'ID': {'RU': 'Индонезия', 'EN': 'Indonesia', 'ES': 'Indonesia'},
+    'IR': {'RU': 'Иран', 'EN': 'Iran', 'ES': 'Irán'},
+    'IQ': {'RU': 'Ирак', 'EN': 'Iraq', 'ES': 'Irak'},
+    'IE': {'RU': 'Ирландия', 'EN': 'Ireland', 'ES': 'Irlanda'},
+    'IM': {'RU': 'Остров Мэн', 'EN': 'Isle of Man', 'ES': 'Isla de Man'},
+    'IL': {'RU': 'Израиль', 'EN': 'Israel', 'ES': 'Israel'},
+    'IT': {'RU': 'Италия', 'EN': 'Italy', 'ES': 'Italia'},
+    'JM': {'RU': 'Ямайка', 'EN': 'Jamaica', 'ES': 'Jamaica'},
+    'JP': {'RU': 'Япония', 'EN': 'Japan', 'ES': 'Japón'},
+    'JE': {'RU': 'Джерси', 'EN': 'Jersey', 'ES': 'Jersey'},
+    'JO': {'RU': 'Иордания', 'EN': 'Jordan', 'ES': 'Jordania'},
+    'KZ': {'RU': 'Казахстан', 'EN': 'Kazakhstan', 'ES': 'Kazajistán'},
+    'KE': {'RU': 'Кения', 'EN': 'Kenya', 'ES': 'Kenia'},
+    'KI': {'RU': 'Кирибати', 'EN': 'Kiribati', 'ES': 'Kiribati'},
+    'KP': {'RU': 'Северная Корея', 'EN': 'North Korea', 'ES': 'Corea del Norte'},
+    'KR': {'RU': 'Южная Корея', 'EN': 'South Korea', 'ES': 'Corea del Sur'},
+    'XK': {'RU': 'Косово', 'EN': 'Kosovo', 'ES': 'Kosovo'},
+    'KW': {'RU': 'Кувейт', 'EN': 'Kuwait', 'ES': 'Kuwait'},
+    'KG': {'RU': 'Киргизия', 'EN': 'Kyrgyzstan', 'ES': 'Kirguistán'},
+    'LA': {'RU': 'Лаос', 'EN': 'Laos', 'ES': 'Laos'},
+    'LV': {'RU': 'Латвия', 'EN': 'Latvia', 'ES': 'Letonia'},
+    'LB': {'RU': 'Ливан', 'EN': 'Lebanon', 'ES': 'Líbano'},
+    'LS': {'RU': 'Лесото', 'EN': 'Lesotho', 'ES': 'Lesoto'},
+    'LR': {'RU': 'Либерия', 'EN': 'Liberia', 'ES': 'Liberia'},
+    'LY': {'RU': 'Ливия', 'EN': 'Libya', 'ES': 'Libia'},
+    'LI': {'RU': 'Лихтенштейн', 'EN': 'Liechtenstein', 'ES': 'Liechtenstein'},
+    'LT': {'RU': 'Литва', 'EN': 'Lithuania', 'ES': 'Lituania'},
+    'LU': {'RU': 'Люксембург', 'EN': 'Luxembourg', 'ES': 'Luxemburgo'},
+    'MO': {'RU': 'Макао', 'EN': 'Macao', 'ES': 'Macao'},
+    'MK': {'RU': 'Северная Македония', 'EN': 'North Macedonia', 'ES': 'Macedonia del Norte'},
+    'MG': {'RU': 'Мадагаскар', 'EN': 'Madagascar', 'ES': 'Madagascar'},
+    'MW': {'RU': 'Малави', 'EN': 'Malawi', 'ES': 'Malaui'},
+    'MY': {'RU': 'Малайзия', 'EN': 'Malaysia', 'ES': 'Malasia'},
+    'MV': {'RU': 'Мальдивы', 'EN': 'Maldives', 'ES': 'Maldivas'},
+    'ML': {'RU': 'Мали', 'EN': 'Mali', 'ES': 'Malí'},
+    'MT': {'RU': 'Мальта', 'EN': 'Malta', 'ES': 'Malta'},
+    'MH': {'RU': 'Маршалловы Острова', 'EN': 'Marshall Islands', 'ES': 'Islas Marshall'},
+    'MQ': {'RU': 'Мартиника', 'EN': 'Martinique', 'ES': 'Martinica'},
+    'MR': {'RU': 'Мавритания', 'EN': 'Mauritania', 'ES': 'Mauritania'},
+    'MU': {'RU': 'Маврикий', 'EN': 'Mauritius', 'ES': 'Mauricio'},
+    'YT': {'RU': 'Майотта', 'EN': 'Mayotte', 'ES': 'Mayotte'},
+    'MX': {'RU': 'Мексика', 'EN': 'Mexico', 'ES': 'México'},
+    'FM': {'RU': 'Микронезия', 'EN': 'Micronesia', 'ES': 'Micronesia'},
+    'MD': {'RU': 'Молдавия', 'EN': 'Moldova', 'ES': 'Moldavia'},
+    'MC': {'RU': 'Монако', 'EN': 'Monaco', 'ES': 'Mónaco'},
+    'MN': {'RU': 'Монголия', 'EN': 'Mongolia', 'ES': 'Mongolia'},
+    'ME': {'RU': 'Черногория', 'EN': 'Montenegro', 'ES': 'Montenegro'},
+    'MS': {'RU': 'Монтсеррат', 'EN': 'Montserrat', 'ES': 'Montserrat'},
+    'MA': {'RU': 'Марокко', 'EN': 'Morocco', 'ES': 'Marruecos'},
+    'MZ': {'RU': 'Мозамбик', 'EN': 'Mozambique', 'ES': 'Mozambique'},
+    'MM': {'RU': 'Мьянма', 'EN': 'Myanmar', 'ES': 'Birmania'},
+    'NA': {'RU': 'Намибия', 'EN': 'Namibia', 'ES': 'Namibia'},
+    'NR': {'RU': 'Науру', 'EN': 'Nauru', 'ES': 'Nauru'},
+    'NP': {'RU': 'Непал', 'EN': 'Nepal', 'ES': 'Nepal'},
+    'NL': {'RU': 'Нидерланды', 'EN': 'Netherlands', 'ES': 'Países Bajos'},
+    'NC': {'RU': 'Новая Каледония', 'EN': 'New Caledonia', 'ES': 'Nueva Caledonia'},
+    'NZ': {'RU': 'Новая Зеландия', 'EN': 'New Zealand', 'ES': 'Nueva Zelanda'},
+    'NI': {'RU': 'Никарагуа', 'EN': 'Nicaragua', 'ES': 'Nicaragua'},
+    'NE': {'RU': 'Нигер', 'EN': 'Niger', 'ES': 'Níger'},
+    'NG': {'RU': 'Нигерия', 'EN': 'Nigeria', 'ES': 'Nigeria'},
+    'NU': {'RU': 'Ниуэ', 'EN': 'Niue', 'ES': 'Niue'},
+    'NF': {'RU': 'Остров Норфолк', 'EN': 'Norfolk Island', 'ES': 'Isla Norfolk'},
+    'MP': {'RU': 'Северные Марианские Острова', 'EN': 'Northern Mariana Islands', 'ES': 'Islas Marianas del Norte'},
+    'NO': {'RU': 'Норвегия', 'EN': 'Norway', 'ES': 'Noruega'},
+    'OM': {'RU': 'Оман', 'EN': 'Oman', 'ES': 'Omán'},
+    'PK': {'RU': 'Пакистан', 'EN': 'Pakistan', 'ES': 'Pakistán'},
+    'PW': {'RU': 'Палау', 'EN': 'Palau', 'ES': 'Palaos'},
+    'PS': {'RU': 'Палестина', 'EN': 'Palestine', 'ES': 'Palestina'},
+    'PA': {'RU': 'Панама', 'EN': 'Panama', 'ES': 'Panamá'},
+    'PG': {'RU': 'Папуа — Новая Гвинея', 'EN': 'Papua New Guinea', 'ES': 'Papúa Nueva Guinea'},
+    'PY': {'RU': 'Парагвай', 'EN': 'Paraguay', 'ES': 'Paraguay'},
+    'PE': {'RU': 'Перу', 'EN': 'Peru', 'ES': 'Perú'},
+    'PH': {'RU': 'Филиппины', 'EN': 'Philippines', 'ES': 'Filipinas'},
+    'PN': {'RU': 'Острова Питкэрн', 'EN': 'Pitcairn Islands', 'ES': 'Islas Pitcairn'},
+    'PL': {'RU': 'Польша', 'EN': 'Poland', 'ES': 'Polonia'},
+    'PT': {'RU': 'Португалия', 'EN': 'Portugal', 'ES': 'Portugal'},
+    'PR': {'RU': 'Пуэрто-Рико', 'EN': 'Puerto Rico', 'ES': 'Puerto Rico'},
+    'QA': {'RU': 'Катар', 'EN': 'Qatar', 'ES': 'Catar'},
+    'RE': {'RU': 'Реюньон', 'EN': 'Réunion', 'ES': 'Reunión'},
+    'RO': {'RU': 'Румыния', 'EN': 'Romania', 'ES': 'Rumania'},
+    'RU': {'RU': 'Россия', 'EN': 'Russia', 'ES': 'Rusia'},
+    'RW': {'RU': 'Руанда', 'EN': 'Rwanda', 'ES': 'Ruanda'},
+    'BL': {'RU': 'Сен-Бартелеми', 'EN': 'Saint Barthélemy', 'ES': 'San Bartolomé'},
+    'SH': {
+        'RU': 'Острова Святой Елены, Вознесения и Тристан-да-Кунья',
+        'EN': 'Saint Helena, Ascension and Tristan da Cunha',
+        'ES': 'Santa Elena, Ascensión y Tristán de Acuña',
+    },
+    'KN': {'RU': 'Сент-Китс и Невис', 'EN': 'Saint Kitts and Nevis', 'ES': 'San Cristóbal y Nieves'},
+    'LC': {'RU': 'Сент-Люсия', 'EN': 'Saint Lucia', 'ES': 'Santa Lucía'},
+    'MF': {'RU': 'Сен-Мартен', 'EN': 'Saint Martin', 'ES': 'San Martín'},
+    'PM': {'RU': 'Сен-Пьер и Микелон', 'EN': 'Saint Pierre and Miquelon', 'ES': 'San Pedro y Miquelón'},
+    'VC': {
+        'RU': 'Сент-Винсент и Гренадины',
+        'EN': 'Saint Vincent and the Grenadines',
+        'ES': 'San Vicente y las Granadinas',
+    },
+    'WS': {'RU': 'Самоа', 'EN': 'Samoa', 'ES': 'Samoa'},
+    'SM': {'RU': 'Сан-Марино', 'EN': 'San Marino', 'ES': 'San Marino'},
+    'ST': {'RU': 'Сан-Томе и Принсипи', 'EN': 'Sao Tome and Principe', 'ES': 'Santo Tomé y Príncipe'},
+    'SA': {'RU': 'Саудовская Аравия', 'EN': 'Saudi Arabia', 'ES': 'Arabia Saudita'},
+    'SN': {'RU': 'Сенегал', 'EN': 'Senegal', 'ES': 'Senegal'},
+    'RS': {'RU': 'Сербия', 'EN': 'Serbia', 'ES': 'Serbia'},
+    'SC': {'RU': 'Сейшельские Острова', 'EN': 'Seychelles', 'ES': 'Seychelles'},
+    'SL': {'RU': 'Сьерра-Леоне', 'EN': 'Sierra Leone', 'ES': 'Sierra Leona'},
+    'SG': {'RU': 'Сингапур', 'EN': 'Singapore', 'ES': 'Singapur'},
+    'SX': {'RU': 'Синт-Мартен', 'EN': 'Sint Maarten', 'ES': 'Sint Maarten'},
+    'SK': {'RU': 'Словакия', 'EN': 'Slovakia', 'ES': 'Eslovaquia'},
+    'SI': {'RU': 'Словения', 'EN': 'Slovenia', 'ES': 'Eslovenia'},
+    'SB': {'RU': 'Соломоновы Острова', 'EN': 'Solomon Islands', 'ES': 'Islas Salomón'},
+    'SO': {'RU': 'Сомали', 'EN': 'Somalia', 'ES': 'Somalia'},
+    'ZA': {'RU': 'Южно-Африканская Республика', 'EN': 'South Africa', 'ES': 'Sudáfrica'},
+    'GS': {
+        'RU': 'Южная Георгия и Южные Сандвичевы острова',
+        'EN': 'South Georgia and the South Sandwich Islands',
+        'ES': 'Islas Georgias del Sur y Sandwich del Sur',
+    },
+    'SS': {'RU': 'Южный Судан', 'EN': 'South Sudan', 'ES': 'Sudán del Sur'},
+    'ES': {'RU': 'Испания', 'EN': 'Spain', 'ES': 'España'},
+    'LK': {'RU': 'Шри-Ланка', 'EN': 'Sri Lanka', 'ES': 'Sri Lanka'},
+    'SD': {'RU': 'Судан', 'EN': 'Sudan', 'ES': 'Sudán'},
+    'SR': {'RU': 'Суринам', 'EN': 'Suriname', 'ES': 'Surinam'},
+    'SJ': {'RU': 'Шпицберген и Ян-Майен', 'EN': 'Svalbard and Jan Mayen', 'ES': 'Svalbard y Jan Mayen'},
+    'SZ': {'RU': 'Эсватини', 'EN': 'Eswatini', 'ES': 'Esuatini'},
+    'SE': {'RU': 'Швеция', 'EN': 'Sweden', 'ES': 'Suecia'},
+    'CH': {'RU': 'Швейцария', 'EN': 'Switzerland', 'ES': 'Suiza'},
+    'SY': {'RU': 'Сирия', 'EN': 'Syria', 'ES': 'Siria'},
+    'TW': {'RU': 'Тайвань', 'EN': 'Taiwan', 'ES': 'Taiwán'},
+    'TJ': {'RU': 'Таджикистан', 'EN': 'Tajikistan', 'ES': 'Tayikistán'},
+    'TZ': {'RU': 'Танзания', 'EN': 'Tanzania', 'ES': 'Tanzania'},
+    'TH': {'RU': 'Таиланд', 'EN': 'Thailand', 'ES': 'Tailandia'},
+    'TL': {'RU': 'Восточный Тимор', 'EN': 'Timor-Leste', 'ES': 'Timor Oriental'},
+    'TG': {'RU': 'Того', 'EN': 'Togo', 'ES': 'Togo'},
+    'TK': {'RU': 'Токелау', 'EN': 'Tokelau', 'ES': 'Tokelau'},
+    'TO': {'RU': 'Тонга', 'EN': 'Tonga', 'ES': 'Tonga'},
+    'TT': {'RU': 'Тринидад и Тобаго', 'EN': 'Trinidad and Tobago', 'ES': 'Trinidad y Tobago'},
+    'TN': {'RU': 'Тунис', 'EN': 'Tunisia', 'ES': 'Túnez'},
+    'TR': {'RU': 'Турция', 'EN': 'Turkey', 'ES': 'Turquía'},
+    'TM': {'RU': 'Туркмения', 'EN': 'Turkmenistan', 'ES': 'Turkmenistán'},
+    'TC': {'RU': 'Теркс и Кайкос', 'EN': 'Turks and Caicos Islands', 'ES': 'Islas Turcas y Caicos'},
+    'TV': {'RU': 'Тувалу', 'EN': 'Tuvalu', 'ES': 'Tuvalu'},
+    'UG': {'RU': 'Уганда', 'EN': 'Uganda', 'ES': 'Uganda'},
+    'UA': {'RU': 'Украина', 'EN': 'Ukraine', 'ES': 'Ucrania'},
+    'AE': {'RU': 'Объединённые Арабские Эмираты', 'EN': 'United Arab Emirates', 'ES': 'Emiratos Árabes Unidos'},
+    'GB': {'RU': 'Великобритания', 'EN': 'United Kingdom', 'ES': 'Reino Unido'},
+    'US': {'RU': 'Соединённые Штаты Америки', 'EN': 'United States', 'ES': 'Estados Unidos'},
+    'UM': {
+        'RU': 'Внешние малые острова США',
+        'EN': 'United States Minor Outlying Islands',
+        'ES': 'Islas Ultramarinas Menores de Estados Unidos',
+    },
+    'UY': {'RU': 'Уругвай', 'EN': 'Uruguay', 'ES': 'Uruguay'},
+    'UZ': {'RU': 'Узбекистан', 'EN': 'Uzbekistan', 'ES': 'Uzbekistán'},
+    'VU': {'RU': 'Вануату', 'EN': 'Vanuatu', 'ES': 'Vanuatu'},
+    'VE': {'RU': 'Венесуэла', 'EN': 'Venezuela', 'ES': 'Venezuela'},
+    'VN': {'RU': 'Вьетнам', 'EN': 'Vietnam', 'ES': 'Vietnam'},
+    'VG': {'RU': 'Британские Виргинские острова', 'EN': 'British Virgin Islands', 'ES': 'Islas Vírgenes Británicas'},
+    'VI': {'RU': 'Виргинские Острова США', 'EN': 'U.S. Virgin Islands', 'ES': 'Islas Vírgenes de los Estados Unidos'},
+    'WF': {'RU': 'Уоллис и Футуна', 'EN': 'Wallis and Futuna', 'ES': 'Wallis y Futuna'},
+    'EH': {'RU': 'Западная Сахара', 'EN': 'Western Sahara', 'ES': 'Sahara Occidental'},
+    'YE': {'RU': 'Йемен', 'EN': 'Yemen', 'ES': 'Yemen'},
+    'ZM': {'RU': 'Замбия', 'EN': 'Zambia', 'ES': 'Zambia'},
+    'ZW': {'RU': 'Зимбабве', 'EN': 'Zimbabwe', 'ES': 'Zimbabue'},
+}
+
+COUNTRY_ALIASES: Dict[str, str] = {
+    'англия': 'GB',
+    'британия': 'GB',
+    'соединенное королевство': 'GB',
+    'шотландия': 'GB',
+    'уэльс': 'GB',
+    'северная ирландия': 'GB',
+    'uk': 'GB',
+    'england': 'GB',
+    'britain': 'GB',
+    'great britain': 'GB',
+    'scotland': 'GB',
+    'wales': 'GB',
+    'northern ireland': 'GB',
+    'inglaterra': 'GB',
+    'gran bretaña': 'GB',
+    'escocia': 'GB',
+    'gales': 'GB',
+    'сша': 'US',
+    'америка': 'US',
+    'штаты': 'US',
+    'usa': 'US',
+    'us': 'US',
+    'america': 'US',
+    'united states of america': 'US',
+    'eeuu': 'US',
+    'ee.uu.': 'US',
+    'рф': 'RU',
+    'российская федерация': 'RU',
+    'russian federation': 'RU',
+    'federación de rusia': 'RU',
+    'оаэ': 'AE',
+    'эмираты': 'AE',
+    'uae': 'AE',
+    'eau': 'AE',
+    'emiratos': 'AE',
+    'чешская республика': 'CZ',
+    'czech republic': 'CZ',
+    'república checa': 'CZ',
+    'голландия': 'NL',
+    'holland': 'NL',
+    'holanda': 'NL',
+    'корея': 'KR',
+    'республика корея': 'KR',
+    'korea': 'KR',
+    'corea': 'KR',
+    'кндр': 'KP',
+    'dprk': 'KP',
+    'дрк': 'CD',
+    'drc': 'CD',
+    'белоруссия': 'BY',
+    'belorussia': 'BY',
+    'bielorrusia': 'BY',
+    'кыргызстан': 'KG',
+    'kirghizia': 'KG',
+    'туркменистан': 'TM',
+    'молдова': 'MD',
+    "кот-д'ивуар": 'CI',
+    'ivory coast': 'CI',
+    'бирма': 'MM',
+    'burma': 'MM',
+    'свазиленд': 'SZ',
+    'swaziland': 'SZ',
+    'suazilandia': 'SZ',
+    'türkiye': 'TR',
+    'турецкая республика': 'TR',
+    'vatican': 'VA',
+    'holy see': 'VA',
+    'santa sede': 'VA',
+    'святой престол': 'VA',
+    'cape verde': 'CV',
+    'острова зеленого мыса': 'CV',
+    'east timor': 'TL',
+    'македония': 'MK',
+    'macedonia': 'MK',
+    'юар': 'ZA',
+    'rsa': 'ZA',
+    'доминикана': 'DO',
+    'цар': 'CF',
+}
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple
+
+from django.conf import settings
+
+from weather_console.services.cache_services import CacheStats, get_cached_translation, save_translation
+
+if TYPE_CHECKING:
+    from googletrans import Translator
+
+_translation_scope: ContextVar[str] = ContextVar('translation_scope', default='other')
+
+
+@contextmanager
+def translation_scope(name: str):
+    '''
+    Задает имя функции, от лица которой выполняются переводы. Используется для статистики кэша переводов.
+    Может применяться как контекстный менеджер или как декоратор.
+
+    Args:
+        name (str): Имя функции.
+    '''
+
+    token = _translation_scope.set(name)
+    try:
+        yield
+    finally:
+        _translation_scope.reset(token)
+
+
+class CachedTranslation(NamedTuple):
+    '''
+    Результат перевода, совместимый по атрибутам с результатом googletrans.
+    '''
+
+    text: str
+    src: str
+    dest: str
+
+
+class CachedTranslator:
+    '''
+    Переводчик с двухуровневым кэшем: LRU в памяти процесса и SQLite.
+    Повторяет интерфейс метода translate из googletrans.
+
+    Экземпляр googletrans хранит состояние запросов (клиент httpx, токен Google Translate) и не рассчитан
+    на одновременное использование из нескольких потоков, поэтому каждый поток получает собственный экземпляр.
+    Переданный в конструктор translator используется всеми потоками и должен быть потокобезопасным.
+    '''
+
+    def __init__(self, translator: Translator | None = None, memory_max_entries: int | None = None):
+        self._translator = translator
+        self._thread_local = threading.local()
+        self._memory_max_entries = memory_max_entries or settings.TRANSLATION_CACHE['MEMORY_MAX_ENTRIES']
+        self._memory: OrderedDict[Tuple[str, str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, CacheStats] = defaultdict(CacheStats)
+
+    def _get_translator(self) -> Translator:
+        '''
+        Предоставляет экземпляр googletrans текущего потока, создавая его при первом промахе кэша в этом потоке.
+
+        Returns:
+            Экземпляр переводчика.
+        '''
+
+        if self._translator is not None:
+            return self._translator
+
+        translator = getattr(self._thread_local, 'translator', None)
+        if translator is None:
+            from googletrans import Translator
+
+            translator = self._thread_local.translator = Translator()
+        return translator
+
+    def _get_from_memory(self, key: Tuple[str, str, str]) -> str | None:
+        with self._lock:
+            translation = self._memory.get(key)
+            if translation is not None:
+                self._memory.move_to_end(key)
+            return translation
+
+    def _put_to_memory(self, key: Tuple[str, str, str], translation: str):
+        with self._lock:
+            self._memory[key] = translation
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_max_entries:
+                self._memory.popitem(last=False)
+
+    def translate(self, text: str | List[str], dest: str = 'en',
+                  src: str = 'auto') -> CachedTranslation | List[CachedTranslation]:
+        '''
+        Переводит строку или список строк, используя кэш.
+
+        Args:
+            text (str | List[str]): Строка или список строк для перевода.
+            dest (str): Код языка перевода.
+            src (str): Код исходного языка.
+
+        Returns:
+            Результат перевода или список результатов.
+        '''
+
+        dest = dest.lower()
+        src = src.lower()
+
+        if isinstance(text, list):
+            return self._translate_batch(text, dest, src)
+
+        key = (text, src, dest)
+        stats = self._stats[_translation_scope.get()]
+
+        translation = self._get_cached(key)
+        if translation is not None:
+            stats.hit()
+            return CachedTranslation(translation, src, dest)
+
+        stats.miss()
+        translation = self._get_translator().translate(text, dest=dest, src=src).text
+        self._save(key, translation)
+        return CachedTranslation(translation, src, dest)
+
+    def _get_cached(self, key: Tuple[str, str, str]) -> str | None:
+        translation = self._get_from_memory(key)
+        if translation is None:
+            translation = get_cached_translation(*key)
+            if translation is not None:
+                self._put_to_memory(key, translation)
+        return translation
+
+    def _save(self, key: Tuple[str, str, str], translation: str):
+        save_translation(*key, translation)
+        self._put_to_memory(key, translation)
+
+    def _translate_batch(self, texts: List[str], dest: str, src: str) -> List[CachedTranslation]:
+        '''
+        Переводит список строк. Строки, отсутствующие в кэше, переводятся одновременно,
+        каждая уникальная строка - один раз.
+
+        Args:
+            texts (List[str]): Строки для перевода.
+            dest (str): Код языка перевода.
+            src (str): Код исходного языка.
+
+        Returns:
+            Список результатов перевода в порядке исходных строк.
+        '''
+
+        stats = self._stats[_translation_scope.get()]
+        translations = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            translation = self._get_cached((text, src, dest))
+            if translation is None:
+                misses.append(text)
+            else:
+                translations[text] = translation
+
+        for text in texts:
+            if text in translations:
+                stats.hit()
+            else:
+                stats.miss()
+
+        if misses:
+            max_workers = min(len(misses), settings.TRANSLATION_CACHE['MAX_WORKERS'])
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(
+                    lambda text: self._get_translator().translate(text, dest=dest, src=src).text, misses
+                )
+                for text, translation in zip(misses, results):
+                    self._save((text, src, dest), translation)
+                    translations[text] = translation
+
+        return [CachedTranslation(translations[text], src, dest) for text in texts]
+
+    def get_stats(self) -> Dict[str, str]:
+        '''
+        Предоставляет долю попаданий в кэш переводов для каждой функции.
+
+        Returns:
+            Словарь вида {имя функции: 'попадания/обращения (доля)'}.
+        '''
+
+        result = {}
+        for scope, stats in sorted(self._stats.items()):
+            counters = stats.as_dict()
+            total = counters['hits'] + counters['misses']
+            result[scope] = f'{counters["hits"]}/{total} ({counters["hit_ratio"]})'
+        return result
@@ -1,10 +1,68 @@
-from typing import Dict
+from __future__ import annotations
 
-from googletrans import Translator
+import unicodedata
+from typing import TYPE_CHECKING, Dict, List
+
+from asgiref.sync import sync_to_async
 from iso3166 import countries, countries_by_alpha2
 
+from weather_console.weather_by_name.country_names import COUNTRY_NAMES, COUNTRY_ALIASES
+from weather_console.weather_by_name.translator import translation_scope
+
+if TYPE_CHECKING:
+    from googletrans import Translator
+
 _NAME_MAP = ('city', 'country')
 
+
+class CountryNotFoundError(ValueError):
+    '''
+    Страна, указанная пользователем, не найдена.
+    '''
+
+
+def _normalize_country_name(country_name: str) -> str:
+    '''
+    Приводит название страны к виду для поиска: нижний регистр, без диакритических знаков, пробелов и знаков
+    препинания.
+
+    Args:
+        country_name (str): Название страны.
+
+    Returns:
+        Нормализованное название.
+    '''
+
+    decomposed = unicodedata.normalize('NFKD', country_name.casefold())
+    return ''.join(char for char in decomposed if char.isalnum())
+
+
+def _build_country_code_index() -> Dict[str, str]:
+    '''
+    Строит индекс {нормализованное название или синоним: код страны} по таблице названий стран и ISO-3166.
+
+    Returns:
+        Индекс названий стран.
+    '''
+
+    index = {}
+    for country in countries:
+        for name in (country.name, country.apolitical_name, country.alpha2, country.alpha3):
+            index.setdefault(_normalize_country_name(name), country.alpha2)
+
+    for code, translations in COUNTRY_NAMES.items():
+        for name in translations.values():
+            index[_normalize_country_name(name)] = code
+
+    for alias, code in COUNTRY_ALIASES.items():
+        index[_normalize_country_name(alias)] = code
+
+    return index
+
+
+_COUNTRY_CODE_INDEX = _build_country_code_index()
+
+
 def get_location_names(user_input: str, translator: Translator) -> Dict[str, str]:
     '''
     Собирает введенные пользователем название города или названия города и страны в один словарь и добавляет к ним
@@ -15,20 +73,20 @@ def get_location_names(user_input: str, translator: Translator) -> Dict[str, str
         translator (Translator): Экземпляр переводчика.
 
     Raises:
-        ValueError: В случае, если страна была указана неверно.
+        CountryNotFoundError: В случае, если страна была указана неверно.
 
     Returns:
         Словарь с названием города, названием стран и кодом страны, если таковые были указаны.
     '''
 
-    city_country_data = _parse_user_input(user_input)
+    city_country_data = parse_user_input(user_input)
     if country_name := city_country_data.get('country'):
         country_code = _get_country_code(country_name, translator=translator)
         city_country_data['country_code'] = country_code
 
     return city_country_data
 
-def _parse_user_input(input_string: str) -> Dict[str, str]:
+def parse_user_input(input_string: str) -> Dict[str, str]:
     '''
     Парсинг введенных пользователем данных. Пользователь вводит либо название города, либо названия города и страны.
     Во втором случае данные должны быть разделены запятой.
@@ -56,38 +114,38 @@ def _parse_user_input(input_string: str) -> Dict[str, str]:
     return dict(zip(_NAME_MAP, name_list))
 
 
+@translation_scope('_get_country_code')
 def _get_country_code(country_name: str, *, translator: Translator) -> str:
     '''
-    Переводит название страны на английский и выдает код страны в формате ISO-3166.
+    Выдает код страны в формате ISO-3166 по ее названию. Название ищется в таблице названий стран, и только если
+    оно там не найдено, переводится на английский.
     Args:
         country_name (str): Название страны на любом языке.
         translator (Translator): Экземпляр переводчика.
 
     Raises:
-        ValueError: В случае если страна не была найдена.
+        CountryNotFoundError: В случае если страна не была найдена.
 
     Returns:
         Код страны в формате ISO-3166.
     '''
 
-    country_translation = translator.translate(country_name).text.capitalize()
+    if country_code := _COUNTRY_CODE_INDEX.get(_normalize_country_name(country_name)):
+        return country_code
 
-    if country_translation == 'Russia':
-        country_translation = 'Russian Federation'
-    elif country_translation == 'England':
-        country_translation = 'United Kingdom of Great Britain and Northern Ireland'
+    country_translation = translator.translate(country_name).text
+    if country_code := _COUNTRY_CODE_INDEX.get(_normalize_country_name(country_translation)):
+        return country_code
 
-    try:
-        country = countries.get(country_translation)
-        return country.alpha2
-    except LookupError as e:
-        raise ValueError(f'Перепроверьте введенные данные {country_name} и повторите попытку.') from e
+    raise CountryNotFoundError(f'Перепроверьте введенные данные {country_name} и повторите попытку.')
 
 
+@translation_scope('get_translated_country_name_by_code')
 def get_translated_country_name_by_code(country_code: str, lang_preference: str, *,
                                         translator: Translator) -> str:
     '''
-    Получения названия страны на предпочитаемом языке из ISO-3166 кода.
+    Получения названия страны на предпочитаемом языке из ISO-3166 кода. Название берется из таблицы названий
+    стран, переводчик используется только для отсутствующих в ней языков.
     Args:
         country_code (str): ISO-3166 код страны.
         lang_preference (str): ISO-3166 код страны предпочитаемого языка.
@@ -107,6 +165,9 @@ def get_translated_country_name_by_code(country_code: str, lang_preference: str,
     else:
         lang_preference = 'ru'
 
+    if country_name := COUNTRY_NAMES.get(country_code, {}).get(lang_preference.upper()):
+        return country_name
+
     try:
         country = countries_by_alpha2.get(country_code)
         country_name = country.name
@@ -119,6 +180,7 @@ def get_translated_country_name_by_code(country_code: str, lang_preference: str,
     return translated_country_name
 
 
+@translation_scope('translate_anything')
 def translate_anything(string: str, lang_preference: str, *, translator: Translator) -> str:
     '''
     Переводит заданную строку на предпочитаемый язык из ISO-3166 кода.
@@ -138,3 +200,92 @@ def translate_anything(string: str, lang_preference: str, *, translator: Transla
     translated_string: str = translator.translate(string, dest=lang_preference).text
 
     return translated_string.capitalize()
+
+
+@translation_scope('translate_many')
+def translate_many(strings: List[str], lang_preference: str, *, translator: Translator) -> Dict[str, str]:
+    '''
+    Переводит список строк на предпочитаемый язык из ISO-3166 кода одним пакетом. Повторяющиеся строки
+    переводятся один раз.
+
+    Args:
+        strings (List[str]): Строки, которые хотим перевести.
+        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Returns:
+        Словарь вида {исходная строка: переведенная строка}.
+    '''
+
+    if lang_preference:
+        lang_preference = lang_preference.lower()
+    else:
+        lang_preference = 'ru'
+
+    unique_strings = list(dict.fromkeys(strings))
+    if not unique_strings:
+        return {}
+
+    translations = translator.translate(unique_strings, dest=lang_preference)
+    return {
+        string: translation.text.capitalize()
+        for string, translation in zip(unique_strings, translations)
+    }
+
+
+async def async_get_country_code(country_name: str, *, translator: Translator) -> str:
+    '''
+    Асинхронный вариант поиска кода страны по ее названию. Выполняется в отдельном потоке пула,
+    так как переводчик и кэш переводов синхронные; одновременные вызовы не ждут друг друга.
+
+    Args:
+        country_name (str): Название страны на любом языке.
+        translator (Translator): Экземпляр переводчика.
+
+    Raises:
+        CountryNotFoundError: В случае если страна не была найдена.
+
+    Returns:
+        Код страны в формате ISO-3166.
+    '''
+
+    return await sync_to_async(_get_country_code, thread_sensitive=False)(country_name,
+                                                                          translator=translator)
+
+
+async def async_get_translated_country_name_by_code(country_code: str, lang_preference: str, *,
+                                                    translator: Translator) -> str:
+    '''
+    Асинхронный вариант get_translated_country_name_by_code.
+
+    Args:
+        country_code (str): ISO-3166 код страны.
+        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Raises:
+        ValueError: В случае если страна не была найдена.
+
+    Returns:
+        Переведенное название страны.
+    '''
+
+    return await sync_to_async(get_translated_country_name_by_code, thread_sensitive=False)(
+        country_code, lang_preference, translator=translator)
+
+
+async def async_translate_many(strings: List[str], lang_preference: str, *, translator: Translator) -> Dict[str, str]:
+    '''
+    Асинхронный вариант translate_many.
+
+    Args:
+        strings (List[str]): Строки, которые хотим перевести.
+        lang_preference (str): ISO-3166 код страны предпочитаемого языка.
+        translator (Translator): Экземпляр переводчика.
+
+    Returns:
+        Словарь вида {исходная строка: переведенная строка}.
+    '''
+
+    return await sync_to_async(translate_many, thread_sensitive=False)(strings, lang_preference,
+                                                                       translator=translator)